@@ -0,0 +1,296 @@
+"""
+Local natural-language date resolver.
+
+Turns common relative expressions ("tomorrow at 2pm", "this week",
+"next Friday", "in 3 days", "June 20") into concrete "YYYY-MM-DD HH:MM"
+values and "YYYY-MM-DD" ranges in the local timezone, without an LLM call.
+"""
+from datetime import datetime, timedelta
+import calendar
+import re
+
+
+DEFAULT_TIME = (12, 0)
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# Full names only (plus "tues"/"thurs"): bare "sat" or "sun" are too often ordinary words
+WEEKDAY_PATTERN = r"(monday|tues(?:day)?|wednesday|thurs(?:day)?|friday|saturday|sunday)"
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+MONTH_PATTERN = (
+    r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t|tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "fourteen": 14, "thirty": 30
+}
+NUMBER_PATTERN = r"(\d+|a|an|one|two|three|four|five|six|seven|eight|nine|ten|fourteen|thirty)"
+
+# Default times for parts of the day when no explicit time is given
+DAY_PART_TIMES = {"morning": (9, 0), "afternoon": (15, 0), "evening": (19, 0), "night": (20, 0), "tonight": (20, 0)}
+
+
+def local_now():
+    """Current time in the local timezone (same approach add_tasks_to_notion uses for naive due dates)."""
+    return datetime.now().astimezone()
+
+
+def _weekday_index(name):
+    return WEEKDAYS.index(next(day for day in WEEKDAYS if day.startswith(name[:3])))
+
+
+def _number(token):
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _month_range(year, month):
+    return datetime(year, month, 1).date(), datetime(year, month, calendar.monthrange(year, month)[1]).date()
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    return day.year + month_index // 12, month_index % 12 + 1
+
+
+def _explicit_date(year, month, day_of_month, today):
+    """A month/day with no year: this year, or next year if it has already passed."""
+    try:
+        candidate = datetime(year or today.year, month, day_of_month).date()
+    except ValueError:
+        return None
+    if year is None and candidate < today:
+        candidate = candidate.replace(year=candidate.year + 1)
+    return candidate
+
+
+# Each rule: (compiled pattern, handler(match, today) -> (start_date, end_date))
+def _range_rules():
+    rules = [
+        (r"\b(?:in )?the next " + NUMBER_PATTERN + r" days?\b",
+         lambda m, t: (t, t + timedelta(days=max(_number(m.group(1)) - 1, 0)))),
+        (r"\b(?:this|current) week(?:'s)?\b", lambda m, t: (_week_start(t), _week_start(t) + timedelta(days=6))),
+        (r"\bnext week(?:'s)?\b", lambda m, t: (_week_start(t) + timedelta(days=7), _week_start(t) + timedelta(days=13))),
+        (r"\blast week(?:'s)?\b", lambda m, t: (_week_start(t) - timedelta(days=7), _week_start(t) - timedelta(days=1))),
+        (r"\bthis weekend\b", lambda m, t: (_week_start(t) + timedelta(days=5), _week_start(t) + timedelta(days=6))),
+        (r"\bnext weekend\b", lambda m, t: (_week_start(t) + timedelta(days=12), _week_start(t) + timedelta(days=13))),
+        (r"\b(?:this|current) month(?:'s)?\b", lambda m, t: _month_range(t.year, t.month)),
+        (r"\bnext month(?:'s)?\b", lambda m, t: _month_range(*_add_months(t, 1))),
+        (r"\blast month(?:'s)?\b", lambda m, t: _month_range(*_add_months(t, -1))),
+        (r"\bthis year(?:'s)?\b", lambda m, t: (t.replace(month=1, day=1), t.replace(month=12, day=31))),
+    ]
+    return [(re.compile(pattern), handler) for pattern, handler in rules]
+
+
+def _next_weekday(m, today):
+    """'friday' / 'this friday' / 'on friday' = next occurrence (today counts); 'next friday' = friday of next week."""
+    modifier, name = m.group(1), m.group(2)
+    target = _weekday_index(name)
+    if modifier == "next":
+        return _week_start(today) + timedelta(days=7 + target)
+    if modifier == "last":
+        return today - timedelta(days=(today.weekday() - target) % 7 or 7)
+    return today + timedelta(days=(target - today.weekday()) % 7)
+
+
+def _day_rules():
+    rules = [
+        (r"\bday after tomorrow\b", lambda m, t: t + timedelta(days=2)),
+        (r"\b(?:today|tonight)\b", lambda m, t: t),
+        (r"\btomorrow\b", lambda m, t: t + timedelta(days=1)),
+        (r"\byesterday\b", lambda m, t: t - timedelta(days=1)),
+        (r"\bin " + NUMBER_PATTERN + r" days?\b", lambda m, t: t + timedelta(days=_number(m.group(1)))),
+        (r"\bin " + NUMBER_PATTERN + r" weeks?\b", lambda m, t: t + timedelta(weeks=_number(m.group(1)))),
+        (NUMBER_PATTERN + r" days? from (?:now|today)\b", lambda m, t: t + timedelta(days=_number(m.group(1)))),
+        (r"\b(\d{4})-(\d{2})-(\d{2})\b",
+         lambda m, t: _explicit_date(int(m.group(1)), int(m.group(2)), int(m.group(3)), t)),
+        (r"\b" + MONTH_PATTERN + r"\.? (\d{1,2})(?:st|nd|rd|th)?(?:,? (\d{4}))?\b",
+         lambda m, t: _explicit_date(int(m.group(3)) if m.group(3) else None, MONTHS[m.group(1)[:3]], int(m.group(2)), t)),
+        (r"\b(\d{1,2})(?:st|nd|rd|th)? (?:of )?" + MONTH_PATTERN + r"\b(?:,? (\d{4}))?",
+         lambda m, t: _explicit_date(int(m.group(3)) if m.group(3) else None, MONTHS[m.group(2)[:3]], int(m.group(1)), t)),
+        (r"\b(?:(next|this|last|on|coming) )?" + WEEKDAY_PATTERN + r"\b", _next_weekday),
+    ]
+    return [(re.compile(pattern), handler) for pattern, handler in rules]
+
+
+TIME_RULES = [
+    (re.compile(r"\b(?:at |@ ?)?(\d{1,2})(?::(\d{2}))? ?(am|pm|a\.m\.|p\.m\.)"), "meridiem"),
+    (re.compile(r"\b(?:at |@ ?)?([01]?\d|2[0-3]):([0-5]\d)\b"), "clock"),
+    (re.compile(r"\b(?:at )?(noon|midday)\b"), "noon"),
+    (re.compile(r"\b(?:at )?midnight\b"), "midnight"),
+    (re.compile(r"\bat (\d{1,2})\b(?!:)"), "bare"),
+]
+
+DAY_PART_PATTERN = re.compile(r"\b(tonight|morning|afternoon|evening|night)\b")
+# How far either side of a day expression to look for its time ("tomorrow at 12:30 p.m.")
+TIME_WINDOW = 16
+
+RANGE_RULES = _range_rules()
+DAY_RULES = _day_rules()
+
+
+def _today(now):
+    return (now or local_now()).date()
+
+
+def _first_match(rules, text, today):
+    """Return (value, span) for the earliest-positioned rule match in text."""
+    best = None
+    for pattern, handler in rules:
+        for match in pattern.finditer(text):
+            value = handler(match, today)
+            if value is None:
+                continue
+            if best is None or match.start() < best[1][0]:
+                best = (value, match.span())
+            break
+    return best
+
+
+def resolve_date_range(text, now=None):
+    """
+    Resolve a date-range expression ("this week", "next month", "today", "friday").
+    Single days resolve to a one-day range.
+
+    Returns:
+        tuple: ((start "YYYY-MM-DD", end "YYYY-MM-DD"), (match start, match end)) or None
+    """
+    text = text.lower()
+    today = _today(now)
+    found = _first_match(RANGE_RULES, text, today)
+    if not found:
+        day = _first_match(DAY_RULES, text, today)
+        if day:
+            found = ((day[0], day[0]), day[1])
+    if not found:
+        return None
+    (start, end), span = found
+    return (start.isoformat(), end.isoformat()), span
+
+
+def resolve_time(text):
+    """
+    Resolve an explicit time of day ("2pm", "14:30", "noon") or a part of day ("tonight").
+
+    Returns:
+        tuple: ((hour, minute), (match start, match end)) or None
+    """
+    text = text.lower()
+    for pattern, kind in TIME_RULES:
+        match = pattern.search(text)
+        if not match:
+            continue
+        if kind == "noon":
+            return (12, 0), match.span()
+        if kind == "midnight":
+            return (0, 0), match.span()
+
+        hour = int(match.group(1))
+        minute = int(match.group(2) or 0) if kind != "bare" else 0
+        if kind == "meridiem":
+            if hour > 12 or minute > 59:
+                continue
+            if match.group(3).startswith("p") and hour != 12:
+                hour += 12
+            elif match.group(3).startswith("a") and hour == 12:
+                hour = 0
+        elif kind == "bare":
+            if hour > 12:
+                continue
+            # "at 3" almost always means the afternoon
+            if 1 <= hour <= 7:
+                hour += 12
+        return (hour, minute), match.span()
+
+    part = DAY_PART_PATTERN.search(text)
+    if part:
+        return DAY_PART_TIMES[part.group(1)], part.span()
+    return None
+
+
+def resolve_datetime(text, now=None, default_time=DEFAULT_TIME):
+    """
+    Resolve a due date/time like "tomorrow at 2pm" or "next friday".
+    A time without a day means today; a day without a time uses default_time.
+
+    Returns:
+        str: "YYYY-MM-DD HH:MM", or None when the text has no date or time expression
+    """
+    lowered = text.lower()
+    today = _today(now)
+    day = _first_match(DAY_RULES, lowered, today)
+    time_of_day = resolve_time(lowered)
+    if not day and not time_of_day:
+        return None
+
+    date_value = day[0] if day else today
+    hour, minute = time_of_day[0] if time_of_day else default_time
+    return f"{date_value.isoformat()} {hour:02d}:{minute:02d}"
+
+
+def _time_span(text, start, end):
+    """
+    Span of the day expression text[start:end] widened to take in a time
+    inside it or right beside it ("tonight", "tomorrow at 2pm", "2pm tomorrow").
+    """
+    if resolve_time(text[start:end]):
+        return start, end
+    after = resolve_time(text[end:end + TIME_WINDOW])
+    if after and not text[end:end + after[1][0]].strip(" ,"):
+        return start, end + after[1][1]
+    window_start = max(0, start - TIME_WINDOW)
+    before = resolve_time(text[window_start:start])
+    if before and not text[window_start + before[1][1]:start].strip(" ,"):
+        return window_start + before[1][0], end
+    return None
+
+
+def find_date_hints(text, now=None):
+    """
+    List every date expression in the text with its resolved value, for
+    passing to the LLM so it never has to do calendar or clock arithmetic.
+    A day with a time beside it ("tomorrow at 2pm") resolves to "YYYY-MM-DD HH:MM".
+
+    Returns:
+        list: (expression, resolved value) pairs
+    """
+    lowered = text.lower()
+    today = _today(now)
+    hints = []
+    covered = []
+
+    for rules in (RANGE_RULES, DAY_RULES):
+        for pattern, handler in rules:
+            for match in pattern.finditer(lowered):
+                if any(start < match.end() and match.start() < end for start, end in covered):
+                    continue
+                value = handler(match, today)
+                if value is None:
+                    continue
+                span = match.span()
+                if isinstance(value, tuple):
+                    resolved = f"{value[0].isoformat()} to {value[1].isoformat()}"
+                else:
+                    timed = _time_span(lowered, *span)
+                    if timed and not any(start < timed[1] and timed[0] < end for start, end in covered):
+                        span = timed
+                        resolved = f"{resolve_datetime(lowered[span[0]:span[1]], now)} ({value.strftime('%A')})"
+                    else:
+                        resolved = f"{value.isoformat()} ({value.strftime('%A')})"
+                covered.append(span)
+                hints.append((span[0], text[span[0]:span[1]], resolved))
+
+    return [(expression, resolved) for _, expression, resolved in sorted(hints)]
+
+
+def remove_span(text, span):
+    """Return text with the given (start, end) span cut out."""
+    return (text[:span[0]] + " " + text[span[1]:]).strip()
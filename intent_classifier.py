@@ -0,0 +1,95 @@
+import re
+
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# Verbs shared by the single-task and bulk rules, so a bulk request always matches both
+UPDATE_VERBS = r"(mark|change|update|modify|edit|rename|reschedule|move|postpone|push back|bump)"
+DELETE_VERBS = r"(delete|remove|archive|cancel|drop|erase|get rid of)"
+
+# (intent, pattern, confidence) - confidence is how sure a match alone makes us.
+# Several matches for the same intent reinforce each other; matches for
+# competing intents lower the final confidence.
+INTENT_RULES = [
+    # CREATE_TASK
+    ("CREATE_TASK", r"^(please )?(add|create|schedule|set up|remind me)\b(?!.*\bto the\b.*\btask\b)", 0.9),
+    # "put X on my list" creates, "put the groceries task to high priority" edits an existing task
+    ("CREATE_TASK", r"^(please )?put\b(?!.*\btasks?\b)", 0.9),
+    ("CREATE_TASK", r"\b(new task|add (a|an|another) (task|reminder|event|meeting|appointment))\b", 0.85),
+    ("CREATE_TASK", r"^(i need to|i have to|i've got to|i gotta)\b", 0.6),
+
+    # UPDATE_TASK
+    ("UPDATE_TASK", r"^(please )?" + UPDATE_VERBS + r"\b", 0.9),
+    ("UPDATE_TASK", r"^(please )?set\b(?! up)", 0.85),
+    ("UPDATE_TASK", r"\bas (done|complete|completed|finished|in progress|to-do|todo)\b", 0.9),
+    ("UPDATE_TASK", r"^add (notes?|a note|details?|a description)\b.*\bto\b", 0.95),
+
+    # DELETE_TASK
+    ("DELETE_TASK", r"^(please )?" + DELETE_VERBS + r"\b", 0.95),
+
+    # QUERY_TASKS
+    ("QUERY_TASKS", r"^(please )?(show|list|display|view|give me|tell me)\b", 0.9),
+    ("QUERY_TASKS", r"^(what|which)\b.*\b(tasks?|due|scheduled|agenda|planned|on my plate)\b", 0.85),
+    ("QUERY_TASKS", r"^(do i have|what do i have|what's due|what is due|what's on)\b", 0.9),
+    ("QUERY_TASKS", r"\b(my (tasks|schedule|agenda|to-?dos?))\b", 0.6),
+
+    # SEARCH_TASKS
+    ("SEARCH_TASKS", r"^(please )?(find|search|look for|look up)\b", 0.9),
+    ("SEARCH_TASKS", r"\btasks? (about|mentioning|containing|related to|that mention)\b", 0.9),
+
+    # BULK_UPDATE_TASKS / BULK_ARCHIVE_TASKS ("all", "every", "everything" with an update/delete verb).
+    # These compete with the single-task rules, so bulk requests fall through to the LLM
+    # instead of being confidently routed to a one-task update/delete
+    ("BULK_UPDATE_TASKS", r"^(please )?(" + UPDATE_VERBS + r"|set)\b.*\b(all|every|everything)\b", 0.95),
+    ("BULK_ARCHIVE_TASKS", r"^(please )?(" + DELETE_VERBS + r"|clear|clean up)\b.*\b(all|every|everything)\b", 0.95),
+
+    # UNKNOWN
+    ("UNKNOWN", r"^(hi|hello|hey|thanks|thank you|ok|okay)[\s!.?]*$", 0.95),
+]
+
+_COMPILED_RULES = [(intent, re.compile(pattern), confidence) for intent, pattern, confidence in INTENT_RULES]
+
+
+def _normalize(user_input):
+    text = user_input.lower().strip()
+    text = text.replace("’", "'")
+    return re.sub(r"\s+", " ", text)
+
+
+def score_intents(user_input):
+    """
+    Score every intent whose rules match the input, before competing intents
+    are weighed against each other.
+
+    Returns:
+        dict: {intent: score between 0 and 1}; empty when no rule matches
+    """
+    text = _normalize(user_input)
+    if not text:
+        return {}
+
+    # Combine same-intent matches as independent evidence (noisy-OR)
+    miss_probability = {}
+    for intent, pattern, confidence in _COMPILED_RULES:
+        if pattern.search(text):
+            miss_probability[intent] = miss_probability.get(intent, 1.0) * (1 - confidence)
+    return {intent: 1 - miss for intent, miss in miss_probability.items()}
+
+
+def classify_intent_locally(user_input):
+    """
+    Local Intent Classifier
+    Scores the input against the keyword/regex rules above without any network call.
+
+    Returns:
+        tuple: (intent or None, confidence between 0 and 1)
+    """
+    intent_scores = score_intents(user_input)
+    if not intent_scores:
+        return None, 0.0
+
+    scores = sorted(((score, intent) for intent, score in intent_scores.items()), reverse=True)
+    best_score, best_intent = scores[0]
+    runner_up = scores[1][0] if len(scores) > 1 else 0.0
+
+    return best_intent, max(0.0, best_score - 0.5 * runner_up)
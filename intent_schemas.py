@@ -0,0 +1,280 @@
+from datetime import datetime
+import re
+
+from query_planner import check_filter_ast, is_date_value
+
+
+INTENT_TYPES = [
+    "CREATE_TASK", "QUERY_TASKS", "UPDATE_TASK", "DELETE_TASK", "SEARCH_TASKS",
+    "BULK_UPDATE_TASKS", "BULK_ARCHIVE_TASKS", "UNKNOWN"
+]
+
+PRIORITIES = ["Low", "Medium", "High"]
+CATEGORIES = ["General", "Personal", "Fitness", "Fun", "School"]
+STATUSES = ["To-Do", "In Progress", "Done"]
+
+DATETIME_PATTERN = r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$"
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}( \d{2}:\d{2})?$"
+
+
+TASK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_name": {"type": "string", "minLength": 1},
+        "due_date": {"type": "string", "pattern": DATETIME_PATTERN},
+        "priority": {"type": "string", "enum": PRIORITIES},
+        "category": {"type": "string", "enum": CATEGORIES},
+        "status": {"type": "string", "enum": STATUSES},
+        "notes": {"type": "string"}
+    },
+    "required": ["task_name", "due_date", "priority", "category", "status", "notes"],
+    "additionalProperties": False
+}
+
+TASK_IDENTIFIER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {"type": "string", "enum": ["name", "id", "description"]},
+        "value": {"type": "string", "minLength": 1}
+    },
+    "required": ["type", "value"],
+    "additionalProperties": False
+}
+
+QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "filters": {
+            "type": "object",
+            "properties": {
+                "category": {"type": ["string", "null"], "enum": CATEGORIES + [None]},
+                "priority": {"type": ["string", "null"], "enum": PRIORITIES + [None]},
+                "status": {"type": ["string", "null"], "enum": STATUSES + [None]},
+                "date_range": {
+                    "type": ["array", "null"],
+                    "items": {"type": "string", "pattern": DATE_PATTERN},
+                    "minItems": 2,
+                    "maxItems": 2
+                },
+                # Filter AST for anything the fields above can't say (see query_planner)
+                "where": {"type": ["object", "null"]}
+            },
+            "additionalProperties": False
+        },
+        "sort_by": {
+            "type": ["object", "null"],
+            "properties": {
+                "property": {"type": "string", "enum": ["due_date", "priority"]},
+                "direction": {"type": "string", "enum": ["ascending", "descending"]}
+            },
+            "required": ["property"],
+            "additionalProperties": False
+        },
+        "limit": {"type": ["integer", "null"], "minimum": 1}
+    },
+    "required": ["filters"],
+    "additionalProperties": False
+}
+
+UPDATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_identifier": TASK_IDENTIFIER_SCHEMA,
+        "updates": {
+            "type": "object",
+            "properties": {
+                "task_name": TASK_SCHEMA["properties"]["task_name"],
+                "due_date": TASK_SCHEMA["properties"]["due_date"],
+                "priority": TASK_SCHEMA["properties"]["priority"],
+                "category": TASK_SCHEMA["properties"]["category"],
+                "status": TASK_SCHEMA["properties"]["status"],
+                "notes": TASK_SCHEMA["properties"]["notes"]
+            },
+            "additionalProperties": False
+        }
+    },
+    "required": ["task_identifier", "updates"],
+    "additionalProperties": False
+}
+
+DELETE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_identifier": TASK_IDENTIFIER_SCHEMA
+    },
+    "required": ["task_identifier"],
+    "additionalProperties": False
+}
+
+# Bulk operations select their tasks with the same filters as QUERY_TASKS
+BULK_UPDATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "filters": QUERY_SCHEMA["properties"]["filters"],
+        "updates": UPDATE_SCHEMA["properties"]["updates"]
+    },
+    "required": ["filters", "updates"],
+    "additionalProperties": False
+}
+
+BULK_ARCHIVE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "filters": QUERY_SCHEMA["properties"]["filters"]
+    },
+    "required": ["filters"],
+    "additionalProperties": False
+}
+
+SEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 1}
+    },
+    "required": ["query"],
+    "additionalProperties": False
+}
+
+# Arguments each intent's handler consumes
+INTENT_ARGUMENT_SCHEMAS = {
+    "CREATE_TASK": {
+        "type": "object",
+        "properties": {"tasks": {"type": "array", "items": TASK_SCHEMA, "minItems": 1}},
+        "required": ["tasks"],
+        "additionalProperties": False
+    },
+    "QUERY_TASKS": QUERY_SCHEMA,
+    "UPDATE_TASK": UPDATE_SCHEMA,
+    "DELETE_TASK": DELETE_SCHEMA,
+    "SEARCH_TASKS": SEARCH_SCHEMA,
+    "BULK_UPDATE_TASKS": BULK_UPDATE_SCHEMA,
+    "BULK_ARCHIVE_TASKS": BULK_ARCHIVE_SCHEMA,
+    "UNKNOWN": {"type": "object"}
+}
+
+COMBINED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": INTENT_TYPES},
+        "arguments": {"type": "object"}
+    },
+    "required": ["intent", "arguments"],
+    "additionalProperties": False
+}
+
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+
+def _matches_type(instance, type_name):
+    if isinstance(instance, bool) and type_name in ("integer", "number"):
+        return False
+    if type_name == "integer":
+        return isinstance(instance, int)
+    return isinstance(instance, _JSON_TYPES[type_name])
+
+
+def validate(instance, schema, path="$"):
+    """
+    Validate an instance against the JSON Schema subset used in this module
+    (type, enum, properties, required, additionalProperties, items,
+    minItems/maxItems, minLength, minimum, pattern).
+
+    Returns:
+        list: Human-readable error strings, empty when the instance is valid
+    """
+    errors = []
+
+    expected_types = schema.get("type")
+    if expected_types:
+        if isinstance(expected_types, str):
+            expected_types = [expected_types]
+        if not any(_matches_type(instance, t) for t in expected_types):
+            return [f"{path}: expected {'/'.join(expected_types)}, got {type(instance).__name__}"]
+
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+
+    if isinstance(instance, str):
+        if len(instance) < schema.get("minLength", 0):
+            errors.append(f"{path}: must not be empty")
+        if "pattern" in schema and not re.match(schema["pattern"], instance):
+            errors.append(f"{path}: {instance!r} does not match {schema['pattern']}")
+
+    if isinstance(instance, (int, float)) and not isinstance(instance, bool):
+        if "minimum" in schema and instance < schema["minimum"]:
+            errors.append(f"{path}: must be >= {schema['minimum']}")
+
+    if isinstance(instance, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in instance:
+                errors.append(f"{path}: missing required field '{key}'")
+        for key, value in instance.items():
+            if key in properties:
+                errors.extend(validate(value, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected field '{key}'")
+
+    if isinstance(instance, list):
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} item(s)")
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            errors.append(f"{path}: expected at most {schema['maxItems']} item(s)")
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+
+    return errors
+
+
+def validate_intent_arguments(intent, arguments):
+    """Validate the structured arguments returned for an intent."""
+    if intent not in INTENT_ARGUMENT_SCHEMAS:
+        return [f"$.intent: unknown intent {intent!r}"]
+    errors = validate(arguments, INTENT_ARGUMENT_SCHEMAS[intent], "$.arguments")
+    if not errors and intent in ("QUERY_TASKS", "BULK_UPDATE_TASKS", "BULK_ARCHIVE_TASKS"):
+        errors = check_query_filters(arguments, "$.arguments")
+    if not errors and intent in ("UPDATE_TASK", "BULK_UPDATE_TASKS"):
+        errors = check_updates(arguments, "$.arguments")
+    return errors
+
+
+def check_query_filters(arguments, path="$"):
+    """
+    Validate what the schema patterns can't: that date_range values are real
+    dates (not "2025-13-45") and the filter AST in query arguments, if there is one.
+    """
+    filters = arguments.get("filters") or {}
+    errors = [
+        f"{path}.filters.date_range[{index}]: {value!r} is not a valid date"
+        for index, value in enumerate(filters.get("date_range") or [])
+        if not is_date_value(value)
+    ]
+    if filters.get("where"):
+        errors.extend(check_filter_ast(filters["where"], f"{path}.filters.where"))
+    return errors
+
+
+def check_updates(arguments, path="$"):
+    """Validate that an update's due_date is a real date and time (not "2025-02-30 10:00")."""
+    due_date = (arguments.get("updates") or {}).get("due_date")
+    if due_date is None:
+        return []
+    try:
+        datetime.strptime(due_date, "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return [f"{path}.updates.due_date: {due_date!r} is not a valid date and time"]
+    return []
+
+
+def check_bulk_arguments(arguments, path="$"):
+    """Validate the filters, and the updates if there are any, of a bulk request."""
+    return check_query_filters(arguments, path) + check_updates(arguments, path)
@@ -0,0 +1,164 @@
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def normalize_input(text):
+    """Lowercase, collapse whitespace and drop trailing punctuation so trivial variations share an entry."""
+    text = re.sub(r"\s+", " ", text.lower().strip())
+    return text.rstrip(" .!?")
+
+
+class LLMCache:
+    """
+    LLM Response Cache
+    Memoizes LLM parse results keyed on (namespace, today's date, normalized
+    input). The date is part of the key because the prompts embed today's
+    date, so "what's due today" must not be answered from yesterday's entry.
+    Keeps an in-memory LRU and, when a path is given, persists entries to
+    SQLite so they survive restarts.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, day TEXT, value TEXT, created_at REAL)"
+                )
+                # Entries from previous days can never be hit again
+                self._conn.execute("DELETE FROM llm_cache WHERE day != ?", (self._today(),))
+
+    @staticmethod
+    def _today():
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def make_key(self, namespace, text):
+        return f"{namespace}|{self._today()}|{normalize_input(text)}"
+
+    def get(self, namespace, text):
+        """Return the cached JSON string for this input, or None on a miss."""
+        key = self.make_key(namespace, text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None and self._conn:
+                row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row:
+                    value = row[0]
+                    self._store(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, namespace, text, value):
+        key = self.make_key(namespace, text)
+        with self._lock:
+            self._store(key, value)
+            if self._conn:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, day, value, created_at) VALUES (?, ?, ?, ?)",
+                        (key, self._today(), value, time.time())
+                    )
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._conn:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries)
+            }
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Return the shared cache, or None when caching is disabled.
+
+    Configured through environment variables:
+        LLM_CACHE_ENABLED: set to "0" to always call the LLM
+        LLM_CACHE_SIZE: maximum in-memory entries (default 256)
+        LLM_CACHE_PATH: SQLite file for persisting entries across restarts (off by default)
+    """
+    global _llm_cache
+    if os.getenv("LLM_CACHE_ENABLED", "1") == "0":
+        return None
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            path = os.getenv("LLM_CACHE_PATH")
+            try:
+                _llm_cache = LLMCache(
+                    max_entries=int(os.getenv("LLM_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+                    path=os.path.expanduser(path) if path else None
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not open LLM cache file, using memory only: {e}")
+                _llm_cache = LLMCache()
+        return _llm_cache
+
+
+def memoize_llm(namespace, should_cache=None):
+    """
+    Decorator for functions of the form f(user_input) that call the LLM.
+    Results must be JSON-serializable (tuples are restored as tuples).
+    None results, and results rejected by should_cache, are not stored.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_input):
+            cache = get_llm_cache()
+            if cache is None:
+                return func(user_input)
+
+            cached = cache.get(namespace, user_input)
+            if cached is not None:
+                entry = json.loads(cached)
+                print(f"💾 Cache hit for {namespace}")
+                return tuple(entry["value"]) if entry["tuple"] else entry["value"]
+
+            result = func(user_input)
+            if result is not None and (should_cache is None or should_cache(result)):
+                cache.set(namespace, user_input, json.dumps({"tuple": isinstance(result, tuple), "value": result}))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,227 @@
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+DEFAULT_CONNECT_TIMEOUT = 5.0   # seconds to establish a connection
+DEFAULT_DEADLINE = 30.0         # seconds for a whole call, retries included
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+DEFAULT_POOL_SIZE = 10
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class LLMError(Exception):
+    """Raised when a chat completion cannot be obtained within the retry/deadline budget."""
+
+
+class LLMClient:
+    """
+    LLM Client
+    Sends chat completion requests over a pooled keep-alive session so
+    repeated commands reuse the same TLS connection. Every call has an
+    overall deadline, and 429/5xx responses or connection errors are
+    retried a bounded number of times with jittered exponential backoff.
+    """
+
+    def __init__(self, api_key=None, url=OPENAI_CHAT_COMPLETIONS_URL,
+                 deadline=DEFAULT_DEADLINE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, pool_size=DEFAULT_POOL_SIZE):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.url = url
+        self.deadline = deadline
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+
+    def _backoff_delay(self, attempt, response=None):
+        """Honor Retry-After when the server sends it, otherwise use full-jitter backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, payload, deadline=None, stream=False):
+        """
+        POST the payload, retrying 429/5xx responses and connection errors
+        until the deadline or retry budget runs out.
+
+        Returns:
+            tuple: (response, give_up_at) for the first non-retryable response
+        """
+        deadline = deadline or self.deadline
+        give_up_at = time.monotonic() + deadline
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+
+            response = None
+            try:
+                response = self.session.post(
+                    self.url,
+                    json=payload,
+                    timeout=(min(self.connect_timeout, remaining), remaining),
+                    stream=stream
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response, give_up_at
+                last_error = f"HTTP {response.status_code}"
+                response.close()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = str(e)
+
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff_delay(attempt, response)
+            if time.monotonic() + delay >= give_up_at:
+                break
+            print(f"⏳ LLM request failed ({last_error}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+        raise LLMError(f"LLM request failed after {attempt + 1} attempt(s): {last_error or 'deadline exceeded'}")
+
+    def post(self, payload, deadline=None):
+        """
+        Send a chat completion request and return the decoded JSON response.
+
+        Args:
+            payload (dict): Chat completion request body
+            deadline (float): Seconds allowed for the whole call, retries included
+
+        Returns:
+            dict: Decoded response body
+
+        Raises:
+            LLMError: If no successful response arrives within the deadline or retry budget
+        """
+        response, _ = self._send(payload, deadline)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise LLMError(f"Invalid JSON in LLM response: {e}")
+
+    def stream(self, payload, on_token, deadline=None):
+        """
+        Send a streaming chat completion request (stream=True) and pass each
+        content delta to on_token as the server-sent events arrive.
+
+        Retries only happen before the first byte of the stream; a stream
+        that runs past the deadline is cut off and the partial text returned.
+
+        Returns:
+            str: The full text received
+
+        Raises:
+            LLMError: If the request fails before any text arrives
+        """
+        response, give_up_at = self._send(dict(payload, stream=True), deadline, stream=True)
+        if response.status_code >= 400:
+            try:
+                error = response.json().get("error")
+            except ValueError:
+                error = None
+            if isinstance(error, dict):
+                error = error.get("message")
+            response.close()
+            raise LLMError(f"HTTP {response.status_code}: {error or 'streaming request failed'}")
+
+        parts = []
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                chunk = json.loads(data)
+                choices = chunk.get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+
+                if time.monotonic() > give_up_at:
+                    print("\n⚠️  LLM stream exceeded its deadline, output truncated")
+                    break
+        except (requests.ConnectionError, requests.Timeout, ValueError) as e:
+            if not parts:
+                raise LLMError(f"LLM stream failed: {e}")
+            print(f"\n⚠️  LLM stream interrupted: {e}")
+        finally:
+            response.close()
+
+        return "".join(parts)
+
+    def chat(self, messages, max_tokens, model=DEFAULT_MODEL, deadline=None, **options):
+        """
+        Run a chat completion and return the text of the first choice
+        (None when the model returned no content, e.g. a refusal).
+
+        Raises:
+            LLMError: If the request fails or the response has no choices
+        """
+        return self.chat_message(messages, max_tokens, model=model, deadline=deadline, **options).get('content')
+
+    def chat_message(self, messages, max_tokens, model=DEFAULT_MODEL, deadline=None, **options):
+        """
+        Run a chat completion and return the first choice's message dict
+        (content, and refusal when the model declined a json_schema request).
+
+        Raises:
+            LLMError: If the request fails or the response has no choices
+        """
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens}
+        payload.update(options)
+        response_data = self.post(payload, deadline=deadline)
+
+        if 'choices' in response_data and len(response_data['choices']) > 0:
+            return response_data['choices'][0]['message']
+        error = response_data.get("error")
+        if isinstance(error, dict):
+            error = error.get("message")
+        raise LLMError(error or "No valid response from model")
+
+    def close(self):
+        self.session.close()
+
+
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Return the process-wide LLM client, creating it on first use."""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            _llm_client = LLMClient()
+        return _llm_client
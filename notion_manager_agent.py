@@ -1,267 +1,254 @@
-import requests
 import os
-import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from notion_tools import add_tasks_to_notion, get_tasks_from_notion, update_task_in_notion, delete_task_from_notion, search_tasks_in_notion
-from speech_tools import *
-import ast
+from notion_tools import (
+    add_tasks_to_notion, get_tasks_from_notion, get_task_from_notion, update_task_in_notion, delete_task_from_notion,
+    search_tasks_in_notion, bulk_update_tasks_in_notion, bulk_archive_tasks_in_notion, MATCH_FIELDS
+)
+from speech_tools import listen_for_speech_push_to_talk
+from task_replica import get_task_replica
+from llm_client import get_llm_client, LLMError
+from intent_schemas import (
+    BULK_ARCHIVE_SCHEMA, BULK_UPDATE_SCHEMA, COMBINED_SCHEMA, DELETE_SCHEMA, INTENT_ARGUMENT_SCHEMAS, INTENT_TYPES,
+    QUERY_SCHEMA, UPDATE_SCHEMA, check_bulk_arguments, check_query_filters, check_updates,
+    validate_intent_arguments
+)
+from structured_output import request_structured_output, decode_json, StructuredOutputError
+from intent_classifier import classify_intent_locally, score_intents, DEFAULT_CONFIDENCE_THRESHOLD
+from llm_cache import memoize_llm, get_llm_cache
+from prompts import get_prompt, format_task_data
+from task_renderer import choose_render_mode, render_tasks, render_search_results
+from date_resolver import find_date_hints, resolve_date_range, remove_span
+from task_matcher import get_task_index, match_tasks, search_tasks
+from query_planner import plan_query
+
+# Per-call LLM deadlines in seconds, retries included
+INTENT_DEADLINE = 10
+PARSE_DEADLINE = 20
+SUMMARY_DEADLINE = 30
+
+# Classify intent and extract its arguments in one LLM call (set AGENT_COMBINED_PARSE=0 to disable)
+COMBINED_PARSE = os.getenv("AGENT_COMBINED_PARSE", "1") != "0"
+
+# How query results are shown: "local" list, "llm" summary, or "auto" (LLM only when a summary is asked for)
+RENDER_MODE = os.getenv("AGENT_RENDER_MODE", "auto")
+
+# Stream task summaries to the console token by token (set AGENT_STREAM_SUMMARIES=0 to print them whole)
+STREAM_SUMMARIES = os.getenv("AGENT_STREAM_SUMMARIES", "1") != "0"
+
+# Fetch update/delete candidates while the LLM parses the request (set AGENT_SPECULATIVE_FETCH=0 to fetch afterwards)
+SPECULATIVE_FETCH = os.getenv("AGENT_SPECULATIVE_FETCH", "1") != "0"
+# Intents whose handlers match the request against every task
+CANDIDATE_INTENTS = ("UPDATE_TASK", "DELETE_TASK")
+BULK_INTENTS = ("BULK_UPDATE_TASKS", "BULK_ARCHIVE_TASKS")
+
+# Minimum local classifier confidence needed to skip the LLM intent call (set above 1 to always use the LLM)
+LOCAL_INTENT_THRESHOLD = float(os.getenv("LOCAL_INTENT_THRESHOLD", DEFAULT_CONFIDENCE_THRESHOLD))
+
+
+def load_tasks(filters=None, sort_by=None, limit=50, fields=None):
+    """
+    Load Tasks
+    Reads from the local SQLite replica when it is enabled (syncing it first
+    if it is older than the configured max staleness), otherwise straight from
+    Notion with the filters pushed down by query_planner.
+
+    One exception: when the replica is due for a full rebuild and the filter
+    can be evaluated entirely by Notion, the filtered server query is much
+    cheaper than re-downloading every task first, so Notion answers it.
+
+    fields limits which task fields Notion sends back (see notion_tools
+    projections); the replica always holds full rows, so it ignores it.
+    """
+    replica = get_task_replica()
+    try:
+        plan = plan_query(filters)
+    except ValueError as e:
+        error_msg = f"Invalid filter: {e}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+    if replica and filters and replica.needs_full_sync() and plan.residual is None:
+        print("🧭 Replica needs a full sync; sending this filtered query to Notion instead")
+        replica = None
+    if replica:
+        result = replica.get_tasks(filters=filters, sort_by=sort_by, limit=limit)
+    else:
+        result = get_tasks_from_notion(filters=filters, sort_by=sort_by, limit=limit, fields=fields)
+    if "error" not in result:
+        get_task_index().upsert(result.get('tasks', []))  # keep the search index current
+    return result
+
+
+_fetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="candidate-fetch")
+
+
+def start_candidate_fetch(arguments=None):
+    """
+    Speculative Candidate Fetch
+    Starts loading every task in the background so the Notion round trip
+    overlaps the LLM parse of an update/delete request. Returns a future, or
+    None when there is no parse to overlap with or speculation is disabled.
+    """
+    if arguments or not SPECULATIVE_FETCH:
+        return None
+    return _fetch_executor.submit(load_tasks, limit=None, fields=MATCH_FIELDS)
+
+
+def start_speculative_fetch(user_input):
+    """
+    Start the candidate fetch before the intent LLM call when the local
+    classifier's best guess (even one below the threshold) is an update or
+    delete, so the Notion round trip overlaps the whole call. The handler
+    narrows the fetched tasks with the parsed identifier; any other intent
+    discards them. Bulk phrasings also match the update/delete rules, so no
+    fetch is started when a bulk rule matched too (it would download the whole
+    database while the bulk operation shares the rate limit).
+    """
+    intent_scores = score_intents(user_input)
+    if any(intent in BULK_INTENTS for intent in intent_scores):
+        return None
+    intent, _ = classify_intent_locally(user_input)
+    if intent not in CANDIDATE_INTENTS:
+        return None
+    return start_candidate_fetch()
+
+
+def collect_candidates(pending):
+    """Wait for a speculative fetch started by start_candidate_fetch, or fetch now if none was started."""
+    print("🔍 Retrieving available tasks to find the target task...")
+    if pending is None:
+        return load_tasks(limit=None, fields=MATCH_FIELDS)  # Match against every task, not just the first page
+    try:
+        return pending.result()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def load_task_details(task):
+    """
+    Fill in the fields a projected candidate fetch left out, so the chosen
+    task can be shown in full. Returns the task unchanged if it is complete
+    or the lookup fails.
+    """
+    if all(field in task for field in ("due_date", "priority", "category", "status")):
+        return task
+    result = get_task_from_notion(task['id'])
+    return result.get('task', task)
+
+
+def mark_replica_stale(archived_task_ids=()):
+    """Make the next read pick up a write the agent just made to Notion."""
+    for task_id in archived_task_ids:
+        get_task_index().discard(task_id)
+    replica = get_task_replica()
+    if replica:
+        for task_id in archived_task_ids:
+            replica.remove_task(task_id)
+        replica.mark_stale()
+
+def classify_intent_fast(user_input):
+    """
+    Run the local rule-based classifier and report whether it is confident
+    enough to skip the LLM. Returns the intent or None.
+    """
+    intent, confidence = classify_intent_locally(user_input)
+    if intent and confidence >= LOCAL_INTENT_THRESHOLD:
+        print(f"⚡ Intent answered by local classifier ({intent}, confidence {confidence:.2f})")
+        return intent
+    return None
 
-api_key = os.getenv("OPENAI_API_KEY")
 
 def determine_user_intent(user_input):
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
-    payload = {
-    "model": "gpt-4o-mini",
-    "messages": [
-        {
-        "role": "user",
-        "content": [
-            {
-            "type": "text",
-            "text": """
-            
-            You are a helpful assistant that helps the user manage their Notion schedule.
-            You are responsible for determining the user's intent and responding accordingly.
-
-            Today's date is """ + str(datetime.now().strftime("%Y-%m-%d")) + """.
-
-            The user will ask you to complete a task for them. You need to classify the task into one of the following INTENT TYPES:
-
-            1. CREATE_TASK - User wants to add new task(s) to their Notion schedule
-            2. QUERY_TASKS - User wants to query their Notion schedule for tasks
-            3. UPDATE_TASK - User wants to update an existing task in their Notion schedule (e.g. change the due date, priority, status, etc.)
-            4. DELETE_TASK - User wants to delete an existing task in their Notion schedule
-            5. SEARCH_TASKS - User wants to search their Notion schedule for tasks
-            6. UNKNOWN - User's intent is not clear
-
-            EXAMPLES:
-            - "Add a meeting tomorrow at 2pm" → CREATE_TASK
-            - "Show me my tasks for this week" → QUERY_TASKS
-            - "What tasks do I have today?" → QUERY_TASKS
-            - "Mark the workout task as Done" → UPDATE_TASK
-            - "Change the meeting time to 3pm" → UPDATE_TASK
-            - "Delete the old task" → DELETE_TASK
-            - "Find tasks about project planning" → SEARCH_TASKS
-            - "Hello" → UNKNOWN
-
-            Only respond with the intent type (CREATE_TASK, QUERY_TASKS, UPDATE_TASK, DELETE_TASK, SEARCH_TASKS, UNKNOWN), no other text.
-
-            User Input: """ + user_input + """
-            """
-            
-            }
-        ]
-        }
-    ],
-    
-    "max_tokens": 50
-    }
+    local_intent = classify_intent_fast(user_input)
+    if local_intent:
+        return local_intent
+    return request_intent_classification(user_input) or "UNKNOWN"
+
+
+@memoize_llm("intent")
+def request_intent_classification(user_input):
+    """Ask the LLM for the intent type. Returns None if the call fails."""
+    payload = get_prompt("intent").build_payload(user_input=user_input)
 
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-        response_data = response.json()
+        response_data = get_llm_client().post(payload, deadline=INTENT_DEADLINE)
         
         if 'choices' in response_data and len(response_data['choices']) > 0:
             intent = response_data['choices'][0]['message']['content'].strip()
+            print(f"🤖 Intent answered by LLM ({intent})")
             return intent
         else:
-            return "UNKNOWN"
+            return None
     except Exception as e:
         print(f"Error classifying intent: {e}")
-        return "UNKNOWN"
+        return None
+
+@memoize_llm("classify_and_parse", should_cache=lambda result: result[1] is not None)
+def classify_and_parse(user_input):
+    """
+    Classify and Parse
+    Determines the user's intent AND extracts the structured arguments for that
+    intent in a single LLM round trip. The response is requested in the shape
+    of COMBINED_SCHEMA and the arguments are validated against the per-intent
+    schema in intent_schemas (with one repair attempt); if they still don't
+    validate, the intent is returned with arguments set to None so the
+    handler parses on its own.
+
+    Returns:
+        tuple: (intent, arguments or None)
+    """
+    payload = get_prompt("classify_and_parse").build_payload(user_input=user_input, date_hints=find_date_hints(user_input))
+
+    try:
+        result = request_structured_output(
+            payload, COMBINED_SCHEMA, "intent_with_arguments", deadline=PARSE_DEADLINE,
+            extra_validator=lambda value: validate_intent_arguments(value["intent"], value["arguments"])
+        )
+    except StructuredOutputError as e:
+        partial, _ = decode_json(e.content or "")
+        if isinstance(partial, dict) and partial.get("intent") in INTENT_TYPES:
+            print(f"⚠️  Arguments for {partial['intent']} failed validation ({e.errors[0]}), parsing separately")
+            return partial["intent"], None
+        print(f"⚠️  Invalid combined response ({e}), falling back to intent-only classification")
+        return determine_user_intent(user_input), None
+    except LLMError as e:
+        print(f"Error classifying intent: {e}")
+        return "UNKNOWN", None
+
+    print(f"🤖 Intent answered by LLM with arguments ({result['intent']})")
+    return result["intent"], result["arguments"]
 
 """
 TASK CREATION
 """
 
 def request_task_addition(question):
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
-    payload = {
-    "model": "gpt-4o-mini",
-    "messages": [
-        {
-        "role": "user",
-        "content": [
-            {
-            "type": "text",
-            "text": """
-            
-            You are an assistant that helps make and maintain a daily schedule on Notion.
-
-            The user will ask you to add one or more tasks to their Notion schedule and provide you the details.
-
-            You must respond in a JSON format with the following structure - an array of tasks:
-
-            [
-                {
-                    "task_name": "The name/title of the task",
-                    "due_date": "YYYY-MM-DD HH:MM",
-                    "priority": "Low/Medium/High",
-                    "category": "General/Personal/Fitness/Fun/School",
-                    "status": "To-Do/In Progress/Done",
-                    "notes": "Additional details, description, or context about the task"
-                }
-            ]
-
-            IMPORTANT RULES:
-            1. The due_date must be in the format "YYYY-MM-DD HH:MM" (24-hour format)
-            2. Priority must be exactly one of: "Low", "Medium", or "High" (case-sensitive)
-            3. Category must be exactly one of: "General", "Personal", "Fitness", "Fun", or "School" (case-sensitive)
-            4. Status must be exactly one of: "To-Do", "In Progress", or "Done" (case-sensitive)
-            5. Notes should contain relevant details, context, or description about the task
-            6. If the user doesn't specify a field, use these defaults:
-               - priority: "Medium"
-               - category: "General"
-               - status: "To-Do"
-               - notes: "" (empty string if no details provided)
-            7. For the due_date, if the user doesn't specify a time, default to "12:00"
-            8. If the user doesn't specify a date, use today's date. Today's date is """ + str(datetime.now().strftime("%Y-%m-%d")) + """
-            9. ALWAYS return an array, even if there's only one task
-            10. If the user mentions multiple tasks, separate them into individual objects in the array
-
-            EXAMPLES:
-
-            User: "Add a meeting with John tomorrow at 2pm to discuss the new project requirements"
-            Response: [
-                {
-                    "task_name": "Meeting with John",
-                    "due_date": "2025-06-12 14:00",
-                    "priority": "Medium",
-                    "category": "General",
-                    "status": "To-Do",
-                    "notes": "Discuss new project requirements"
-                }
-            ]
-
-            User: "Add three tasks: workout tomorrow at 6am, buy groceries today at 5pm, and call mom on Friday at 3pm"
-            Response: [
-                {
-                    "task_name": "Workout",
-                    "due_date": "2025-06-17 06:00",
-                    "priority": "Medium",
-                    "category": "Fitness",
-                    "status": "To-Do",
-                    "notes": ""
-                },
-                {
-                    "task_name": "Buy groceries",
-                    "due_date": "2025-06-16 17:00",
-                    "priority": "Medium",
-                    "category": "General",
-                    "status": "To-Do",
-                    "notes": ""
-                },
-                {
-                    "task_name": "Call mom",
-                    "due_date": "2025-06-20 15:00",
-                    "priority": "Medium",
-                    "category": "Personal",
-                    "status": "To-Do",
-                    "notes": ""
-                }
-            ]
-
-            User: "High priority workout session - need to focus on cardio and strength training"
-            Response: [
-                {
-                    "task_name": "Workout session",
-                    "due_date": "2025-06-16 12:00",
-                    "priority": "High",
-                    "category": "Fitness",
-                    "status": "To-Do",
-                    "notes": "Focus on cardio and strength training"
-                }
-            ]
-
-            User: "Complete the math homework for school - chapters 5 and 6, due next week"
-            Response: [
-                {
-                    "task_name": "Complete math homework",
-                    "due_date": "2025-06-22 12:00",
-                    "priority": "Medium",
-                    "category": "School",
-                    "status": "To-Do",
-                    "notes": "Chapters 5 and 6, due next week"
-                }
-            ]
-
-            User: "Watch a movie tonight at 8pm for fun - planning to watch the new sci-fi film"
-            Response: [
-                {
-                    "task_name": "Watch a movie",
-                    "due_date": "2025-06-16 20:00",
-                    "priority": "Low",
-                    "category": "Fun",
-                    "status": "To-Do",
-                    "notes": "Planning to watch the new sci-fi film"
-                }
-            ]
-
-            User: "Doctor appointment next Friday at 10am for annual checkup"
-            Response: [
-                {
-                    "task_name": "Doctor appointment",
-                    "due_date": "2025-06-20 10:00",
-                    "priority": "High",
-                    "category": "Personal",
-                    "status": "To-Do",
-                    "notes": "Annual checkup"
-                }
-            ]
-
-            CRITICAL: Respond with ONLY valid JSON. No comments, no explanations, no additional text outside the JSON structure.
-
-            Here is the task(s) the user wants to add: """ + question + """
-            """
-            
-            }
-        ]
-        }
-    ],
-    
-    "max_tokens": 1000
-    }
+    payload = get_prompt("task_creation").build_payload(user_input=question, date_hints=find_date_hints(question))
 
-    response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-    response_data = response.json()
-    
-    if 'choices' in response_data and len(response_data['choices']) > 0:
-        structured_response = response_data['choices'][0]['message']['content']
-        cleaned_response = structured_response.strip('```json\n').strip('```').strip()
-        print("Cleaned response:", cleaned_response)
-        try:
-            response_dict = json.loads(cleaned_response)
-            return response_dict
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            try:
-                response_dict = ast.literal_eval(cleaned_response)
-                return response_dict
-            except Exception as ast_error:
-                print(f"AST literal_eval error: {ast_error}")
-                return {"error": "Failed to decode response as JSON", "content": cleaned_response}
-    else:
-        return {"error": "No valid response from model"}
+    try:
+        response = request_structured_output(
+            payload, INTENT_ARGUMENT_SCHEMAS["CREATE_TASK"], "task_list", deadline=PARSE_DEADLINE
+        )
+    except StructuredOutputError as e:
+        return {"error": f"Could not parse tasks: {e}", "content": e.content}
+    except LLMError as e:
+        return {"error": f"LLM request failed: {e}"}
 
-def handle_task_creation(user_input):
+    return response["tasks"]
+
+def handle_task_creation(user_input, arguments=None):
     """
     Task Creation Handler
     This function orchestrates the task creation process:
-    1. Calls request_task_addition to parse the user input
+    1. Calls request_task_addition to parse the user input (skipped when
+       classify_and_parse already supplied validated arguments)
     2. Calls add_tasks_to_notion to save to Notion
     3. Provides feedback to the user
     """
     print(f"\n📝 Processing task creation: '{user_input}'")
     
-    response = request_task_addition(user_input)
+    response = arguments["tasks"] if arguments else request_task_addition(user_input)
     
     if "error" in response:
         print("❌ Error occurred:", response["error"])
@@ -278,6 +265,7 @@ def handle_task_creation(user_input):
     
     try:
         results = add_tasks_to_notion(tasks)
+        mark_replica_stale()
         
         successful = 0
         failed = 0
@@ -304,90 +292,119 @@ def handle_task_creation(user_input):
 TASK QUERYING
 """
 
+# Words that carry no filter meaning in a query like "what do I have due this week?"
+QUERY_FILLER_WORDS = {
+    "show", "list", "display", "view", "see", "get", "give", "tell", "what", "what's", "whats", "which",
+    "me", "my", "i", "do", "have", "got", "are", "is", "there", "any", "all", "the", "a", "for", "of",
+    "in", "on", "to", "due", "tasks", "task", "things", "schedule", "agenda", "please", "can", "you",
+    "could", "coming", "up", "planned", "scheduled", "everything"
+}
+QUERY_SUBJECT_WORDS = {"tasks", "task", "schedule", "agenda", "everything"}
+
+
+def parse_query_locally(user_input):
+    """
+    Local Query Parse
+    Handles pure date-range queries ("what's due this week", "show my tasks
+    for tomorrow", "all tasks") without the LLM: the date expression is
+    resolved by date_resolver and every remaining word must be filler.
+
+    Returns:
+        dict: Query parameters, or None if the query needs the LLM
+    """
+    text = user_input.lower()
+    resolved = resolve_date_range(text)
+    if resolved:
+        text = remove_span(text, resolved[1])
+
+    words = re.findall(r"[a-z']+", text)
+    if any(word not in QUERY_FILLER_WORDS for word in words):
+        return None
+    if not resolved and not QUERY_SUBJECT_WORDS.intersection(words):
+        return None
+
+    filters = {"date_range": list(resolved[0])} if resolved else {}
+    return {"filters": filters, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+
+
 def parse_query_parameters(user_input):
     """
     Parse user input to extract query parameters for task retrieval.
     This function converts natural language into structured query parameters.
+    Pure date-range queries are resolved locally; anything else goes to the
+    LLM. Falls back to "all tasks" if the LLM call fails.
     """
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": [
-            {
-                "role": "user",
-                "content": f"""
-                Parse the user's query to extract filtering and sorting parameters for task retrieval.
-                
-                Extract the following information:
-                1. Date range (today, this week, this month, tomorrow, next week, etc.)
-                2. Category filter (General, Personal, Fitness, Fun, School)
-                3. Priority filter (Low, Medium, High)
-                4. Status filter (To-Do, In Progress, Done)
-                5. Sort preference (by due date, priority, etc.)
-                6. Limit (how many tasks to show)
-                
-                Respond in JSON format:
-                {{
-                    "filters": {{
-                        "category": "string or null",
-                        "priority": "string or null", 
-                        "status": "string or null",
-                        "date_range": ["start_date", "end_date"] or null
-                    }},
-                    "sort_by": {{
-                        "property": "due_date or priority",
-                        "direction": "ascending or descending"
-                    }} or null,
-                    "limit": number
-                }}
-                
-                Today's date is {datetime.now().strftime("%Y-%m-%d")}.
-                
-                Examples:
-                - "Show me tasks for this week" → {{"filters": {{"date_range": ["2025-06-16", "2025-06-22"]}}, "sort_by": {{"property": "due_date", "direction": "ascending"}}, "limit": 50}}
-                - "High priority tasks" → {{"filters": {{"priority": "High"}}, "sort_by": {{"property": "due_date", "direction": "ascending"}}, "limit": 50}}
-                - "Completed fitness tasks" → {{"filters": {{"category": "Fitness", "status": "Done"}}, "sort_by": null, "limit": 50}}
-                - "All tasks" → {{"filters": {{}}, "sort_by": {{"property": "due_date", "direction": "ascending"}}, "limit": 50}}
-                
-                User input: "{user_input}"
-                """
-            }
-        ],
-        "max_tokens": 500
-    }
-    
+    params = parse_query_locally(user_input)
+    if params:
+        print("⚡ Query parameters resolved locally")
+        return params
+
+    params = request_query_parameters(user_input)
+    if params is None:
+        return {"filters": {}, "sort_by": None, "limit": 50}
+    return params
+
+
+@memoize_llm("query_parameters")
+def request_query_parameters(user_input):
+    """Ask the LLM for query parameters. Returns None if the call fails."""
+    payload = get_prompt("query_parameters").build_payload(user_input=user_input, date_hints=find_date_hints(user_input))
+
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-        response_data = response.json()
-        
-        if 'choices' in response_data and len(response_data['choices']) > 0:
-            content = response_data['choices'][0]['message']['content'].strip()
-            content = content.strip('```json\n').strip('```').strip()
-            return json.loads(content)
-        else:
-            return {"filters": {}, "sort_by": None, "limit": 50}
-    except Exception as e:
+        return request_structured_output(
+            payload, QUERY_SCHEMA, "query_parameters", deadline=PARSE_DEADLINE, extra_validator=check_query_filters
+        )
+    except LLMError as e:
         print(f"Error parsing query parameters: {e}")
-        return {"filters": {}, "sort_by": None, "limit": 50}
+        return None
+
+def format_task_list(tasks):
+    """Plain, LLM-free listing of tasks (used when the summary can't be generated)."""
+    output = ""
+    for i, task in enumerate(tasks, 1):
+        due_date_str = "No due date"
+        if task.get('due_date'):
+            try:
+                if isinstance(task['due_date'], str):
+                    dt = datetime.fromisoformat(task['due_date'].replace('Z', '+00:00'))
+                    due_date_str = dt.strftime("%Y-%m-%d %H:%M")
+                else:
+                    due_date_str = task['due_date']
+            except:
+                due_date_str = str(task['due_date'])
+        
+        priority_emoji = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}.get(task.get('priority', ''), "⚪")
+        status_emoji = {"To-Do": "⏳", "In Progress": "🔄", "Done": "✅"}.get(task.get('status', ''), "❓")
+        category_emoji = {
+            "General": "📝", "Personal": "👤", "Fitness": "💪", 
+            "Fun": "🎉", "School": "📚"
+        }.get(task.get('category', ''), "📋")
+        
+        output += f"{i:2d}. {priority_emoji} {status_emoji} {category_emoji} {task.get('task_name', 'Untitled')}\n"
+        output += f"    📅 Due: {due_date_str}\n"
+        output += f"    🏷️  Priority: {task.get('priority', 'N/A')} | Category: {task.get('category', 'N/A')} | Status: {task.get('status', 'N/A')}\n"
+        
+        if task.get('notes'):
+            output += f"    📝 Notes: {task['notes']}\n"
+        
+        if task.get('id'):
+            output += f"    🆔 ID: {task['id'][:8]}...\n"
+        
+        output += "\n"
+    
+    return output
 
-def format_task_display(tasks, title="Tasks"):
+def format_task_display(tasks, title="Tasks", on_token=None):
     """
     Use LLM to generate a natural language summary of the retrieved tasks.
+
+    When on_token is given the summary is streamed: the header and then each
+    token are passed to on_token as they arrive, and the full text is still returned.
     """
 
     if not tasks:
         return f"No tasks found for {title}"
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
     task_summaries = []
     for i, task in enumerate(tasks, 1):
         due_date_str = "No due date"
@@ -413,105 +430,66 @@ def format_task_display(tasks, title="Tasks"):
         }
         task_summaries.append(task_summary)
 
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": [
-            {
-                "role": "user",
-                "content": f"""
-                You are a helpful assistant that summarizes task information in a conversational, natural way.
-                
-                Today's date is {datetime.now().strftime("%Y-%m-%d")}.
-                
-                I have retrieved {len(tasks)} tasks from a Notion database. Please provide a natural language summary that:
-                
-                1. Uses a friendly, conversational tone
-                2. Highlights the most important information (due dates, priorities, status)
-                3. Groups tasks by priority, category, or status when helpful
-                4. Mentions any urgent or overdue tasks prominently
-                5. Provides actionable insights (e.g., "You have 3 high-priority tasks due today")
-                6. Keeps the summary concise but informative
-                
-                Task data:
-                {json.dumps(task_summaries, indent=2)}
-                
-                Original query context: "{title}"
-                
-                Respond with a natural, conversational summary that would be helpful for someone managing their tasks.
-                However, be concise and to the point, as the user is likely busy.
-                """
-            }
-        ],
-        "max_tokens": 800
-    }
+    payload = get_prompt("task_summary").build_payload(
+        task_count=len(tasks),
+        task_data=format_task_data(task_summaries),
+        title=title
+    )
+
+    header = f"\n📋 {title} ({len(tasks)} found):\n" + "=" * 80 + "\n"
 
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-        response_data = response.json()
+        if on_token:
+            on_token(header + "\n")
+            summary = get_llm_client().stream(payload, on_token, deadline=SUMMARY_DEADLINE)
+            on_token("\n")
+            return header + "\n" + summary.strip() + "\n"
+
+        response_data = get_llm_client().post(payload, deadline=SUMMARY_DEADLINE)
         
         if 'choices' in response_data and len(response_data['choices']) > 0:
             summary = response_data['choices'][0]['message']['content'].strip()
-            return f"\n📋 {title} ({len(tasks)} found):\n" + "=" * 80 + "\n\n" + summary + "\n"
+            return header + "\n" + summary + "\n"
         else:
             # If LLM fails, return a simple formatting
-            return f"\n📋 {title} ({len(tasks)} found):\n" + "=" * 80 + "\n" + "❌ Error generating summary - please check the raw data above.\n"
+            return header + "❌ Error generating summary - please check the raw data above.\n"
     
     except Exception as e:
         print(f"Error generating task summary: {e}")
         # Return simple formatting
-        output = f"\n📋 {title} ({len(tasks)} found):\n"
-        output += "=" * 80 + "\n"
-        for i, task in enumerate(tasks, 1):
-            due_date_str = "No due date"
-            if task.get('due_date'):
-                try:
-                    if isinstance(task['due_date'], str):
-                        dt = datetime.fromisoformat(task['due_date'].replace('Z', '+00:00'))
-                        due_date_str = dt.strftime("%Y-%m-%d %H:%M")
-                    else:
-                        due_date_str = task['due_date']
-                except:
-                    due_date_str = str(task['due_date'])
-            
-            priority_emoji = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}.get(task.get('priority', ''), "⚪")
-            status_emoji = {"To-Do": "⏳", "In Progress": "🔄", "Done": "✅"}.get(task.get('status', ''), "❓")
-            category_emoji = {
-                "General": "📝", "Personal": "👤", "Fitness": "💪", 
-                "Fun": "🎉", "School": "📚"
-            }.get(task.get('category', ''), "📋")
-            
-            output += f"{i:2d}. {priority_emoji} {status_emoji} {category_emoji} {task.get('task_name', 'Untitled')}\n"
-            output += f"    📅 Due: {due_date_str}\n"
-            output += f"    🏷️  Priority: {task.get('priority', 'N/A')} | Category: {task.get('category', 'N/A')} | Status: {task.get('status', 'N/A')}\n"
-            
-            if task.get('notes'):
-                output += f"    📝 Notes: {task['notes']}\n"
-            
-            if task.get('id'):
-                output += f"    🆔 ID: {task['id'][:8]}...\n"
-            
-            output += "\n"
-        
-        return output
+        task_list = format_task_list(tasks)
+        if on_token:
+            on_token(task_list)
+        return header + task_list
+
+def print_task_summary(tasks, title="Tasks"):
+    """Print the task summary, streaming it to the console as it is generated."""
+    if not tasks:
+        print(format_task_display(tasks, title))
+        return
+    format_task_display(tasks, title, on_token=lambda token: print(token, end="", flush=True))
+    print()
 
-def handle_task_query(user_input):
+def handle_task_query(user_input, arguments=None):
     """
     Task Query Handler
     This function orchestrates the task query process:
-    1. Calls parse_query_parameters to extract filters and sorting
+    1. Calls parse_query_parameters to extract filters and sorting (skipped
+       when classify_and_parse already supplied validated arguments)
     2. Calls get_tasks_from_notion to retrieve tasks
-    3. Uses LLM to generate natural language summary of results
+    3. Renders the results locally, or has the LLM summarize them when the
+       render policy (AGENT_RENDER_MODE) calls for commentary
     """
     
     print(f"\n🔍 Processing task query: '{user_input}'")
     
-    params = parse_query_parameters(user_input)
+    params = arguments if arguments else parse_query_parameters(user_input)
     print(f"📊 Query parameters: {params}")
     
-    result = get_tasks_from_notion(
+    result = load_tasks(
         filters=params.get('filters'),
         sort_by=params.get('sort_by'),
-        limit=params.get('limit', 50)
+        limit=params.get('limit') or 50
     )
     
     if "error" in result:
@@ -524,7 +502,15 @@ def handle_task_query(user_input):
         print("💡 Try a broader search like 'all tasks' or 'tasks for this month'")
         return True
     
-    print(format_task_display(tasks, f"Tasks for '{user_input}'"))
+    title = f"Tasks for '{user_input}'"
+    if choose_render_mode(user_input, len(tasks), RENDER_MODE) == "local":
+        sort_by = params.get('sort_by') or {}
+        group_by = "priority" if sort_by.get('property') == "priority" else "day"
+        print(render_tasks(tasks, title, group_by=group_by))
+    elif STREAM_SUMMARIES:
+        print_task_summary(tasks, title)
+    else:
+        print(format_task_display(tasks, title))
     return True
     
 
@@ -585,212 +571,93 @@ def get_task_input():
 
 
 
+"""
+TASK SEARCHING
+"""
+
+# Leading command words stripped from "find tasks about project planning" to leave the search terms
+SEARCH_PREFIX_PATTERN = re.compile(
+    r"^\s*(?:please\s+)?(?:find|search(?:\s+for)?|look\s+(?:for|up)|lookup|locate)\s+"
+    r"(?:(?:all|any|my|the)\s+)*(?:tasks?|notes?|items?)?\s*"
+    r"(?:(?:about|on|for|with|containing|mentioning|related\s+to|regarding|called|named|that\s+mention)\s+)?",
+    re.IGNORECASE
+)
+
+
+def extract_search_query(user_input):
+    """Strip the command words from a search request; what's left are the search terms."""
+    query = SEARCH_PREFIX_PATTERN.sub("", user_input, count=1).strip(" ?.!\"'")
+    return query or user_input.strip()
+
+
+def handle_task_search(user_input, arguments=None):
+    """
+    Task Search Handler
+    1. Takes the search terms from classify_and_parse, or strips the command
+       words locally (no LLM call)
+    2. Loads every task (from the replica when enabled) and syncs the local
+       full-text index, which only re-indexes tasks that changed
+    3. Ranks tasks by name and notes with prefix and typo-tolerant matching
+    """
+    query = arguments["query"] if arguments else extract_search_query(user_input)
+    print(f"\n🔎 Searching tasks for: '{query}'")
+
+    result = load_tasks(limit=None)
+    if "error" in result:
+        print(f"❌ Error retrieving tasks: {result['error']}")
+        return False
+
+    print(render_search_results(search_tasks(query, result.get('tasks', [])), query))
+    return True
+
+
 """
 TASK UPDATING
 """
 
+def print_other_candidates(candidates):
+    """List the runner-up matches so the user can retry with a more specific name or an id."""
+    if not candidates:
+        return
+    print("   Other possible matches:")
+    for task in candidates:
+        print(f"   • {task.get('task_name', 'Untitled')} (🆔 {task.get('id', '')[:8]})")
+
+
 def parse_update_request(user_input):
     """
     Parse Update Request
     This function extracts what needs to be updated from natural language
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
-    payload = {
-    "model": "gpt-4o-mini",
-    "messages": [
-        {
-        "role": "user",
-        "content": [
-            {
-            "type": "text",
-            "text": """
-            
-            You are an assistant that helps update tasks in a Notion schedule.
-
-            The user wants to update an existing task. You need to extract:
-            1. What task they want to update (task identifier)
-            2. What changes they want to make to the task
-
-            Respond in JSON format with this structure:
-
-            {
-                "task_identifier": {
-                    "type": "name/id/description",
-                    "value": "the identifier value"
-                },
-                "updates": {
-                    "task_name": "new name (if changing)",
-                    "due_date": "YYYY-MM-DD HH:MM (if changing)",
-                    "priority": "Low/Medium/High (if changing)",
-                    "category": "General/Personal/Fitness/Fun/School (if changing)",
-                    "status": "To-Do/In Progress/Done (if changing)",
-                    "notes": "new notes (if changing)"
-                }
-            }
-
-            IMPORTANT RULES:
-            1. Only include fields in "updates" that are actually being changed
-            2. For task_identifier:
-               - "type": "name" if they mention the task name
-               - "type": "id" if they mention a specific ID
-               - "type": "description" if they describe the task
-            3. For dates: Use "YYYY-MM-DD HH:MM" format (24-hour)
-            4. For priority: Must be "Low", "Medium", or "High"
-            5. For category: Must be "General", "Personal", "Fitness", "Fun", or "School"
-            6. For status: Must be "To-Do", "In Progress", or "Done"
-            7. If no specific changes mentioned, return empty "updates" object
-            8. Today's date is """ + str(datetime.now().strftime("%Y-%m-%d")) + """
-
-            EXAMPLES:
-
-            User: "Mark the workout task as Done"
-            Response: {
-                "task_identifier": {
-                    "type": "name",
-                    "value": "workout"
-                },
-                "updates": {
-                    "status": "Done"
-                }
-            }
-
-            User: "Change the meeting with John to tomorrow at 3pm"
-            Response: {
-                "task_identifier": {
-                    "type": "description",
-                    "value": "meeting with John"
-                },
-                "updates": {
-                    "due_date": "2025-06-17 15:00"
-                }
-            }
-
-            User: "Update the project planning task to high priority and add notes about the deadline"
-            Response: {
-                "task_identifier": {
-                    "type": "name",
-                    "value": "project planning"
-                },
-                "updates": {
-                    "priority": "High",
-                    "notes": "Deadline approaching"
-                }
-            }
-
-            User: "Change the grocery shopping task category to Personal"
-            Response: {
-                "task_identifier": {
-                    "type": "name",
-                    "value": "grocery shopping"
-                },
-                "updates": {
-                    "category": "Personal"
-                }
-            }
-
-            User Input: """ + user_input + """
-            """
-            
-            }
-        ]
-        }
-    ],
-    
-    "max_tokens": 500
-    }
+    payload = get_prompt("update_request").build_payload(user_input=user_input, date_hints=find_date_hints(user_input))
 
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-        response_data = response.json()
-        
-        if 'choices' in response_data and len(response_data['choices']) > 0:
-            result_text = response_data['choices'][0]['message']['content'].strip()
-            try:
-                result = json.loads(result_text)
-                return result
-            except json.JSONDecodeError as e:
-                print(f"❌ Error parsing update request: {e}")
-                return None
-        else:
-            return None
-    except Exception as e:
+        return request_structured_output(
+            payload, UPDATE_SCHEMA, "update_request", deadline=PARSE_DEADLINE, extra_validator=check_updates
+        )
+    except LLMError as e:
         print(f"❌ Error parsing update request: {e}")
         return None
 
-def identify_task_to_update(task_identifier, available_tasks):
-    """
-    Identify Task to Update
-    This function finds the specific task to update based on the identifier
-    """
-    if not available_tasks:
-        return None
-    
-    identifier_type = task_identifier.get('type', 'name')
-    identifier_value = task_identifier.get('value', '').lower()
-    
-    if identifier_type == 'id':
-        for task in available_tasks:
-            if task.get('id', '').startswith(identifier_value):
-                return task
-        return None
-    
-    elif identifier_type == 'name':
-        best_match = None
-        best_score = 0
-        
-        for task in available_tasks:
-            task_name = task.get('task_name', '').lower()
-            
-            if task_name == identifier_value:
-                return task
-            
-            if identifier_value in task_name or task_name in identifier_value:
-                score = len(set(identifier_value.split()) & set(task_name.split()))
-                if score > best_score:
-                    best_score = score
-                    best_match = task
-        
-        return best_match
-    
-    elif identifier_type == 'description':
-        best_match = None
-        best_score = 0
-        
-        for task in available_tasks:
-            task_name = task.get('task_name', '').lower()
-            task_notes = task.get('notes', '').lower()
-            task_text = f"{task_name} {task_notes}"
-            
-            identifier_words = set(identifier_value.split())
-            task_words = set(task_text.split())
-            score = len(identifier_words & task_words)
-            
-            if score > best_score:
-                best_score = score
-                best_match = task
-        
-        return best_match
-    
-    return None
-
-def handle_task_update(user_input):
+def handle_task_update(user_input, arguments=None, pending=None):
     """
     Task Update Handler
     This function orchestrates the task update process:
     1. Parses the update request to understand what needs to be changed
-    2. Retrieves available tasks to find the target task
-    3. Identifies the specific task to update
+       (skipped when classify_and_parse already supplied validated arguments)
+    2. Retrieves available tasks to find the target task (started in the
+       background alongside the parse, or passed in as pending when main()
+       started it before the intent call, see start_speculative_fetch)
+    3. Ranks candidate tasks with task_matcher and picks the best one
     4. Calls the update function
     5. Provides feedback to the user
     """
     
     print(f"\n🔄 Processing task update: '{user_input}'")
     
-    update_info = parse_update_request(user_input)
+    # Parse and fetch run concurrently; a failed parse just drops the fetched tasks
+    pending = pending or start_candidate_fetch(arguments)
+    update_info = arguments if arguments else parse_update_request(user_input)
     if not update_info:
         print("❌ Could not understand what you want to update. Please be more specific.")
         print("💡 Examples:")
@@ -808,8 +675,7 @@ def handle_task_update(user_input):
     
     print(f"📝 Identified updates: {list(updates.keys())}")
     
-    print("🔍 Retrieving available tasks to find the target task...")
-    result = get_tasks_from_notion(limit=100)  # Get more tasks for better matching
+    result = collect_candidates(pending)
     
     if "error" in result:
         print(f"❌ Error retrieving tasks: {result['error']}")
@@ -820,9 +686,9 @@ def handle_task_update(user_input):
         print("❌ No tasks found in your Notion database.")
         return False
     
-    target_task = identify_task_to_update(task_identifier, available_tasks)
+    candidates = match_tasks(task_identifier, available_tasks)
     
-    if not target_task:
+    if not candidates:
         print(f"❌ Could not find a task matching '{task_identifier.get('value', '')}'")
         print("💡 Available tasks:")
         for i, task in enumerate(available_tasks[:10], 1):
@@ -831,10 +697,13 @@ def handle_task_update(user_input):
             print(f"   ... and {len(available_tasks) - 10} more tasks")
         return False
     
+    target_task = load_task_details(candidates[0])
     print(f"✅ Found target task: {target_task.get('task_name', 'Untitled')}")
+    print_other_candidates(candidates[1:])
     
     print(f"🔄 Updating task...")
     update_result = update_task_in_notion(target_task['id'], updates)
+    mark_replica_stale()
     
     if "error" in update_result:
         print(f"❌ Error updating task: {update_result['error']}")
@@ -885,169 +754,24 @@ def parse_delete_request(user_input):
     Parse Delete Request
     This function extracts what task needs to be deleted from natural language
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-
-    payload = {
-    "model": "gpt-4o-mini",
-    "messages": [
-        {
-        "role": "user",
-        "content": [
-            {
-            "type": "text",
-            "text": """
-            
-            You are an assistant that helps delete tasks from a Notion schedule.
-
-            The user wants to delete an existing task. You need to extract:
-            1. What task they want to delete (task identifier)
-
-            Respond in JSON format with this structure:
-
-            {
-                "task_identifier": {
-                    "type": "name/id/description",
-                    "value": "the identifier value"
-                }
-            }
-
-            IMPORTANT RULES:
-            1. For task_identifier:
-               - "type": "name" if they mention the task name
-               - "type": "id" if they mention a specific ID
-               - "type": "description" if they describe the task
-            2. Extract the most specific identifier possible
-            3. If multiple tasks could match, prefer the most specific one
-
-            EXAMPLES:
-
-            User: "Delete the workout task"
-            Response: {
-                "task_identifier": {
-                    "type": "name",
-                    "value": "workout"
-                }
-            }
-
-            User: "Remove the meeting with John"
-            Response: {
-                "task_identifier": {
-                    "type": "description",
-                    "value": "meeting with John"
-                }
-            }
-
-            User: "Delete task abc123"
-            Response: {
-                "task_identifier": {
-                    "type": "id",
-                    "value": "abc123"
-                }
-            }
-
-            User: "Remove the grocery shopping task"
-            Response: {
-                "task_identifier": {
-                    "type": "name",
-                    "value": "grocery shopping"
-                }
-            }
-
-            User Input: """ + user_input + """
-            """
-            
-            }
-        ]
-        }
-    ],
-    
-    "max_tokens": 300
-    }
+    payload = get_prompt("delete_request").build_payload(user_input=user_input, date_hints=find_date_hints(user_input))
 
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-        response_data = response.json()
-        
-        if 'choices' in response_data and len(response_data['choices']) > 0:
-            result_text = response_data['choices'][0]['message']['content'].strip()
-            try:
-                result = json.loads(result_text)
-                return result
-            except json.JSONDecodeError as e:
-                print(f"❌ Error parsing delete request: {e}")
-                return None
-        else:
-            return None
-    except Exception as e:
+        return request_structured_output(payload, DELETE_SCHEMA, "delete_request", deadline=PARSE_DEADLINE)
+    except LLMError as e:
         print(f"❌ Error parsing delete request: {e}")
         return None
 
-def identify_task_to_delete(task_identifier, available_tasks):
-    """
-    Identify Task to Delete
-    This function finds the specific task to delete based on the identifier
-    """
-    if not available_tasks:
-        return None
-    
-    identifier_type = task_identifier.get('type', 'name')
-    identifier_value = task_identifier.get('value', '').lower()
-    
-    if identifier_type == 'id':
-        for task in available_tasks:
-            if task.get('id', '').startswith(identifier_value):
-                return task
-        return None
-    
-    elif identifier_type == 'name':
-        best_match = None
-        best_score = 0
-        
-        for task in available_tasks:
-            task_name = task.get('task_name', '').lower()
-            
-            if task_name == identifier_value:
-                return task
-            
-            if identifier_value in task_name or task_name in identifier_value:
-                score = len(set(identifier_value.split()) & set(task_name.split()))
-                if score > best_score:
-                    best_score = score
-                    best_match = task
-        
-        return best_match
-    
-    elif identifier_type == 'description':
-        best_match = None
-        best_score = 0
-        
-        for task in available_tasks:
-            task_name = task.get('task_name', '').lower()
-            task_notes = task.get('notes', '').lower()
-            task_text = f"{task_name} {task_notes}"
-            
-            identifier_words = set(identifier_value.split())
-            task_words = set(task_text.split())
-            score = len(identifier_words & task_words)
-            
-            if score > best_score:
-                best_score = score
-                best_match = task
-        
-        return best_match
-    
-    return None
-
-def handle_task_deletion(user_input):
+def handle_task_deletion(user_input, arguments=None, pending=None):
     """
     Task Deletion Handler
     This function orchestrates the task deletion process:
     1. Parses the delete request to understand what task to delete
-    2. Retrieves available tasks to find the target task
-    3. Identifies the specific task to delete
+       (skipped when classify_and_parse already supplied validated arguments)
+    2. Retrieves available tasks to find the target task (started in the
+       background alongside the parse, or passed in as pending when main()
+       started it before the intent call, see start_speculative_fetch)
+    3. Ranks candidate tasks with task_matcher and picks the best one
     4. Confirms deletion with user
     5. Calls the delete function
     6. Provides feedback to the user
@@ -1055,7 +779,9 @@ def handle_task_deletion(user_input):
     
     print(f"\n🗑️  Processing task deletion: '{user_input}'")
     
-    delete_info = parse_delete_request(user_input)
+    # Parse and fetch run concurrently; a failed parse just drops the fetched tasks
+    pending = pending or start_candidate_fetch(arguments)
+    delete_info = arguments if arguments else parse_delete_request(user_input)
     if not delete_info:
         print("❌ Could not understand what task you want to delete. Please be more specific.")
         print("💡 Examples:")
@@ -1066,8 +792,7 @@ def handle_task_deletion(user_input):
     
     task_identifier = delete_info.get('task_identifier', {})
     
-    print("🔍 Retrieving available tasks to find the target task...")
-    result = get_tasks_from_notion(limit=100)
+    result = collect_candidates(pending)
     
     if "error" in result:
         print(f"❌ Error retrieving tasks: {result['error']}")
@@ -1078,9 +803,9 @@ def handle_task_deletion(user_input):
         print("❌ No tasks found in your Notion database.")
         return False
     
-    target_task = identify_task_to_delete(task_identifier, available_tasks)
+    candidates = match_tasks(task_identifier, available_tasks)
     
-    if not target_task:
+    if not candidates:
         print(f"❌ Could not find a task matching '{task_identifier.get('value', '')}'")
         print("💡 Available tasks:")
         for i, task in enumerate(available_tasks[:10], 1):
@@ -1089,7 +814,9 @@ def handle_task_deletion(user_input):
             print(f"   ... and {len(available_tasks) - 10} more tasks")
         return False
     
+    target_task = load_task_details(candidates[0])
     print(f"✅ Found target task: {target_task.get('task_name', 'Untitled')}")
+    print_other_candidates(candidates[1:])
     
     # Confirmation
     print(f"\n📋 Task Details:")
@@ -1120,6 +847,8 @@ def handle_task_deletion(user_input):
     if "error" in delete_result:
         print(f"❌ Error deleting task: {delete_result['error']}")
         return False
+
+    mark_replica_stale(archived_task_ids=[target_task['id']])
     
     print(f"✅ Task deleted successfully!")
     print(f"📝 Deleted task: {target_task.get('task_name', 'Untitled')}")
@@ -1128,6 +857,119 @@ def handle_task_deletion(user_input):
     return True
 
 
+"""
+BULK OPERATIONS
+"""
+
+# Matched tasks listed in the confirmation summary before "... and N more"
+BULK_PREVIEW_LIMIT = 10
+
+
+def parse_bulk_request(user_input, prompt_name, schema):
+    """
+    Parse Bulk Request
+    Extracts the task filter (and, for updates, the changes) from natural language
+    """
+    payload = get_prompt(prompt_name).build_payload(user_input=user_input, date_hints=find_date_hints(user_input))
+
+    try:
+        return request_structured_output(
+            payload, schema, prompt_name, deadline=PARSE_DEADLINE, extra_validator=check_bulk_arguments
+        )
+    except LLMError as e:
+        print(f"❌ Error parsing bulk request: {e}")
+        return None
+
+
+def confirm_bulk_operation(action, updates=None):
+    """
+    Build the confirm callback for a bulk operation: lists the matched tasks
+    and the changes, then asks the user to type 'yes'.
+    """
+    def confirm(tasks):
+        print(f"\n📋 {len(tasks)} task(s) will be {action}d:")
+        for task in tasks[:BULK_PREVIEW_LIMIT]:
+            print(f"   • {task.get('task_name') or 'Untitled'} "
+                  f"(📅 {task.get('due_date') or 'no due date'}, 📊 {task.get('status') or 'N/A'})")
+        if len(tasks) > BULK_PREVIEW_LIMIT:
+            print(f"   ... and {len(tasks) - BULK_PREVIEW_LIMIT} more tasks")
+        if updates:
+            print(f"📝 Changes: {', '.join(f'{field} → {value}' for field, value in updates.items())}")
+        if action == "archive":
+            print("💡 Note: Tasks are archived in Notion (not permanently deleted)")
+
+        confirm_input = input(f"Type 'yes' to {action} {len(tasks)} task(s): ").strip().lower()
+        return confirm_input == 'yes'
+    return confirm
+
+
+def report_bulk_result(result, action):
+    """Print the outcome of a bulk operation and refresh local state. Returns True if every page succeeded."""
+    if "error" in result:
+        print(f"❌ Bulk {action} failed: {result['error']}")
+        return False
+    if not result['matched']:
+        print(f"📭 No tasks match, nothing to {action}.")
+        return True
+    if result['status'] == "cancelled":
+        print(f"❌ Bulk {action} cancelled.")
+        return False
+
+    succeeded = [r['task_id'] for r in result['results'] if r['status'] == "success"]
+    mark_replica_stale(archived_task_ids=succeeded if action == "archive" else ())
+
+    if result['failed']:
+        print(f"⚠️  {result['failed']} of {result['matched']} task(s) could not be {action}d (see report above)")
+        return False
+    print(f"✅ {len(succeeded)} task(s) {action}d successfully!")
+    return True
+
+
+def handle_bulk_update(user_input, arguments=None):
+    """
+    Bulk Update Handler
+    1. Parses the filter and the changes (skipped when classify_and_parse
+       already supplied validated arguments)
+    2. Streams every matching task from Notion and shows a confirmation summary
+    3. Applies the changes concurrently under the rate limiter
+    4. Prints a per-task report
+    """
+    print(f"\n🔄 Processing bulk update: '{user_input}'")
+
+    bulk_info = arguments if arguments else parse_bulk_request(user_input, "bulk_update_request", BULK_UPDATE_SCHEMA)
+    if not bulk_info or not bulk_info.get('updates'):
+        print("❌ Could not understand which tasks to update or what to change.")
+        print("💡 Examples:")
+        print("   • 'Mark all fitness tasks this week as Done'")
+        print("   • 'Set every overdue task to high priority'")
+        return False
+
+    updates = bulk_info['updates']
+    result = bulk_update_tasks_in_notion(
+        bulk_info.get('filters') or {}, updates, confirm=confirm_bulk_operation("update", updates)
+    )
+    return report_bulk_result(result, "update")
+
+
+def handle_bulk_archive(user_input, arguments=None):
+    """
+    Bulk Archive Handler
+    Same flow as handle_bulk_update, archiving every matching task.
+    """
+    print(f"\n🗑️  Processing bulk archive: '{user_input}'")
+
+    bulk_info = arguments if arguments else parse_bulk_request(user_input, "bulk_archive_request", BULK_ARCHIVE_SCHEMA)
+    if not bulk_info:
+        print("❌ Could not understand which tasks to archive.")
+        print("💡 Examples:")
+        print("   • 'Archive everything Done from last month'")
+        print("   • 'Delete all tasks in the Fun category'")
+        return False
+
+    result = bulk_archive_tasks_in_notion(bulk_info.get('filters') or {}, confirm=confirm_bulk_operation("archive"))
+    return report_bulk_result(result, "archive")
+
+
 def main():
     print("🚀 Starting Notion Task Manager...")
     print("💡 This agent can:")
@@ -1136,6 +978,7 @@ def main():
     print("   • Update task details")
     print("   • Search for specific tasks")
     print("   • Delete tasks")
+    print("   • Update or archive many tasks at once")
     print("\n💡 Tips:")
     print("   - Be specific about dates, times, and details")
     print("   - For speech: Press ENTER to start, speak clearly and pause when done")
@@ -1145,27 +988,54 @@ def main():
     print("     • 'Mark the workout task as Done'")
     print("     • 'Delete the grocery shopping task'")
     print("     • 'Find tasks about project planning'")
+    print("     • 'Archive everything Done from last month'")
     
     while True:
         user_input = get_task_input()
         
         if user_input is None:
+            cache = get_llm_cache()
+            if cache:
+                stats = cache.stats()
+                print(f"💾 LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
             break
         
-        intent = determine_user_intent(user_input)
+        # A pure date-range query needs no LLM at all; a confident local
+        # classification skips the combined call and the handler then runs
+        # its own (smaller) intent-specific parse
+        local_query = parse_query_locally(user_input)
+        local_intent = None if local_query else classify_intent_fast(user_input)
+        pending = None
+        if local_query:
+            print("⚡ Query parameters resolved locally")
+            intent, arguments = "QUERY_TASKS", local_query
+        elif local_intent:
+            intent, arguments = local_intent, None
+        else:
+            pending = start_speculative_fetch(user_input)
+            if COMBINED_PARSE:
+                intent, arguments = classify_and_parse(user_input)
+            else:
+                intent, arguments = determine_user_intent(user_input), None
         print(f"\n🎯 Detected intent: {intent}")
+        if pending and intent not in CANDIDATE_INTENTS:
+            pending.cancel()
         
         # Route intent to appropriate handler
         if intent == "CREATE_TASK":
-            handle_task_creation(user_input)
+            handle_task_creation(user_input, arguments)
         elif intent == "QUERY_TASKS":
-            handle_task_query(user_input)
+            handle_task_query(user_input, arguments)
         elif intent == "UPDATE_TASK":
-            handle_task_update(user_input)
+            handle_task_update(user_input, arguments, pending)
         elif intent == "DELETE_TASK":
-            handle_task_deletion(user_input)
+            handle_task_deletion(user_input, arguments, pending)
         elif intent == "SEARCH_TASKS":
-            print("🔎 Task searching not yet implemented")
+            handle_task_search(user_input, arguments)
+        elif intent == "BULK_UPDATE_TASKS":
+            handle_bulk_update(user_input, arguments)
+        elif intent == "BULK_ARCHIVE_TASKS":
+            handle_bulk_archive(user_input, arguments)
         else:
             print("❓ I'm not sure what you want to do. Try being more specific.")
             print("💡 Examples:")
@@ -1,6 +1,13 @@
-from notion_client import Client
+from concurrent.futures import ThreadPoolExecutor
+from rate_limiter import AdaptiveRateLimiter, RateLimitedProxy
+from query_planner import FIELDS, plan_query, referenced_fields
+from task_matcher import STOPWORDS
+from task_model import PROPERTY_NAMES, TASK_FIELDS, page_parser, parse_task_page
 import datetime
+import itertools
 import os
+import threading
+import time
 
 
 def verify_database_url(url):
@@ -62,95 +69,357 @@ def validate_database_id(database_id):
     return True, "Database ID appears valid"
 
 
-notion_token = os.getenv("NOTION_TOKEN")
-database_url = os.getenv("NOTION_DATABASE_URL")
+# Notion allows an average of ~3 requests per second per integration, with some bursts;
+# the limiter starts at the average and probes up to the max until it sees a 429
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_MAX_REQUESTS_PER_SECOND = 5.0
+NOTION_ENDPOINTS = ("pages", "databases", "search", "blocks")
+DEFAULT_MAX_WORKERS = 4
+VERIFY_MODES = ("batch", "none")
+NOTION_MAX_PAGE_SIZE = 100
 
-if database_url:
-    try:
-        database_id = extract_database_id_from_url(database_url)
-        print(f"✅ Database ID extracted: {database_id}")
-    except ValueError as e:
-        print(f"❌ Error extracting database ID: {e}")
+SEARCH_MODES = ("database", "workspace")
+# Distinct search terms turned into contains conditions (two per term, well under Notion's limit of 100)
+SEARCH_MAX_TERMS = 10
+
+# Shared by every thread in the process: all calls through the client are limited and retried on 429
+notion_rate_limiter = AdaptiveRateLimiter(
+    rate=NOTION_REQUESTS_PER_SECOND,
+    capacity=NOTION_REQUESTS_PER_SECOND,
+    max_rate=NOTION_MAX_REQUESTS_PER_SECOND
+)
+
+# (client, database id, token), set up on first use so importing this module stays cheap
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def _connect():
+    """Read the Notion settings from the environment and build the shared, rate-limited client."""
+    notion_token = os.getenv("NOTION_TOKEN")
+    database_url = os.getenv("NOTION_DATABASE_URL")
+
+    if database_url:
+        try:
+            database_id = extract_database_id_from_url(database_url)
+            print(f"✅ Database ID extracted: {database_id}")
+        except ValueError as e:
+            print(f"❌ Error extracting database ID: {e}")
+            database_id = None
+    else:
         database_id = None
-else:
-    database_id = None
 
-if notion_token and database_id:
-    notion = Client(auth=notion_token)
-else:
-    notion = None
-    database_id = None
-    print("❌ Notion client not initialized. Please set NOTION_TOKEN and NOTION_DATABASE_URL environment variables.")
+    if notion_token and database_id:
+        # Imported here: httpx and notion-client are only needed once Notion is actually used
+        from notion_transport import create_notion_client
+        notion = RateLimitedProxy(create_notion_client(notion_token), notion_rate_limiter, NOTION_ENDPOINTS)
+    else:
+        notion = None
+        database_id = None
+        print("❌ Notion client not initialized. Please set NOTION_TOKEN and NOTION_DATABASE_URL environment variables.")
+    return notion, database_id, notion_token
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                _connection = _connect()
+    return _connection
+
+
+def get_notion():
+    """The shared rate-limited Notion client, created on first use; None without credentials."""
+    return _get_connection()[0]
+
+
+def get_database_id():
+    """The task database id from NOTION_DATABASE_URL, or None if the client isn't configured."""
+    return _get_connection()[1]
+
+
+def __getattr__(name):
+    # notion_tools.notion / .database_id / .notion_token still work, resolved lazily
+    if name == "notion":
+        return get_notion()
+    if name == "database_id":
+        return get_database_id()
+    if name == "notion_token":
+        return _get_connection()[2]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Property projections for reads (None = every property)
+MATCH_FIELDS = ("task_name", "notes")
+BULK_SUMMARY_FIELDS = ("task_name", "due_date", "status")
+
+# After a failed schema read, projected reads fetch every property for this long before retrying
+PROPERTY_IDS_RETRY_SECONDS = 300
+
+_property_ids = None
+_property_ids_failed_at = None
+_property_ids_lock = threading.Lock()
+
+
+def _build_task_page_data(task):
+    """Build the pages.create payload for a single parsed task."""
+    if not task.get('task_name'):
+        raise ValueError("Task name is required")
+
+    due_date = task['due_date']
+    if isinstance(due_date, str):
+        due_date = datetime.datetime.strptime(due_date, "%Y-%m-%d %H:%M")
+
+    if due_date.tzinfo is None:
+        local_tz = datetime.datetime.now().astimezone().tzinfo
+        due_date = due_date.replace(tzinfo=local_tz)
+
+    return {
+        "parent": {"database_id": get_database_id()},
+        "properties": {
+            PROPERTY_NAMES["task_name"]: {"title": [{"text": {"content": task['task_name']}}]},
+            PROPERTY_NAMES["due_date"]: {"date": {"start": due_date.isoformat()}},
+            PROPERTY_NAMES["priority"]: {"select": {"name": task.get('priority', 'Medium')}},
+            PROPERTY_NAMES["category"]: {"select": {"name": task.get('category', 'General')}},
+            PROPERTY_NAMES["status"]: {"select": {"name": task.get('status', 'To-Do')}},
+            PROPERTY_NAMES["notes"]: {"rich_text": [{"text": {"content": task.get('notes', '')}}]}
+        }
+    }
+
+
+def _print_task_preview(task, page_data):
+    print(
+        f"📝 Creating task: {task.get('task_name', 'Untitled')}\n"
+        f"   📅 Due: {page_data['properties'][PROPERTY_NAMES['due_date']]['date']['start']}\n"
+        f"   🏷️  Priority: {task.get('priority', 'Medium')}\n"
+        f"   📂 Category: {task.get('category', 'General')}\n"
+        f"   📊 Status: {task.get('status', 'To-Do')}"
+    )
+
+
+def _created_result(task_name, created_page):
+    page_id = created_page['id']
+    print(f"✅ Task created with ID: {page_id}")
+    return {"task": task_name, "status": "success", "page_id": page_id}
+
+
+def _create_error_result(task_name, error):
+    """Report a failed page creation, with a hint at the likely cause."""
+    error_msg = str(error)
+    print(f"❌ Error creating task '{task_name}': {error_msg}")
+
+    if "database_id" in error_msg.lower():
+        print("💡 This might be a database access issue")
+    elif "properties" in error_msg.lower():
+        print("💡 This might be a property name/type mismatch")
+    elif "date" in error_msg.lower():
+        print("💡 This might be a date format issue")
+
+    return {"task": task_name, "status": "error", "error": error_msg}
+
+
+def _create_task_page(task):
+    """
+    Create a single task page
+    Runs on a worker thread; every Notion call waits for a rate limiter permit.
+    Errors are captured in the returned result so the rest of the batch continues.
+    """
+    task_name = task.get('task_name', 'Untitled')
+    try:
+        page_data = _build_task_page_data(task)
+        _print_task_preview(task, page_data)
+        return _created_result(task_name, get_notion().pages.create(**page_data))
+    except Exception as e:
+        return _create_error_result(task_name, e)
+
+
+def _query_database_pages(query_params):
+    """
+    Run a databases.query and follow next_cursor until every page is returned.
+    Yields raw page objects one at a time.
+    """
+    notion = get_notion()
+    params = dict(query_params)
+    params.setdefault("database_id", get_database_id())
+    while True:
+        response = notion.databases.query(**params)
+        for page in response["results"]:
+            yield page
+        if not response.get("has_more") or not response.get("next_cursor"):
+            break
+        params["start_cursor"] = response["next_cursor"]
+
+
+def cached_property_ids():
+    """
+    The cached property name -> id map, without any I/O.
+
+    Returns:
+        tuple: (property ids or None, whether the schema should be read now).
+            A read is due when the schema hasn't been read yet, or the last
+            read failed more than PROPERTY_IDS_RETRY_SECONDS ago.
+    """
+    with _property_ids_lock:
+        if _property_ids is not None:
+            return _property_ids, False
+        return None, (_property_ids_failed_at is None
+                      or time.monotonic() - _property_ids_failed_at >= PROPERTY_IDS_RETRY_SECONDS)
+
+
+def cache_property_ids(schema):
+    """
+    Cache the property ids from a databases.retrieve response (used by the
+    async mirror too). The first schema cached wins; returns the cached map.
+    """
+    global _property_ids
+    with _property_ids_lock:
+        if _property_ids is None:
+            _property_ids = {name: prop["id"] for name, prop in schema["properties"].items()}
+        return _property_ids
+
+
+def property_ids_failed(error):
+    """Remember a failed schema read so reads skip projection until the retry delay passes."""
+    global _property_ids_failed_at
+    print(f"⚠️  Warning: Could not read database schema, fetching all properties: {error}")
+    with _property_ids_lock:
+        _property_ids_failed_at = time.monotonic()
+    return None
 
 
-def add_tasks_to_notion(tasks):
+def get_property_ids():
+    """
+    Map property names to property ids, read once from the database schema
+    (databases.retrieve) and cached for the life of the process.
+    Returns None if the schema can't be read, in which case reads fall back
+    to fetching every property (and don't ask again for
+    PROPERTY_IDS_RETRY_SECONDS). The rate-limited request runs outside the
+    lock, so two threads on a cold cache may both read the schema.
+    """
+    property_ids, read_needed = cached_property_ids()
+    if not read_needed:
+        return property_ids
+    try:
+        schema = get_notion().databases.retrieve(database_id=get_database_id())
+    except Exception as e:
+        return property_ids_failed(e)
+    return cache_property_ids(schema)
+
+
+def _is_projected(fields):
+    return fields is not None and not set(fields) >= set(TASK_FIELDS)
+
+
+def _projection_params(fields):
+    """
+    filter_properties for a databases.query that only needs these task
+    fields, or {} to fetch everything.
+    """
+    if not _is_projected(fields):
+        return {}
+    return _projection_from_ids(fields, get_property_ids())
+
+
+def _projection_from_ids(fields, property_ids):
+    if not property_ids:
+        return {}
+    wanted = [FIELDS[field][0] for field in fields]
+    if any(name not in property_ids for name in wanted):
+        return {}
+    return {"filter_properties": [property_ids[name] for name in wanted]}
+
+
+def _verify_created_pages(results, created_after):
+    """
+    Batch Verification
+    Confirms every newly created page with a single paginated query filtered
+    on created_time, instead of one pages.retrieve per page.
+    Marks each successful result with a "verified" flag.
+    """
+    created = [r for r in results if r['status'] == 'success']
+    if not created:
+        return
+
+    try:
+        pages = _query_database_pages(_verification_params(created_after))
+        found_ids = {page["id"].replace("-", "") for page in pages}
+    except Exception as verify_error:
+        print(f"⚠️  Warning: Could not verify pages: {verify_error}")
+        return
+    _mark_verified(created, found_ids)
+
+
+def _verification_params(created_after):
+    # created_time is stored with minute precision, so widen the window to the minute
+    window_start = created_after.replace(second=0, microsecond=0)
+    return {
+        "filter": {
+            "timestamp": "created_time",
+            "created_time": {"on_or_after": window_start.isoformat()}
+        },
+        "page_size": NOTION_MAX_PAGE_SIZE
+    }
+
+
+def _mark_verified(created, found_ids):
+    for result in created:
+        result["verified"] = result["page_id"].replace("-", "") in found_ids
+
+    missing = [r['task'] for r in created if not r['verified']]
+    if missing:
+        print(f"⚠️  Warning: {len(missing)} page(s) not yet visible in database: {', '.join(missing)}")
+    else:
+        print(f"✅ Verified {len(created)} page(s) in database")
+
+
+def add_tasks_to_notion(tasks, max_workers=DEFAULT_MAX_WORKERS, verify="batch"):
+    """
+    Create tasks in the Notion database concurrently.
+
+    Pages are created on a small worker pool while a shared token bucket keeps
+    the request rate within Notion's limit, so a large import finishes in
+    roughly len(tasks) / NOTION_REQUESTS_PER_SECOND seconds. A failed task does
+    not stop the batch.
+
+    Args:
+        tasks (list): Parsed task dicts (task_name, due_date, priority, ...)
+        max_workers (int): Maximum number of pages created in parallel
+        verify (str): "batch" to confirm all new pages with one query after the
+            batch finishes, "none" to skip verification
+
+    Returns:
+        list: One result dict per task, in the same order as the input
+    """
+    notion = get_notion()
     if not notion:
         return [{"task": "Notion client not initialized", "status": "error", "error": "Please check your Notion credentials"}]
     
+    database_id = get_database_id()
     is_valid, message = validate_database_id(database_id)
     if not is_valid:
         return [{"task": "Database ID validation failed", "status": "error", "error": message}]
     
     print(f"🔍 Using database ID: {database_id}")
     
-    results = []
-    for task in tasks:
-        try:
-            if not task.get('task_name'):
-                raise ValueError("Task name is required")
-            
-            due_date = task['due_date']
-            if isinstance(due_date, str):
-                due_date = datetime.datetime.strptime(due_date, "%Y-%m-%d %H:%M")
-            
-            if due_date.tzinfo is None:
-                local_tz = datetime.datetime.now().astimezone().tzinfo
-                due_date = due_date.replace(tzinfo=local_tz)
-            
-            page_data = {
-                "parent": {"database_id": database_id},
-                "properties": {
-                    "Task": {"title": [{"text": {"content": task['task_name']}}]},
-                    "Due Date": {"date": {"start": due_date.isoformat()}},
-                    "Priority": {"select": {"name": task.get('priority', 'Medium')}},
-                    "Category": {"select": {"name": task.get('category', 'General')}},
-                    "Status": {"select": {"name": task.get('status', 'To-Do')}},
-                    "Notes Page": {"rich_text": [{"text": {"content": task.get('notes', '')}}]}
-                }
-            }
-            
-            print(f"📝 Creating task: {task['task_name']}")
-            print(f"   📅 Due: {due_date.isoformat()}")
-            print(f"   🏷️  Priority: {task.get('priority', 'Medium')}")
-            print(f"   📂 Category: {task.get('category', 'General')}")
-            print(f"   📊 Status: {task.get('status', 'To-Do')}")
-            
-            created_page = notion.pages.create(**page_data)
-            
-            page_id = created_page['id']
-            print(f"✅ Task created with ID: {page_id}")
-            
-            try:
-                retrieved_page = notion.pages.retrieve(page_id)
-                print(f"✅ Page verified in database")
-            except Exception as verify_error:
-                print(f"⚠️  Warning: Could not verify page: {verify_error}")
-            
-            results.append({"task": task['task_name'], "status": "success", "page_id": page_id})
-            
-        except Exception as e:
-            error_msg = str(e)
-            print(f"❌ Error creating task '{task['task_name']}': {error_msg}")
-            
-            if "database_id" in error_msg.lower():
-                print("💡 This might be a database access issue")
-            elif "properties" in error_msg.lower():
-                print("💡 This might be a property name/type mismatch")
-            elif "date" in error_msg.lower():
-                print("💡 This might be a date format issue")
-            
-            results.append({"task": task['task_name'], "status": "error", "error": error_msg})
-    
+    if verify not in VERIFY_MODES:
+        raise ValueError(f"verify must be one of {VERIFY_MODES}, got {verify!r}")
+
+    if not tasks:
+        return []
+
+    batch_started = datetime.datetime.now(datetime.timezone.utc)
+    workers = max(1, min(max_workers, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_create_task_page, tasks))
+
+    if verify == "batch":
+        _verify_created_pages(results, batch_started)
+
+    _print_batch_summary(results)
+    return results
+
+
+def _print_batch_summary(results):
     successful_tasks = [r for r in results if r['status'] == 'success']
     if successful_tasks:
         print("\n" + "=" * 50)
@@ -168,140 +437,155 @@ def add_tasks_to_notion(tasks):
         for result in successful_tasks:
             print(f"   ✅ {result['task']}")
         print("=" * 50)
+
+    stats = notion_rate_limiter.stats()
+    print(f"⏱️  Notion throughput: {stats['throughput']:.1f} req/s "
+          f"(limit {stats['rate']:.1f} req/s, {stats['throttled']} throttled)")
+
+
+def _build_query_filter(plan, edited_since=None):
+    """Combine a query plan's server filter with the optional incremental-sync timestamp condition."""
+    conditions = []
+    if plan.compiled:
+        conditions.extend(plan.compiled["and"] if "and" in plan.compiled else [plan.compiled])
+    if edited_since:
+        conditions.append({
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": edited_since}
+        })
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"and": conditions}
+
+
+def _build_sorts(sort_by):
+    """Translate the agent's sort dict into Notion sorts (due date ascending by default)."""
+    sorts = []
+    if sort_by:
+        if sort_by.get("property") == "due_date":
+            sorts.append({
+                "property": PROPERTY_NAMES["due_date"],
+                "direction": sort_by.get("direction", "ascending")
+            })
+        elif sort_by.get("property") == "priority":
+            sorts.append({
+                "property": PROPERTY_NAMES["priority"],
+                "direction": sort_by.get("direction", "descending")
+            })
     
-    return results
+    if not sorts:
+        sorts.append({
+            "property": PROPERTY_NAMES["due_date"],
+            "direction": "ascending"
+        })
+
+    return sorts
+
+
+def iter_tasks(filters=None, sort_by=None, page_size=NOTION_MAX_PAGE_SIZE, edited_since=None, fields=None):
+    """
+    Stream tasks from the Notion database.
 
-def get_tasks_from_notion(filters=None, sort_by=None, limit=50):
+    Follows next_cursor lazily: a new page of results is only requested once
+    the caller has consumed the previous one, so stopping early never fetches
+    more than needed. Raises on API errors; callers that want the
+    {"error": ...} convention should use get_tasks_from_notion.
+    
+    Args:
+        filters (dict): Filter criteria (same format as get_tasks_from_notion);
+            compiled by query_planner, with any part Notion can't express
+            applied to the returned rows
+        sort_by (dict): Sort criteria (same format as get_tasks_from_notion)
+        page_size (int): Results requested per round trip (max 100)
+        edited_since (str): Only return pages whose last_edited_time is on or
+            after this ISO timestamp (used for incremental sync)
+        fields (tuple): Task fields to fetch (e.g. MATCH_FIELDS); other
+            properties are left out of the response via filter_properties.
+            None fetches every field
+    
+    Yields:
+        dict: Parsed task dicts, in sort order
+    """
+    notion = get_notion()
+    if not notion:
+        raise RuntimeError("Notion client not initialized")
+
+    query_params, plan, fields = _task_query(filters, sort_by, page_size, edited_since, fields)
+    query_params.update(_projection_params(fields))
+
+    parse_page = page_parser(fields)
+    for page in _query_database_pages(query_params):
+        task = parse_page(page)
+        if plan.matches(task):
+            yield task
+
+
+def _task_query(filters, sort_by, page_size, edited_since, fields):
+    """
+    Plan a task query.
+
+    Returns:
+        tuple: (databases.query params without projection, QueryPlan, fields to fetch)
+    """
+    query_params = {
+        "database_id": get_database_id(),
+        "sorts": _build_sorts(sort_by),
+        "page_size": max(1, min(page_size, NOTION_MAX_PAGE_SIZE))
+    }
+
+    plan = plan_query(filters)
+    query_filter = _build_query_filter(plan, edited_since)
+    if query_filter:
+        query_params["filter"] = query_filter
+
+    if fields is not None and plan.residual is not None:
+        # The residual is evaluated locally, so its fields must come back too
+        fields = tuple(set(fields) | referenced_fields(plan.residual))
+    return query_params, plan, fields
+
+
+def get_tasks_from_notion(filters=None, sort_by=None, limit=50, fields=None):
     """
     Retrieve tasks from Notion database with optional filtering and sorting.
     
     Args:
-        filters (dict): Filter criteria (e.g., {"category": "Fitness", "status": "To-Do"})
+        filters (dict): Filter criteria (e.g., {"category": "Fitness", "status": "To-Do"}),
+            optionally with a "where" filter AST (see query_planner)
         sort_by (dict): Sort criteria (e.g., {"property": "Due Date", "direction": "ascending"})
-        limit (int): Maximum number of tasks to return
+        limit (int): Maximum number of tasks to return, or None for every matching task
+        fields (tuple): Task fields to fetch, e.g. MATCH_FIELDS (default: all)
     
     Returns:
         dict: Dictionary with tasks list and metadata
     """
+    notion = get_notion()
     if not notion:
         return {"error": "Notion client not initialized"}
     
     try:
-        filter_conditions = []
-        if filters:
-            for property_name, value in filters.items():
-                # Only add filters for non-None values
-                if value is None:
-                    continue
-                    
-                if property_name == "category":
-                    filter_conditions.append({
-                        "property": "Category",
-                        "select": {"equals": value}
-                    })
-                elif property_name == "priority":
-                    filter_conditions.append({
-                        "property": "Priority", 
-                        "select": {"equals": value}
-                    })
-                elif property_name == "status":
-                    filter_conditions.append({
-                        "property": "Status",
-                        "select": {"equals": value}
-                    })
-                elif property_name == "date_range":
-                    start_date, end_date = value
-                    filter_conditions.append({
-                        "property": "Due Date",
-                        "date": {
-                            "on_or_after": start_date,
-                            "on_or_before": end_date
-                        }
-                    })
-        
-        sorts = []
-        if sort_by:
-            if sort_by.get("property") == "due_date":
-                sorts.append({
-                    "property": "Due Date",
-                    "direction": sort_by.get("direction", "ascending")
-                })
-            elif sort_by.get("property") == "priority":
-                sorts.append({
-                    "property": "Priority",
-                    "direction": sort_by.get("direction", "descending")
-                })
-        
-        if not sorts:
-            sorts.append({
-                "property": "Due Date",
-                "direction": "ascending"
-            })
-        
-        print(f"🔍 Querying Notion database: {database_id}")
-        print(f"📊 Filters: {filter_conditions}")
-        print(f"📈 Sort: {sorts}")
+        print(f"🔍 Querying Notion database: {get_database_id()}")
+        plan = plan_query(filters)
+        print(f"📊 Filters: {plan.compiled} ({plan.describe()})")
+        print(f"📈 Sort: {_build_sorts(sort_by)}")
         print(f"📏 Limit: {limit}")
         
-        # Build the query parameters
-        query_params = {
-            "database_id": database_id,
-            "sorts": sorts,
-            "page_size": limit
-        }
-        
-        # Only add filter if there are filter conditions
-        if filter_conditions:
-            query_params["filter"] = {"and": filter_conditions}
-        
-        response = notion.databases.query(**query_params)
-        
-        tasks = []
-        for page in response["results"]:
-            properties = page["properties"]
-            
-            task_name = ""
-            if properties.get("Task", {}).get("title"):
-                task_name = properties["Task"]["title"][0]["text"]["content"]
-            
-            due_date = None
-            if properties.get("Due Date", {}).get("date", {}).get("start"):
-                due_date = properties["Due Date"]["date"]["start"]
-            
-            priority = ""
-            if properties.get("Priority", {}).get("select"):
-                priority = properties["Priority"]["select"]["name"]
-            
-            category = ""
-            if properties.get("Category", {}).get("select"):
-                category = properties["Category"]["select"]["name"]
-            
-            status = ""
-            if properties.get("Status", {}).get("select"):
-                status = properties["Status"]["select"]["name"]
-            
-            notes = ""
-            if properties.get("Notes Page", {}).get("rich_text"):
-                notes = properties["Notes Page"]["rich_text"][0]["text"]["content"]
-            
-            tasks.append({
-                "id": page["id"],
-                "task_name": task_name,
-                "due_date": due_date,
-                "priority": priority,
-                "category": category,
-                "status": status,
-                "notes": notes,
-                "created_time": page["created_time"],
-                "last_edited_time": page["last_edited_time"]
-            })
+        # Ask for one extra row so has_more can be answered from the same page
+        page_size = NOTION_MAX_PAGE_SIZE if limit is None else limit + 1
+        task_iterator = iter_tasks(filters, sort_by, page_size=page_size, fields=fields)
+
+        if limit is None:
+            tasks = list(task_iterator)
+            has_more = False
+        else:
+            tasks = list(itertools.islice(task_iterator, limit))
+            has_more = next(task_iterator, None) is not None
         
         print(f"✅ Retrieved {len(tasks)} tasks from Notion")
         
         return {
             "tasks": tasks,
             "total": len(tasks),
-            "has_more": response.get("has_more", False)
+            "has_more": has_more
         }
         
     except Exception as e:
@@ -309,39 +593,26 @@ def get_tasks_from_notion(filters=None, sort_by=None, limit=50):
         print(f"❌ {error_msg}")
         return {"error": error_msg}
 
+def get_task_from_notion(task_id):
+    """Retrieve one task with every field (e.g. to show details after matching on a projection)."""
+    notion = get_notion()
+    if not notion:
+        return {"error": "Notion client not initialized"}
+    try:
+        return {"task": parse_task_page(notion.pages.retrieve(page_id=task_id))}
+    except Exception as e:
+        error_msg = f"Failed to retrieve task: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+
 def update_task_in_notion(task_id, updates):
+    notion = get_notion()
     if not notion:
         return {"error": "Notion client not initialized"}
     
     try:
-        properties = {}
-        
-        if "task_name" in updates:
-            properties["Task"] = {"title": [{"text": {"content": updates["task_name"]}}]}
-        
-        if "due_date" in updates:
-            due_date = updates["due_date"]
-            if isinstance(due_date, str):
-                due_date = datetime.datetime.strptime(due_date, "%Y-%m-%d %H:%M")
-            
-            if due_date.tzinfo is None:
-                local_tz = datetime.datetime.now().astimezone().tzinfo
-                due_date = due_date.replace(tzinfo=local_tz)
-            
-            properties["Due Date"] = {"date": {"start": due_date.isoformat()}}
-        
-        if "priority" in updates:
-            properties["Priority"] = {"select": {"name": updates["priority"]}}
-        
-        if "category" in updates:
-            properties["Category"] = {"select": {"name": updates["category"]}}
-        
-        if "status" in updates:
-            properties["Status"] = {"select": {"name": updates["status"]}}
-        
-        if "notes" in updates:
-            properties["Notes Page"] = {"rich_text": [{"text": {"content": updates["notes"]}}]}
-        
+        properties = _build_update_properties(updates)
         if not properties:
             return {"error": "No valid updates provided"}
         
@@ -363,7 +634,41 @@ def update_task_in_notion(task_id, updates):
         return {"error": error_msg}
 
 
+def _build_update_properties(updates):
+    """Build the pages.update properties payload for the changed fields."""
+    properties = {}
+    
+    if "task_name" in updates:
+        properties[PROPERTY_NAMES["task_name"]] = {"title": [{"text": {"content": updates["task_name"]}}]}
+    
+    if "due_date" in updates:
+        due_date = updates["due_date"]
+        if isinstance(due_date, str):
+            due_date = datetime.datetime.strptime(due_date, "%Y-%m-%d %H:%M")
+        
+        if due_date.tzinfo is None:
+            local_tz = datetime.datetime.now().astimezone().tzinfo
+            due_date = due_date.replace(tzinfo=local_tz)
+        
+        properties[PROPERTY_NAMES["due_date"]] = {"date": {"start": due_date.isoformat()}}
+    
+    if "priority" in updates:
+        properties[PROPERTY_NAMES["priority"]] = {"select": {"name": updates["priority"]}}
+    
+    if "category" in updates:
+        properties[PROPERTY_NAMES["category"]] = {"select": {"name": updates["category"]}}
+    
+    if "status" in updates:
+        properties[PROPERTY_NAMES["status"]] = {"select": {"name": updates["status"]}}
+    
+    if "notes" in updates:
+        properties[PROPERTY_NAMES["notes"]] = {"rich_text": [{"text": {"content": updates["notes"]}}]}
+    
+    return properties
+
+
 def delete_task_from_notion(task_id):
+    notion = get_notion()
     if not notion:
         return {"error": "Notion client not initialized"}
     
@@ -386,52 +691,187 @@ def delete_task_from_notion(task_id):
         return {"error": error_msg}
 
 
-def search_tasks_in_notion(query, limit=20):
+def _apply_to_page(task, page_changes):
+    """Run one page's bulk change; errors are captured so the rest of the batch continues."""
+    result = {"task_id": task['id'], "task": task.get('task_name') or 'Untitled'}
+    try:
+        get_notion().pages.update(page_id=task['id'], **page_changes)
+        result["status"] = "success"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    return result
+
+
+def _bulk_apply(operation, filters, page_changes, confirm, max_workers):
+    """
+    Bulk Apply
+    Streams every task matching the filter (following pagination), asks
+    confirm(tasks) before changing anything, then sends one pages.update per
+    task on a small worker pool. The shared rate limiter paces the requests
+    and retries 429s, so large batches don't fail part way through.
+    """
+    notion = get_notion()
+    if not notion:
+        return {"error": "Notion client not initialized"}
+    try:
+        plan = plan_query(filters)
+    except ValueError as e:
+        return {"error": f"Invalid filter: {e}"}
+    if not plan.ast:
+        return {"error": f"A filter is required to {operation} tasks in bulk"}
+
+    try:
+        print(f"🔍 Selecting tasks to {operation}: {filters} ({plan.describe()})")
+        tasks = list(iter_tasks(filters, fields=BULK_SUMMARY_FIELDS))
+    except Exception as e:
+        error_msg = f"Failed to select tasks: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+    summary = {"status": "success", "matched": len(tasks), "results": []}
+    if not tasks:
+        return summary
+    if confirm is not None and not confirm(tasks):
+        summary["status"] = "cancelled"
+        return summary
+
+    print(f"⚙️  Applying {operation} to {len(tasks)} task(s)...")
+    workers = max(1, min(max_workers, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda task: _apply_to_page(task, page_changes), tasks))
+
+    summary["results"] = results
+    summary["succeeded"] = sum(1 for r in results if r["status"] == "success")
+    summary["failed"] = len(results) - summary["succeeded"]
+    _print_bulk_report(operation, summary)
+    return summary
+
+
+def _print_bulk_report(operation, summary):
+    print(f"\n📋 Bulk {operation} report:")
+    for result in summary["results"]:
+        if result["status"] == "success":
+            print(f"   ✅ {result['task']}")
+        else:
+            print(f"   ❌ {result['task']} ({result['task_id'][:8]}): {result['error']}")
+    print(f"📊 {summary['succeeded']} succeeded, {summary['failed']} failed, {summary['matched']} matched")
+
+    stats = notion_rate_limiter.stats()
+    print(f"⏱️  Notion throughput: {stats['throughput']:.1f} req/s "
+          f"(limit {stats['rate']:.1f} req/s, {stats['throttled']} throttled)")
+
+
+def bulk_update_tasks_in_notion(filters, updates, confirm=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Apply the same updates to every task matching a filter.
+
+    Args:
+        filters (dict): Filter criteria (same format as get_tasks_from_notion); must not be empty
+        updates (dict): Fields to change (same format as update_task_in_notion)
+        confirm (callable): Called with the matched tasks before anything changes;
+            returning False cancels the operation. None applies without asking
+        max_workers (int): Maximum number of pages updated in parallel
+
+    Returns:
+        dict: {"status": "success"/"cancelled", "matched": int, "results": [per-page dicts],
+            "succeeded": int, "failed": int} or {"error": str}
+    """
+    try:
+        properties = _build_update_properties(updates)
+    except ValueError as e:
+        return {"error": f"Invalid update: {e}"}
+    if not properties:
+        return {"error": "No valid updates provided"}
+    return _bulk_apply("update", filters, {"properties": properties}, confirm, max_workers)
+
+
+def bulk_archive_tasks_in_notion(filters, confirm=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Archive every task matching a filter (see bulk_update_tasks_in_notion for
+    the arguments and result).
+    """
+    return _bulk_apply("archive", filters, {"archived": True}, confirm, max_workers)
+
+
+def _build_search_filter(query):
+    """
+    Compound OR filter matching pages whose title or notes contain any of the
+    query's terms (Notion's contains is case-insensitive). Stopwords are left
+    out: "contains the" matches nearly every page.
+    """
+    terms = list(dict.fromkeys(
+        term for term in query.lower().split() if len(term) >= 2 and term not in STOPWORDS
+    ))[:SEARCH_MAX_TERMS]
+    if not terms:
+        terms = [query.strip()]
+    conditions = []
+    for term in terms:
+        conditions.append({"property": PROPERTY_NAMES["task_name"], "title": {"contains": term}})
+        conditions.append({"property": PROPERTY_NAMES["notes"], "rich_text": {"contains": term}})
+    return {"or": conditions}
+
+
+def _search_params(query, limit):
+    """databases.query params for the default "database" search mode."""
+    return {
+        "filter": _build_search_filter(query),
+        "sorts": _build_sorts(None),
+        "page_size": NOTION_MAX_PAGE_SIZE if limit is None else max(1, min(limit, NOTION_MAX_PAGE_SIZE))
+    }
+
+
+def _workspace_search_params(query, limit):
+    return {
+        "query": query,
+        "filter": {"property": "object", "value": "page"},
+        "page_size": min(limit or NOTION_MAX_PAGE_SIZE, NOTION_MAX_PAGE_SIZE)
+    }
+
+
+def _database_tasks(search_results):
+    """Parse the search results that are pages of our database."""
+    return [
+        parse_task_page(page) for page in search_results
+        if page.get("parent", {}).get("database_id", "").replace("-", "") == get_database_id().replace("-", "")
+    ]
+
+
+def _search_workspace(query, limit):
+    """Legacy mode: global notion.search, keeping only pages from our database."""
+    response = get_notion().search(**_workspace_search_params(query, limit))
+    return _database_tasks(response["results"])
+
+
+def search_tasks_in_notion(query, limit=20, mode="database"):
+    """
+    Search tasks by keyword.
+
+    Args:
+        query (str): Search terms; a task matches if its name or notes contain any term
+        limit (int): Maximum number of results, or None for every match
+        mode (str): "database" (default) runs a paginated databases.query with
+            title/rich_text contains filters, so only matching rows from our
+            database are transferred. "workspace" uses the global search
+            endpoint and discards pages from other databases (first page only).
+
+    Returns:
+        dict: {"tasks": [...], "total": int, "query": str} or {"error": str}
+    """
+    notion = get_notion()
     if not notion:
         return {"error": "Notion client not initialized"}
+    if mode not in SEARCH_MODES:
+        return {"error": f"mode must be one of {SEARCH_MODES}, got {mode!r}"}
     
     try:
         print(f"🔍 Searching for tasks containing: '{query}'")
         
-        response = notion.search(
-            query=query,
-            filter={"property": "object", "value": "page"},
-            page_size=limit
-        )
-        
-        tasks = []
-        for page in response["results"]:
-            if page.get("parent", {}).get("database_id") == database_id:
-                properties = page["properties"]
-                
-                task_name = ""
-                if properties.get("Task", {}).get("title"):
-                    task_name = properties["Task"]["title"][0]["text"]["content"]
-                
-                due_date = None
-                if properties.get("Due Date", {}).get("date", {}).get("start"):
-                    due_date = properties["Due Date"]["date"]["start"]
-                
-                priority = ""
-                if properties.get("Priority", {}).get("select"):
-                    priority = properties["Priority"]["select"]["name"]
-                
-                category = ""
-                if properties.get("Category", {}).get("select"):
-                    category = properties["Category"]["select"]["name"]
-                
-                status = ""
-                if properties.get("Status", {}).get("select"):
-                    status = properties["Status"]["select"]["name"]
-                
-                tasks.append({
-                    "id": page["id"],
-                    "task_name": task_name,
-                    "due_date": due_date,
-                    "priority": priority,
-                    "category": category,
-                    "status": status
-                })
+        if mode == "workspace":
+            tasks = _search_workspace(query, limit)
+        else:
+            pages = _query_database_pages(_search_params(query, limit))
+            tasks = [parse_task_page(page) for page in itertools.islice(pages, limit)]
         
         print(f"✅ Search found {len(tasks)} tasks")
         
@@ -0,0 +1,292 @@
+"""
+Async Notion Tools
+asyncio mirrors of the notion_tools operations, built on notion-client's
+AsyncClient, so Notion I/O can overlap with LLM calls inside one event loop
+(e.g. when the agent runs inside an asyncio service).
+
+Payloads, filters, parsing and result dicts are shared with the sync
+versions. Every request goes through the same adaptive rate limiter as the
+sync client, a semaphore caps the requests in flight, and batch creation
+fans out under its own semaphore.
+"""
+import asyncio
+import datetime
+
+import notion_tools
+from notion_tools import (
+    DEFAULT_MAX_WORKERS, NOTION_ENDPOINTS, NOTION_MAX_PAGE_SIZE, SEARCH_MODES, VERIFY_MODES,
+    _build_task_page_data, _build_update_properties, _create_error_result,
+    _created_result, _database_tasks, _is_projected, _mark_verified, _print_batch_summary,
+    _print_task_preview, _projection_from_ids, _search_params, _task_query, _verification_params,
+    _workspace_search_params, cache_property_ids, cached_property_ids, property_ids_failed,
+    validate_database_id
+)
+from notion_transport import create_async_notion_client
+from rate_limiter import AsyncRateLimitedProxy
+from task_model import page_parser, parse_task_page
+
+
+DEFAULT_MAX_CONCURRENCY = DEFAULT_MAX_WORKERS
+# Notion requests in flight at once across every async operation
+MAX_IN_FLIGHT_REQUESTS = 8
+
+_async_notion = None
+
+
+def get_async_notion():
+    """
+    The shared AsyncClient, created on first use (httpx binds pooled
+    connections to the running event loop). None without Notion credentials.
+    """
+    global _async_notion
+    if _async_notion is None and notion_tools.get_notion():
+        _async_notion = AsyncRateLimitedProxy(
+            create_async_notion_client(notion_tools.notion_token),
+            notion_tools.notion_rate_limiter,
+            NOTION_ENDPOINTS,
+            semaphore=asyncio.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+        )
+    return _async_notion
+
+
+async def close_async_notion():
+    """Close the shared AsyncClient's connection pool (call before the event loop shuts down)."""
+    global _async_notion
+    if _async_notion is not None:
+        await _async_notion.aclose()
+        _async_notion = None
+
+
+async def _create_task_page(task):
+    """Create a single task page; errors are captured in the result like the sync version."""
+    task_name = task.get('task_name', 'Untitled')
+    try:
+        page_data = _build_task_page_data(task)
+        _print_task_preview(task, page_data)
+        return _created_result(task_name, await get_async_notion().pages.create(**page_data))
+    except Exception as e:
+        return _create_error_result(task_name, e)
+
+
+async def _query_database_pages(query_params):
+    """Async generator over every page of a databases.query, following next_cursor."""
+    notion = get_async_notion()
+    params = dict(query_params)
+    params.setdefault("database_id", notion_tools.get_database_id())
+    while True:
+        response = await notion.databases.query(**params)
+        for page in response["results"]:
+            yield page
+        if not response.get("has_more") or not response.get("next_cursor"):
+            break
+        params["start_cursor"] = response["next_cursor"]
+
+
+async def get_property_ids_async():
+    """
+    Async counterpart of notion_tools.get_property_ids, sharing its cache
+    through the locked cache helpers. Two coroutines may both fetch the
+    schema on a cold cache; the first one cached wins.
+    """
+    property_ids, read_needed = cached_property_ids()
+    if not read_needed:
+        return property_ids
+    try:
+        schema = await get_async_notion().databases.retrieve(database_id=notion_tools.get_database_id())
+    except Exception as e:
+        return property_ids_failed(e)
+    return cache_property_ids(schema)
+
+
+async def _verify_created_pages(results, created_after):
+    created = [r for r in results if r['status'] == 'success']
+    if not created:
+        return
+
+    try:
+        found_ids = {
+            page["id"].replace("-", "")
+            async for page in _query_database_pages(_verification_params(created_after))
+        }
+    except Exception as verify_error:
+        print(f"⚠️  Warning: Could not verify pages: {verify_error}")
+        return
+    _mark_verified(created, found_ids)
+
+
+async def add_tasks_to_notion_async(tasks, max_concurrency=DEFAULT_MAX_CONCURRENCY, verify="batch"):
+    """
+    Create tasks in the Notion database concurrently (see add_tasks_to_notion).
+
+    Args:
+        tasks (list): Parsed task dicts (task_name, due_date, priority, ...)
+        max_concurrency (int): Maximum number of pages created at once
+        verify (str): "batch" or "none"
+
+    Returns:
+        list: One result dict per task, in the same order as the input
+    """
+    if not get_async_notion():
+        return [{"task": "Notion client not initialized", "status": "error", "error": "Please check your Notion credentials"}]
+
+    is_valid, message = validate_database_id(notion_tools.get_database_id())
+    if not is_valid:
+        return [{"task": "Database ID validation failed", "status": "error", "error": message}]
+
+    if verify not in VERIFY_MODES:
+        raise ValueError(f"verify must be one of {VERIFY_MODES}, got {verify!r}")
+
+    if not tasks:
+        return []
+
+    batch_started = datetime.datetime.now(datetime.timezone.utc)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def create(task):
+        async with semaphore:
+            return await _create_task_page(task)
+
+    results = await asyncio.gather(*(create(task) for task in tasks))
+
+    if verify == "batch":
+        await _verify_created_pages(results, batch_started)
+
+    _print_batch_summary(results)
+    return results
+
+
+async def iter_tasks_async(filters=None, sort_by=None, page_size=NOTION_MAX_PAGE_SIZE, edited_since=None, fields=None):
+    """Async generator streaming tasks from the database (see iter_tasks)."""
+    if not get_async_notion():
+        raise RuntimeError("Notion client not initialized")
+
+    query_params, plan, fields = _task_query(filters, sort_by, page_size, edited_since, fields)
+    if _is_projected(fields):
+        query_params.update(_projection_from_ids(fields, await get_property_ids_async()))
+
+    parse_page = page_parser(fields)
+    async for page in _query_database_pages(query_params):
+        task = parse_page(page)
+        if plan.matches(task):
+            yield task
+
+
+async def get_tasks_from_notion_async(filters=None, sort_by=None, limit=50, fields=None):
+    """
+    Retrieve tasks with optional filtering and sorting (see get_tasks_from_notion).
+
+    Returns:
+        dict: {"tasks": [...], "total": int, "has_more": bool} or {"error": str}
+    """
+    if not get_async_notion():
+        return {"error": "Notion client not initialized"}
+
+    try:
+        page_size = NOTION_MAX_PAGE_SIZE if limit is None else limit + 1
+        tasks = []
+        has_more = False
+        async for task in iter_tasks_async(filters, sort_by, page_size=page_size, fields=fields):
+            if limit is not None and len(tasks) == limit:
+                has_more = True
+                break
+            tasks.append(task)
+
+        print(f"✅ Retrieved {len(tasks)} tasks from Notion")
+        return {"tasks": tasks, "total": len(tasks), "has_more": has_more}
+
+    except Exception as e:
+        error_msg = f"Failed to retrieve tasks: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+
+async def get_task_from_notion_async(task_id):
+    """Retrieve one task with every field (see get_task_from_notion)."""
+    if not get_async_notion():
+        return {"error": "Notion client not initialized"}
+    try:
+        return {"task": parse_task_page(await get_async_notion().pages.retrieve(page_id=task_id))}
+    except Exception as e:
+        error_msg = f"Failed to retrieve task: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+
+async def update_task_in_notion_async(task_id, updates):
+    if not get_async_notion():
+        return {"error": "Notion client not initialized"}
+
+    try:
+        properties = _build_update_properties(updates)
+        if not properties:
+            return {"error": "No valid updates provided"}
+
+        print(f"🔄 Updating task {task_id} with: {list(properties.keys())}")
+        await get_async_notion().pages.update(page_id=task_id, properties=properties)
+        print(f"✅ Task updated successfully")
+
+        return {
+            "status": "success",
+            "task_id": task_id,
+            "updated_fields": list(properties.keys())
+        }
+
+    except Exception as e:
+        error_msg = f"Failed to update task: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+
+async def delete_task_from_notion_async(task_id):
+    if not get_async_notion():
+        return {"error": "Notion client not initialized"}
+
+    try:
+        print(f"🗑️  Archiving task {task_id}")
+        await get_async_notion().pages.update(page_id=task_id, archived=True)
+        print(f"✅ Task archived successfully")
+
+        return {
+            "status": "success",
+            "task_id": task_id,
+            "message": "Task archived successfully"
+        }
+
+    except Exception as e:
+        error_msg = f"Failed to archive task: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
+
+
+async def search_tasks_in_notion_async(query, limit=20, mode="database"):
+    """
+    Search tasks by keyword (see search_tasks_in_notion).
+
+    Returns:
+        dict: {"tasks": [...], "total": int, "query": str} or {"error": str}
+    """
+    if not get_async_notion():
+        return {"error": "Notion client not initialized"}
+    if mode not in SEARCH_MODES:
+        return {"error": f"mode must be one of {SEARCH_MODES}, got {mode!r}"}
+
+    try:
+        print(f"🔍 Searching for tasks containing: '{query}'")
+
+        if mode == "workspace":
+            response = await get_async_notion().search(**_workspace_search_params(query, limit))
+            tasks = _database_tasks(response["results"])
+        else:
+            tasks = []
+            async for page in _query_database_pages(_search_params(query, limit)):
+                if limit is not None and len(tasks) == limit:
+                    break
+                tasks.append(parse_task_page(page))
+
+        print(f"✅ Search found {len(tasks)} tasks")
+        return {"tasks": tasks, "total": len(tasks), "query": query}
+
+    except Exception as e:
+        error_msg = f"Search failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        return {"error": error_msg}
@@ -0,0 +1,122 @@
+"""
+Notion Transport
+Builds notion-client clients over an explicitly configured httpx client, so
+every caller in the process shares one tuned connection pool: a bounded
+number of connections, keep-alive with an expiry, optional HTTP/2 and
+separate connect/read/write/pool timeouts.
+
+Settings are read from the environment, e.g.:
+    NOTION_HTTP_MAX_CONNECTIONS=10      NOTION_HTTP_CONNECT_TIMEOUT=5
+    NOTION_HTTP_MAX_KEEPALIVE=10        NOTION_HTTP_READ_TIMEOUT=30
+    NOTION_HTTP_KEEPALIVE_EXPIRY=30     NOTION_HTTP_WRITE_TIMEOUT=30
+    NOTION_HTTP2=1                      NOTION_HTTP_POOL_TIMEOUT=10
+"""
+from dataclasses import dataclass
+import os
+
+import httpx
+from notion_client import AsyncClient, Client
+
+
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection is kept open
+DEFAULT_CONNECT_TIMEOUT = 5.0    # seconds to establish a connection
+DEFAULT_READ_TIMEOUT = 30.0      # seconds waiting for response data
+DEFAULT_WRITE_TIMEOUT = 30.0     # seconds sending the request body
+DEFAULT_POOL_TIMEOUT = 10.0      # seconds waiting for a free pooled connection
+
+# Environment variable for each setting
+ENV_SETTINGS = {
+    "max_connections": ("NOTION_HTTP_MAX_CONNECTIONS", int),
+    "max_keepalive_connections": ("NOTION_HTTP_MAX_KEEPALIVE", int),
+    "keepalive_expiry": ("NOTION_HTTP_KEEPALIVE_EXPIRY", float),
+    "connect_timeout": ("NOTION_HTTP_CONNECT_TIMEOUT", float),
+    "read_timeout": ("NOTION_HTTP_READ_TIMEOUT", float),
+    "write_timeout": ("NOTION_HTTP_WRITE_TIMEOUT", float),
+    "pool_timeout": ("NOTION_HTTP_POOL_TIMEOUT", float),
+}
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection pool, protocol and timeout settings for the Notion HTTP client."""
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    http2: bool = False
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    write_timeout: float = DEFAULT_WRITE_TIMEOUT
+    pool_timeout: float = DEFAULT_POOL_TIMEOUT
+
+    @classmethod
+    def from_env(cls):
+        """Defaults with any NOTION_HTTP_* overrides applied; invalid values are ignored."""
+        values = {"http2": os.getenv("NOTION_HTTP2", "0") == "1"}
+        for field, (variable, convert) in ENV_SETTINGS.items():
+            raw = os.getenv(variable)
+            if raw is None:
+                continue
+            try:
+                values[field] = convert(raw)
+            except ValueError:
+                print(f"⚠️  Warning: Ignoring invalid {variable}={raw!r}")
+        return cls(**values)
+
+    def limits(self):
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def timeout(self):
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout
+        )
+
+
+def _http2_enabled(config):
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it."""
+    if not config.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("⚠️  Warning: NOTION_HTTP2 needs the h2 package (pip install 'httpx[http2]'); using HTTP/1.1")
+        return False
+    return True
+
+
+def _httpx_options(config):
+    return {"limits": config.limits(), "timeout": config.timeout(), "http2": _http2_enabled(config)}
+
+
+def _configure(notion_client, config):
+    """
+    notion-client resets the httpx client's timeout to a single value from
+    timeout_ms when it adopts it, so the per-phase timeouts are applied after.
+    """
+    notion_client.client.timeout = config.timeout()
+    return notion_client
+
+
+def create_notion_client(token, config=None):
+    """
+    Create a notion-client Client over a configured, pooled httpx.Client.
+    The client is thread-safe and meant to be shared by every worker.
+    """
+    config = config or TransportConfig.from_env()
+    http_client = httpx.Client(**_httpx_options(config))
+    return _configure(Client(client=http_client, auth=token, timeout_ms=int(config.read_timeout * 1000)), config)
+
+
+def create_async_notion_client(token, config=None):
+    """Create a notion-client AsyncClient over a configured, pooled httpx.AsyncClient."""
+    config = config or TransportConfig.from_env()
+    http_client = httpx.AsyncClient(**_httpx_options(config))
+    return _configure(AsyncClient(client=http_client, auth=token, timeout_ms=int(config.read_timeout * 1000)), config)
@@ -0,0 +1,564 @@
+"""
+Prompt Registry
+All LLM prompts used by the agent, built once at import.
+
+Each prompt is split into a static system message (instructions, schema and
+few-shot examples) followed by a short user message carrying everything that
+changes per call: today's date and the user's input. Keeping the varying part
+at the end means every request shares a byte-identical prefix, which lets the
+provider reuse cached prefix tokens.
+"""
+from datetime import datetime
+import json
+
+
+# Rough average for English prose / JSON with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+class PromptTemplate:
+    """A static system prompt plus a format string for the trailing user message."""
+
+    def __init__(self, name, system, user_template, max_tokens):
+        self.name = name
+        self.system = system.strip()
+        self.user_template = user_template
+        self.max_tokens = max_tokens
+
+    def build_messages(self, now=None, date_hints=None, **fields):
+        """
+        Return the chat messages for one call; date fields are filled in from now.
+        date_hints are (expression, resolved value) pairs from date_resolver,
+        appended so the model copies dates instead of computing them.
+        """
+        now = now or datetime.now()
+        user_content = self.user_template.format(
+            today=now.strftime("%Y-%m-%d"),
+            weekday=now.strftime("%A"),
+            **fields
+        )
+        if date_hints:
+            user_content += "\n\nResolved dates and times (use these exactly):\n" + "\n".join(
+                f'- "{expression}" = {resolved}' for expression, resolved in date_hints
+            )
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": user_content}
+        ]
+
+    def build_payload(self, model="gpt-4o-mini", now=None, date_hints=None, **fields):
+        return {
+            "model": model,
+            "messages": self.build_messages(now=now, date_hints=date_hints, **fields),
+            "max_tokens": self.max_tokens
+        }
+
+    @property
+    def static_token_estimate(self):
+        """Approximate token count of the cacheable system prefix."""
+        return len(self.system) // CHARS_PER_TOKEN
+
+
+DATE_AND_INPUT = "Today's date is {today} ({weekday}).\n\nUser Input: {user_input}"
+
+
+INTENT_SYSTEM = """
+You are a helpful assistant that helps the user manage their Notion schedule.
+You are responsible for determining the user's intent and responding accordingly.
+
+The user will ask you to complete a task for them. You need to classify the task into one of the following INTENT TYPES:
+
+1. CREATE_TASK - User wants to add new task(s) to their Notion schedule
+2. QUERY_TASKS - User wants to query their Notion schedule for tasks
+3. UPDATE_TASK - User wants to update an existing task in their Notion schedule (e.g. change the due date, priority, status, etc.)
+4. DELETE_TASK - User wants to delete an existing task in their Notion schedule
+5. SEARCH_TASKS - User wants to search their Notion schedule for tasks
+6. BULK_UPDATE_TASKS - User wants to make the same change to every task matching some criteria
+7. BULK_ARCHIVE_TASKS - User wants to delete/archive every task matching some criteria
+8. UNKNOWN - User's intent is not clear
+
+EXAMPLES:
+- "Add a meeting tomorrow at 2pm" → CREATE_TASK
+- "Show me my tasks for this week" → QUERY_TASKS
+- "What tasks do I have today?" → QUERY_TASKS
+- "Mark the workout task as Done" → UPDATE_TASK
+- "Change the meeting time to 3pm" → UPDATE_TASK
+- "Delete the old task" → DELETE_TASK
+- "Find tasks about project planning" → SEARCH_TASKS
+- "Mark all fitness tasks this week as Done" → BULK_UPDATE_TASKS
+- "Archive everything Done from last month" → BULK_ARCHIVE_TASKS
+- "Hello" → UNKNOWN
+
+Only respond with the intent type (CREATE_TASK, QUERY_TASKS, UPDATE_TASK, DELETE_TASK, SEARCH_TASKS,
+BULK_UPDATE_TASKS, BULK_ARCHIVE_TASKS, UNKNOWN), no other text.
+"""
+
+
+CLASSIFY_AND_PARSE_SYSTEM = """
+You are a helpful assistant that helps the user manage their Notion schedule.
+Classify the user's request into ONE intent and extract the arguments for that intent.
+
+Respond with ONLY a JSON object of the form {"intent": "<INTENT>", "arguments": {...}}.
+
+INTENTS AND THEIR ARGUMENTS:
+
+1. CREATE_TASK - add new task(s)
+   {"tasks": [{"task_name": "...", "due_date": "YYYY-MM-DD HH:MM", "priority": "Low/Medium/High",
+               "category": "General/Personal/Fitness/Fun/School", "status": "To-Do/In Progress/Done",
+               "notes": "..."}]}
+   Defaults: priority "Medium", category "General", status "To-Do", notes "", time "12:00", date today.
+   Always return every field; split multiple tasks into separate objects.
+
+2. QUERY_TASKS - view/list tasks
+   {"filters": {"category": str|null, "priority": str|null, "status": str|null,
+                "date_range": ["YYYY-MM-DD", "YYYY-MM-DD"]|null, "where": expression|null},
+    "sort_by": {"property": "due_date/priority", "direction": "ascending/descending"}|null,
+    "limit": number}
+   Default limit is 50. "where" holds conditions the other filters can't express: a condition
+   {"field": "task_name/notes/priority/category/status/due_date", "op": "...", "value": ...} or a
+   group {"and": [...]} / {"or": [...]}. Ops: equals, does_not_equal, in/not_in (list value),
+   contains, does_not_contain, before, after, on_or_before, on_or_after, is_empty, is_not_empty.
+   Date values: "YYYY-MM-DD", "YYYY-MM-DD HH:MM", "today" or "now".
+
+3. UPDATE_TASK - change an existing task
+   {"task_identifier": {"type": "name/id/description", "value": "..."},
+    "updates": {only the fields being changed, same formats as CREATE_TASK}}
+
+4. DELETE_TASK - remove an existing task
+   {"task_identifier": {"type": "name/id/description", "value": "..."}}
+
+5. SEARCH_TASKS - find tasks by keywords
+   {"query": "keywords"}
+
+6. BULK_UPDATE_TASKS - make the same change to every task matching criteria ("all", "every", "everything")
+   {"filters": {same as QUERY_TASKS filters}, "updates": {same as UPDATE_TASK updates}}
+
+7. BULK_ARCHIVE_TASKS - delete/archive every task matching criteria
+   {"filters": {same as QUERY_TASKS filters}}
+
+8. UNKNOWN - intent is not clear
+   {}
+
+If the user message lists resolved dates and times, use them exactly.
+
+EXAMPLES (assuming today is Monday 2025-06-16):
+- "Add a meeting tomorrow at 2pm" → {"intent": "CREATE_TASK", "arguments": {"tasks": [{"task_name": "Meeting", "due_date": "2025-06-17 14:00", "priority": "Medium", "category": "General", "status": "To-Do", "notes": ""}]}}
+- "High priority tasks" → {"intent": "QUERY_TASKS", "arguments": {"filters": {"priority": "High"}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}}
+- "Mark the workout task as Done" → {"intent": "UPDATE_TASK", "arguments": {"task_identifier": {"type": "name", "value": "workout"}, "updates": {"status": "Done"}}}
+- "Remove the meeting with John" → {"intent": "DELETE_TASK", "arguments": {"task_identifier": {"type": "description", "value": "meeting with John"}}}
+- "Find tasks about project planning" → {"intent": "SEARCH_TASKS", "arguments": {"query": "project planning"}}
+- "Mark all fitness tasks this week as Done" → {"intent": "BULK_UPDATE_TASKS", "arguments": {"filters": {"category": "Fitness", "date_range": ["2025-06-16", "2025-06-22"]}, "updates": {"status": "Done"}}}
+- "Archive everything Done from last month" → {"intent": "BULK_ARCHIVE_TASKS", "arguments": {"filters": {"status": "Done", "date_range": ["2025-05-01", "2025-05-31"]}}}
+- "Hello" → {"intent": "UNKNOWN", "arguments": {}}
+
+CRITICAL: Respond with ONLY valid JSON. No comments, no explanations.
+"""
+
+
+TASK_CREATION_SYSTEM = """
+You are an assistant that helps make and maintain a daily schedule on Notion.
+
+The user will ask you to add one or more tasks to their Notion schedule and provide you the details.
+
+You must respond in a JSON format with the following structure - an object holding an array of tasks:
+
+{"tasks": [
+    {
+        "task_name": "The name/title of the task",
+        "due_date": "YYYY-MM-DD HH:MM",
+        "priority": "Low/Medium/High",
+        "category": "General/Personal/Fitness/Fun/School",
+        "status": "To-Do/In Progress/Done",
+        "notes": "Additional details, description, or context about the task"
+    }
+]}
+
+IMPORTANT RULES:
+1. The due_date must be in the format "YYYY-MM-DD HH:MM" (24-hour format)
+2. Priority must be exactly one of: "Low", "Medium", or "High" (case-sensitive)
+3. Category must be exactly one of: "General", "Personal", "Fitness", "Fun", or "School" (case-sensitive)
+4. Status must be exactly one of: "To-Do", "In Progress", or "Done" (case-sensitive)
+5. Notes should contain relevant details, context, or description about the task
+6. If the user doesn't specify a field, use these defaults:
+   - priority: "Medium"
+   - category: "General"
+   - status: "To-Do"
+   - notes: "" (empty string if no details provided)
+7. For the due_date, if the user doesn't specify a time, default to "12:00"
+8. If the user doesn't specify a date, use today's date (given in the user message)
+9. ALWAYS return the "tasks" array, even if there's only one task
+10. If the user mentions multiple tasks, separate them into individual objects in the array
+11. If the user message lists resolved dates and times, use them exactly
+
+EXAMPLES (assuming today is Monday 2025-06-16):
+
+User: "Add a meeting with John tomorrow at 2pm to discuss the new project requirements"
+Response: {"tasks": [
+    {
+        "task_name": "Meeting with John",
+        "due_date": "2025-06-17 14:00",
+        "priority": "Medium",
+        "category": "General",
+        "status": "To-Do",
+        "notes": "Discuss new project requirements"
+    }
+]}
+
+User: "Add three tasks: workout tomorrow at 6am, buy groceries today at 5pm, and call mom on Friday at 3pm"
+Response: {"tasks": [
+    {
+        "task_name": "Workout",
+        "due_date": "2025-06-17 06:00",
+        "priority": "Medium",
+        "category": "Fitness",
+        "status": "To-Do",
+        "notes": ""
+    },
+    {
+        "task_name": "Buy groceries",
+        "due_date": "2025-06-16 17:00",
+        "priority": "Medium",
+        "category": "General",
+        "status": "To-Do",
+        "notes": ""
+    },
+    {
+        "task_name": "Call mom",
+        "due_date": "2025-06-20 15:00",
+        "priority": "Medium",
+        "category": "Personal",
+        "status": "To-Do",
+        "notes": ""
+    }
+]}
+
+User: "High priority workout session - need to focus on cardio and strength training"
+Response: {"tasks": [
+    {
+        "task_name": "Workout session",
+        "due_date": "2025-06-16 12:00",
+        "priority": "High",
+        "category": "Fitness",
+        "status": "To-Do",
+        "notes": "Focus on cardio and strength training"
+    }
+]}
+
+User: "Doctor appointment next Friday at 10am for annual checkup"
+Response: {"tasks": [
+    {
+        "task_name": "Doctor appointment",
+        "due_date": "2025-06-27 10:00",
+        "priority": "High",
+        "category": "Personal",
+        "status": "To-Do",
+        "notes": "Annual checkup"
+    }
+]}
+
+CRITICAL: Respond with ONLY valid JSON. No comments, no explanations, no additional text outside the JSON structure.
+"""
+
+
+QUERY_PARAMETERS_SYSTEM = """
+Parse the user's query to extract filtering and sorting parameters for task retrieval.
+
+Extract the following information:
+1. Date range (today, this week, this month, tomorrow, next week, etc.)
+2. Category filter (General, Personal, Fitness, Fun, School)
+3. Priority filter (Low, Medium, High)
+4. Status filter (To-Do, In Progress, Done)
+5. Sort preference (by due date, priority, etc.)
+6. Limit (how many tasks to show)
+
+Respond in JSON format:
+{
+    "filters": {
+        "category": "string or null",
+        "priority": "string or null",
+        "status": "string or null",
+        "date_range": ["start_date", "end_date"] or null,
+        "where": filter expression or null
+    },
+    "sort_by": {
+        "property": "due_date or priority",
+        "direction": "ascending or descending"
+    } or null,
+    "limit": number
+}
+
+Use "where" for conditions the other filters can't express (negation, OR, open-ended dates, empty fields, text).
+A filter expression is a condition {"field": ..., "op": ..., "value": ...} or a group {"and": [...]} / {"or": [...]}.
+- fields: task_name, notes, priority, category, status, due_date
+- priority/category/status ops: equals, does_not_equal, in, not_in (value is a list), is_empty, is_not_empty
+- task_name/notes ops: contains, does_not_contain, equals, does_not_equal, is_empty, is_not_empty
+- due_date ops: equals, before, after, on_or_before, on_or_after, is_empty, is_not_empty;
+  values are "YYYY-MM-DD", "YYYY-MM-DD HH:MM", "today" or "now"
+- is_empty / is_not_empty take no value
+
+If the user message lists resolved dates and times, use them exactly.
+
+Examples (assuming today is Monday 2025-06-16):
+- "Show me tasks for this week" → {"filters": {"date_range": ["2025-06-16", "2025-06-22"]}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+- "High priority tasks" → {"filters": {"priority": "High"}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+- "Completed fitness tasks" → {"filters": {"category": "Fitness", "status": "Done"}, "sort_by": null, "limit": 50}
+- "All tasks" → {"filters": {}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+- "Overdue tasks" → {"filters": {"where": {"and": [{"field": "due_date", "op": "before", "value": "now"}, {"field": "status", "op": "does_not_equal", "value": "Done"}]}}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+- "High or medium priority tasks that aren't done, due before Friday" → {"filters": {"where": {"and": [{"field": "priority", "op": "in", "value": ["High", "Medium"]}, {"field": "status", "op": "does_not_equal", "value": "Done"}, {"field": "due_date", "op": "before", "value": "2025-06-20"}]}}, "sort_by": {"property": "due_date", "direction": "ascending"}, "limit": 50}
+"""
+
+
+UPDATE_REQUEST_SYSTEM = """
+You are an assistant that helps update tasks in a Notion schedule.
+
+The user wants to update an existing task. You need to extract:
+1. What task they want to update (task identifier)
+2. What changes they want to make to the task
+
+Respond in JSON format with this structure:
+
+{
+    "task_identifier": {
+        "type": "name/id/description",
+        "value": "the identifier value"
+    },
+    "updates": {
+        "task_name": "new name (if changing)",
+        "due_date": "YYYY-MM-DD HH:MM (if changing)",
+        "priority": "Low/Medium/High (if changing)",
+        "category": "General/Personal/Fitness/Fun/School (if changing)",
+        "status": "To-Do/In Progress/Done (if changing)",
+        "notes": "new notes (if changing)"
+    }
+}
+
+IMPORTANT RULES:
+1. Only include fields in "updates" that are actually being changed
+2. For task_identifier:
+   - "type": "name" if they mention the task name
+   - "type": "id" if they mention a specific ID
+   - "type": "description" if they describe the task
+3. For dates: Use "YYYY-MM-DD HH:MM" format (24-hour)
+4. For priority: Must be "Low", "Medium", or "High"
+5. For category: Must be "General", "Personal", "Fitness", "Fun", or "School"
+6. For status: Must be "To-Do", "In Progress", or "Done"
+7. If no specific changes mentioned, return empty "updates" object
+8. If the user message lists resolved dates and times, use them exactly
+
+EXAMPLES (assuming today is Monday 2025-06-16):
+
+User: "Mark the workout task as Done"
+Response: {
+    "task_identifier": {
+        "type": "name",
+        "value": "workout"
+    },
+    "updates": {
+        "status": "Done"
+    }
+}
+
+User: "Change the meeting with John to tomorrow at 3pm"
+Response: {
+    "task_identifier": {
+        "type": "description",
+        "value": "meeting with John"
+    },
+    "updates": {
+        "due_date": "2025-06-17 15:00"
+    }
+}
+
+User: "Update the project planning task to high priority and add notes about the deadline"
+Response: {
+    "task_identifier": {
+        "type": "name",
+        "value": "project planning"
+    },
+    "updates": {
+        "priority": "High",
+        "notes": "Deadline approaching"
+    }
+}
+
+User: "Change the grocery shopping task category to Personal"
+Response: {
+    "task_identifier": {
+        "type": "name",
+        "value": "grocery shopping"
+    },
+    "updates": {
+        "category": "Personal"
+    }
+}
+"""
+
+
+DELETE_REQUEST_SYSTEM = """
+You are an assistant that helps delete tasks from a Notion schedule.
+
+The user wants to delete an existing task. You need to extract:
+1. What task they want to delete (task identifier)
+
+Respond in JSON format with this structure:
+
+{
+    "task_identifier": {
+        "type": "name/id/description",
+        "value": "the identifier value"
+    }
+}
+
+IMPORTANT RULES:
+1. For task_identifier:
+   - "type": "name" if they mention the task name
+   - "type": "id" if they mention a specific ID
+   - "type": "description" if they describe the task
+2. Extract the most specific identifier possible
+3. If multiple tasks could match, prefer the most specific one
+
+EXAMPLES:
+
+User: "Delete the workout task"
+Response: {
+    "task_identifier": {
+        "type": "name",
+        "value": "workout"
+    }
+}
+
+User: "Remove the meeting with John"
+Response: {
+    "task_identifier": {
+        "type": "description",
+        "value": "meeting with John"
+    }
+}
+
+User: "Delete task abc123"
+Response: {
+    "task_identifier": {
+        "type": "id",
+        "value": "abc123"
+    }
+}
+
+User: "Remove the grocery shopping task"
+Response: {
+    "task_identifier": {
+        "type": "name",
+        "value": "grocery shopping"
+    }
+}
+"""
+
+
+BULK_FILTER_RULES = """
+"filters" selects the tasks, exactly like a task query:
+{"category": str|null, "priority": str|null, "status": str|null,
+ "date_range": ["YYYY-MM-DD", "YYYY-MM-DD"]|null, "where": expression|null}
+"where" holds conditions the other filters can't express: a condition
+{"field": "task_name/notes/priority/category/status/due_date", "op": "...", "value": ...} or a
+group {"and": [...]} / {"or": [...]}. Ops: equals, does_not_equal, in/not_in (list value),
+contains, does_not_contain, before, after, on_or_before, on_or_after, is_empty, is_not_empty.
+Date values: "YYYY-MM-DD", "YYYY-MM-DD HH:MM", "today" or "now".
+Only include the criteria the user states; never return empty filters.
+If the user message lists resolved dates and times, use them exactly.
+"""
+
+
+BULK_UPDATE_REQUEST_SYSTEM = """
+You are an assistant that helps update many tasks in a Notion schedule at once.
+
+The user wants to make the same change to every task matching some criteria. Extract:
+1. Which tasks to change ("filters")
+2. What to change ("updates": only the fields being changed)
+
+Respond in JSON format: {"filters": {...}, "updates": {...}}
+
+"updates" fields: task_name, due_date ("YYYY-MM-DD HH:MM"), priority (Low/Medium/High),
+category (General/Personal/Fitness/Fun/School), status (To-Do/In Progress/Done), notes.
+""" + BULK_FILTER_RULES + """
+EXAMPLES (assuming today is Monday 2025-06-16):
+- "Mark all fitness tasks this week as Done" → {"filters": {"category": "Fitness", "date_range": ["2025-06-16", "2025-06-22"]}, "updates": {"status": "Done"}}
+- "Set every overdue task to high priority" → {"filters": {"where": {"and": [{"field": "due_date", "op": "before", "value": "now"}, {"field": "status", "op": "does_not_equal", "value": "Done"}]}}, "updates": {"priority": "High"}}
+"""
+
+
+BULK_ARCHIVE_REQUEST_SYSTEM = """
+You are an assistant that helps delete many tasks from a Notion schedule at once.
+
+The user wants to delete (archive) every task matching some criteria. Extract which tasks.
+
+Respond in JSON format: {"filters": {...}}
+""" + BULK_FILTER_RULES + """
+EXAMPLES (assuming today is Monday 2025-06-16):
+- "Archive everything Done from last month" → {"filters": {"status": "Done", "date_range": ["2025-05-01", "2025-05-31"]}}
+- "Delete all tasks in the Fun category" → {"filters": {"category": "Fun"}}
+"""
+
+
+TASK_SUMMARY_SYSTEM = """
+You are a helpful assistant that summarizes task information in a conversational, natural way.
+
+You will be given tasks retrieved from a Notion database. Please provide a natural language summary that:
+
+1. Uses a friendly, conversational tone
+2. Highlights the most important information (due dates, priorities, status)
+3. Groups tasks by priority, category, or status when helpful
+4. Mentions any urgent or overdue tasks prominently
+5. Provides actionable insights (e.g., "You have 3 high-priority tasks due today")
+6. Keeps the summary concise but informative
+
+Respond with a natural, conversational summary that would be helpful for someone managing their tasks.
+However, be concise and to the point, as the user is likely busy.
+"""
+
+
+PROMPTS = {
+    prompt.name: prompt for prompt in (
+        PromptTemplate("intent", INTENT_SYSTEM, DATE_AND_INPUT, max_tokens=50),
+        PromptTemplate("classify_and_parse", CLASSIFY_AND_PARSE_SYSTEM, DATE_AND_INPUT, max_tokens=1000),
+        PromptTemplate(
+            "task_creation", TASK_CREATION_SYSTEM,
+            "Today's date is {today} ({weekday}).\n\nHere is the task(s) the user wants to add: {user_input}",
+            max_tokens=1000
+        ),
+        PromptTemplate("query_parameters", QUERY_PARAMETERS_SYSTEM, DATE_AND_INPUT, max_tokens=500),
+        PromptTemplate("update_request", UPDATE_REQUEST_SYSTEM, DATE_AND_INPUT, max_tokens=500),
+        PromptTemplate("delete_request", DELETE_REQUEST_SYSTEM, DATE_AND_INPUT, max_tokens=300),
+        PromptTemplate("bulk_update_request", BULK_UPDATE_REQUEST_SYSTEM, DATE_AND_INPUT, max_tokens=500),
+        PromptTemplate("bulk_archive_request", BULK_ARCHIVE_REQUEST_SYSTEM, DATE_AND_INPUT, max_tokens=400),
+        PromptTemplate(
+            "task_summary", TASK_SUMMARY_SYSTEM,
+            "Today's date is {today} ({weekday}).\n\n"
+            "I have retrieved {task_count} tasks.\n\n"
+            "Task data:\n{task_data}\n\n"
+            "Original query context: \"{title}\"",
+            max_tokens=800
+        ),
+    )
+}
+
+
+def get_prompt(name):
+    return PROMPTS[name]
+
+
+def format_task_data(task_summaries):
+    return json.dumps(task_summaries, indent=2)
+
+
+def token_estimates():
+    """Approximate static (cacheable) prefix size of every registered prompt, in tokens."""
+    return {name: prompt.static_token_estimate for name, prompt in PROMPTS.items()}
+
+
+def report_token_estimates():
+    print("📏 Prompt token estimates (static system prefix):")
+    for name, tokens in token_estimates().items():
+        print(f"   {name:<20} ~{tokens:>5} tokens")
+
+
+if __name__ == "__main__":
+    report_token_estimates()
@@ -0,0 +1,375 @@
+"""
+Query Planner
+Compiles the agent's task filters into Notion database filters, pushing as
+much of the work to the server as Notion's filter language allows.
+
+Filters are written as a small AST:
+
+    leaf:      {"field": "status", "op": "does_not_equal", "value": "Done"}
+    compound:  {"and": [node, ...]}  /  {"or": [node, ...]}
+
+Fields are task_name, notes, priority, category, status and due_date.
+Operators depend on the property type (see OPERATORS); "in" / "not_in" take a
+list and expand to OR / AND groups. Date values may be "YYYY-MM-DD",
+"YYYY-MM-DD HH:MM", or the keywords "today" and "now" (resolved when the
+query runs, so cached query parameters stay correct).
+
+Notion only accepts compound filters nested two levels deep. Branches of a
+top-level AND that can't be expressed (too deep) are kept as a residual
+predicate evaluated locally on the returned rows; the rest is sent as the
+server filter, so only matching rows cross the wire. The same split is used
+for the SQLite replica (plan_local_query).
+"""
+from datetime import datetime, timedelta
+
+from task_model import PROPERTY_NAMES, PROPERTY_TYPES
+
+
+# field -> (Notion property name, Notion property type)
+FIELDS = {field: (PROPERTY_NAMES[field], PROPERTY_TYPES[field]) for field in PROPERTY_TYPES}
+
+OPERATORS = {
+    "select": ("equals", "does_not_equal", "in", "not_in", "is_empty", "is_not_empty"),
+    "title": ("equals", "does_not_equal", "contains", "does_not_contain", "is_empty", "is_not_empty"),
+    "rich_text": ("equals", "does_not_equal", "contains", "does_not_contain", "is_empty", "is_not_empty"),
+    "date": ("equals", "before", "after", "on_or_before", "on_or_after", "is_empty", "is_not_empty"),
+}
+
+VALUELESS_OPERATORS = ("is_empty", "is_not_empty")
+LIST_OPERATORS = ("in", "not_in")
+
+# Compound filters Notion accepts: a top-level and/or whose children may be one more and/or
+NOTION_MAX_COMPOUND_DEPTH = 2
+
+
+class PushdownError(ValueError):
+    """The filter can't be expressed as a Notion database filter."""
+
+
+def check_filter_ast(node, path="$"):
+    """
+    Validate a filter AST.
+
+    Returns:
+        list: Human-readable error strings, empty when the AST is valid
+    """
+    if not isinstance(node, dict):
+        return [f"{path}: expected object, got {type(node).__name__}"]
+
+    compound = [key for key in ("and", "or") if key in node]
+    if compound:
+        children = node[compound[0]]
+        if len(node) != 1 or not isinstance(children, list) or not children:
+            return [f"{path}: '{compound[0]}' must be the only key and hold a non-empty list"]
+        errors = []
+        for i, child in enumerate(children):
+            errors.extend(check_filter_ast(child, f"{path}.{compound[0]}[{i}]"))
+        return errors
+
+    field, op = node.get("field"), node.get("op")
+    if field not in FIELDS:
+        return [f"{path}.field: {field!r} is not one of {list(FIELDS)}"]
+    allowed = OPERATORS[FIELDS[field][1]]
+    if op not in allowed:
+        return [f"{path}.op: {op!r} is not valid for {field} (use one of {list(allowed)})"]
+    if op in VALUELESS_OPERATORS:
+        return []
+    value = node.get("value")
+    if op in LIST_OPERATORS:
+        if not isinstance(value, list) or not value or not all(isinstance(item, str) for item in value):
+            return [f"{path}.value: {op} needs a non-empty list of strings"]
+    elif not isinstance(value, str) or not value:
+        return [f"{path}.value: {op} needs a non-empty string"]
+    elif field == "due_date" and _parse_date_value(value) is None:
+        return [f"{path}.value: {value!r} is not a date (YYYY-MM-DD, YYYY-MM-DD HH:MM, today or now)"]
+    return []
+
+
+def is_date_value(value):
+    """True for a value a due_date condition accepts: YYYY-MM-DD, YYYY-MM-DD HH:MM, today or now."""
+    return isinstance(value, str) and _parse_date_value(value) is not None
+
+
+def filters_to_ast(filters):
+    """
+    Convert the agent's filter dict (category, priority, status, date_range,
+    plus an optional "where" AST) into a single AST, or None for no filter.
+    """
+    if not filters:
+        return None
+
+    conditions = []
+    for field in ("category", "priority", "status"):
+        if filters.get(field) is not None:
+            conditions.append({"field": field, "op": "equals", "value": filters[field]})
+    if filters.get("date_range"):
+        start_date, end_date = filters["date_range"]
+        conditions.append({"field": "due_date", "op": "on_or_after", "value": start_date})
+        conditions.append({"field": "due_date", "op": "on_or_before", "value": end_date})
+    if filters.get("where"):
+        conditions.append(filters["where"])
+
+    if not conditions:
+        return None
+    return _normalize({"and": conditions})
+
+
+def _normalize(node):
+    """Expand in/not_in, flatten nested groups of the same kind and unwrap single-child groups."""
+    for key in ("and", "or"):
+        if key in node:
+            children = []
+            for child in (_normalize(child) for child in node[key]):
+                children.extend(child[key] if key in child else [child])
+            return children[0] if len(children) == 1 else {key: children}
+
+    if node["op"] in LIST_OPERATORS:
+        op, group = ("equals", "or") if node["op"] == "in" else ("does_not_equal", "and")
+        return _normalize({group: [{"field": node["field"], "op": op, "value": value} for value in node["value"]]})
+    return node
+
+
+def _resolve_value(value, now=None):
+    now = now or datetime.now().astimezone()
+    if value == "today":
+        return now.strftime("%Y-%m-%d")
+    if value == "now":
+        return now.isoformat(timespec="minutes")
+    return value
+
+
+def _parse_date_value(value, now=None):
+    """Parse a date filter value into (local naive datetime, date_only), or None."""
+    value = _resolve_value(value, now)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed, len(value) == 10
+
+
+def _compile_leaf(node, now=None):
+    property_name, property_type = FIELDS[node["field"]]
+    op = node["op"]
+    if op in VALUELESS_OPERATORS:
+        condition = {op: True}
+    elif property_type == "date":
+        value = _resolve_value(node["value"], now)
+        if len(value) > 10:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            # Naive datetimes are local time, as in add_tasks_to_notion
+            value = (parsed if parsed.tzinfo else parsed.astimezone()).isoformat()
+        condition = {op: value}
+    else:
+        condition = {op: node["value"]}
+    return {"property": property_name, property_type: condition}
+
+
+def compile_notion_filter(node, now=None, depth=0):
+    """
+    Compile a normalized AST into a Notion filter.
+
+    Raises:
+        PushdownError: If the AST nests compound filters deeper than Notion allows
+    """
+    for key in ("and", "or"):
+        if key in node:
+            if depth >= NOTION_MAX_COMPOUND_DEPTH:
+                raise PushdownError(f"compound filters nested more than {NOTION_MAX_COMPOUND_DEPTH} levels deep")
+            return {key: [compile_notion_filter(child, now, depth + 1) for child in node[key]]}
+    return _compile_leaf(node, now)
+
+
+def referenced_fields(node):
+    """Set of task fields an AST reads."""
+    if node is None:
+        return set()
+    for key in ("and", "or"):
+        if key in node:
+            return set().union(*(referenced_fields(child) for child in node[key]))
+    return {node["field"]}
+
+
+def _task_value(task, field):
+    return task.get(field) or ""
+
+
+def _compare_dates(op, due, target, date_only):
+    if date_only:
+        start, end = target, target + timedelta(days=1)
+        return {
+            "equals": start <= due < end,
+            "before": due < start,
+            "after": due >= end,
+            "on_or_before": due < end,
+            "on_or_after": due >= start,
+        }[op]
+    return {
+        "equals": due == target,
+        "before": due < target,
+        "after": due > target,
+        "on_or_before": due <= target,
+        "on_or_after": due >= target,
+    }[op]
+
+
+def evaluate(node, task, now=None):
+    """Evaluate a normalized AST against a parsed task dict (local execution)."""
+    if "and" in node:
+        return all(evaluate(child, task, now) for child in node["and"])
+    if "or" in node:
+        return any(evaluate(child, task, now) for child in node["or"])
+
+    field, op = node["field"], node["op"]
+    value = _task_value(task, field)
+    if op == "is_empty":
+        return not value
+    if op == "is_not_empty":
+        return bool(value)
+
+    if FIELDS[field][1] == "date":
+        due = _parse_date_value(value) if value else None
+        target = _parse_date_value(node["value"], now)
+        if due is None or target is None:
+            return False
+        return _compare_dates(op, due[0], target[0], target[1])
+
+    if FIELDS[field][1] == "select":
+        return (value == node["value"]) == (op == "equals")
+
+    value, target = value.lower(), node["value"].lower()
+    return {
+        "equals": value == target,
+        "does_not_equal": value != target,
+        "contains": target in value,
+        "does_not_contain": target not in value,
+    }[op]
+
+
+SQL_COMPARISONS = {"equals": "=", "before": "<", "after": ">", "on_or_before": "<=", "on_or_after": ">="}
+
+
+def compile_sql_filter(node, now=None, depth=0):
+    """
+    Compile a normalized AST into a SQLite WHERE expression over the replica's
+    tasks table (columns are named like the AST fields).
+
+    Date comparisons against a day run on the stored date prefix; comparisons
+    against a time of day ("now") can't, and raise PushdownError so they are
+    evaluated in Python instead.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    for key in ("and", "or"):
+        if key in node:
+            parts = [compile_sql_filter(child, now, depth + 1) for child in node[key]]
+            sql = f" {key.upper()} ".join(part for part, _ in parts)
+            return f"({sql})", [param for _, part_params in parts for param in part_params]
+
+    column, op = node["field"], node["op"]
+    if op == "is_empty":
+        return f"({column} IS NULL OR {column} = '')", []
+    if op == "is_not_empty":
+        return f"({column} IS NOT NULL AND {column} != '')", []
+
+    if FIELDS[column][1] == "date":
+        value = _resolve_value(node["value"], now)
+        if len(value) != 10:
+            raise PushdownError("time-of-day comparisons are evaluated in Python")
+        return f"({column} IS NOT NULL AND substr({column}, 1, 10) {SQL_COMPARISONS[op]} ?)", [value]
+
+    value = node["value"]
+    if FIELDS[column][1] == "select":
+        if op == "equals":
+            return f"{column} = ?", [value]
+        return f"({column} IS NULL OR {column} != ?)", [value]
+
+    pattern = "%" + value.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return {
+        "equals": (f"lower({column}) = ?", [value.lower()]),
+        "does_not_equal": (f"({column} IS NULL OR lower({column}) != ?)", [value.lower()]),
+        "contains": (f"lower({column}) LIKE ? ESCAPE '\\'", [pattern]),
+        "does_not_contain": (f"({column} IS NULL OR lower({column}) NOT LIKE ? ESCAPE '\\')", [pattern]),
+    }[op]
+
+
+def _split(ast, compile_node, now=None):
+    """
+    Compile as much of the AST as possible. A top-level AND is split child by
+    child; anything else is compiled whole or not at all.
+
+    Returns:
+        tuple: (list of compiled parts, residual AST or None)
+    """
+    try:
+        return [compile_node(ast, now)], None
+    except PushdownError:
+        pass
+
+    if "and" not in ast:
+        return [], ast
+
+    pushed, kept = [], []
+    for child in ast["and"]:
+        try:
+            pushed.append(compile_node(child, now, depth=1))
+        except PushdownError:
+            kept.append(child)
+    return pushed, kept[0] if len(kept) == 1 else {"and": kept}
+
+
+class QueryPlan:
+    """How one task query runs: the part the store evaluates and the part left for Python."""
+
+    def __init__(self, ast=None, compiled=None, residual=None, target="notion"):
+        self.ast = ast
+        self.compiled = compiled
+        self.residual = residual
+        self.target = target
+
+    def matches(self, task, now=None):
+        """Apply the residual predicate to a task returned by the store."""
+        return self.residual is None or evaluate(self.residual, task, now)
+
+    def describe(self):
+        store = "Notion" if self.target == "notion" else "the local replica"
+        if self.ast is None:
+            return "no filter"
+        if self.residual is None:
+            return f"fully evaluated by {store}"
+        if self.compiled is None:
+            return "evaluated in Python (not expressible as a store filter)"
+        return f"partially evaluated by {store}, remainder in Python"
+
+
+def plan_query(filters, now=None):
+    """
+    Plan a Notion database query. compiled is the Notion filter object (or
+    None for no server filter); residual is evaluated on the returned rows.
+    """
+    ast = filters_to_ast(filters)
+    if ast is None:
+        return QueryPlan()
+    pushed, residual = _split(ast, compile_notion_filter, now)
+    compiled = None
+    if pushed:
+        compiled = pushed[0] if len(pushed) == 1 and residual is None else {"and": pushed}
+    return QueryPlan(ast, compiled, residual)
+
+
+def plan_local_query(filters, now=None):
+    """
+    Plan a query against the SQLite replica. compiled is a (sql, params)
+    WHERE expression (or None); residual is evaluated on the returned rows.
+    """
+    ast = filters_to_ast(filters)
+    if ast is None:
+        return QueryPlan(target="replica")
+    pushed, residual = _split(ast, compile_sql_filter, now)
+    compiled = None
+    if pushed:
+        compiled = (" AND ".join(sql for sql, _ in pushed), [param for _, params in pushed for param in params])
+    return QueryPlan(ast, compiled, residual, target="replica")
@@ -0,0 +1,218 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token Bucket Rate Limiter
+    Hands out request permits at a steady rate, allowing short bursts up to
+    the bucket capacity. Safe to share between worker threads.
+    """
+
+    def __init__(self, rate=3.0, capacity=3):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def _try_acquire(self):
+        """Take a permit if one is available. Returns 0, or the seconds to wait before trying again."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request permit is available."""
+        while True:
+            wait_time = self._try_acquire()
+            if not wait_time:
+                return
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """Wait for a request permit without blocking the event loop."""
+        import asyncio  # already loaded by the running event loop; kept out of the module import
+        while True:
+            wait_time = self._try_acquire()
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+
+class RateLimitedError(Exception):
+    """Raised when a call is still rate limited after every retry."""
+
+
+def _is_rate_limited(error):
+    """True for a 429 / rate_limited API error (notion-client's APIResponseError or similar)."""
+    return getattr(error, "status", None) == 429 or getattr(error, "code", None) == "rate_limited"
+
+
+def _retry_after(error):
+    """Seconds from the Retry-After header of a rate-limited error, if present."""
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Adaptive Rate Limiter
+    A token bucket whose rate adapts to the server (AIMD): every successful
+    call nudges the rate up by a small additive step until max_rate, and every
+    429 halves it (down to min_rate) and pauses all callers until the
+    server's Retry-After has passed. Rate-limited calls are retried instead of
+    surfacing as failures. Tracks throughput over a sliding window.
+    """
+
+    def __init__(self, rate=3.0, capacity=3, min_rate=0.5, max_rate=None, increase=0.05, decrease=0.5,
+                 max_retries=5, default_retry_after=1.0, window=10.0):
+        super().__init__(rate=rate, capacity=capacity)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate or rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.window = window
+        self.throttled = 0
+        self._blocked_until = 0.0
+        self._completed = []
+
+    def _try_acquire(self):
+        """No permits are handed out until the server's Retry-After pause (if any) is over."""
+        with self._lock:
+            pause = self._blocked_until - time.monotonic()
+        if pause > 0:
+            return pause
+        return super()._try_acquire()
+
+    def _on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            now = time.monotonic()
+            self._completed.append(now)
+            cutoff = now - self.window
+            if self._completed[0] < cutoff:
+                self._completed = [t for t in self._completed if t >= cutoff]
+
+    def _on_throttled(self, error, attempt):
+        retry_after = _retry_after(error) or self.default_retry_after * (2 ** attempt)
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        print(f"⏳ Rate limited by server, waiting {retry_after:.1f}s (limit now {self.rate:.2f} req/s)")
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func under the limiter, retrying when the server answers 429.
+
+        Raises:
+            RateLimitedError: If the call is still rate limited after max_retries
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e):
+                    raise
+                self._on_throttled(e, attempt)
+                continue
+            self._on_success()
+            return result
+        raise RateLimitedError(f"Still rate limited after {self.max_retries} retries")
+
+    async def call_async(self, func, *args, **kwargs):
+        """Await the coroutine function func under the limiter; same retry behavior as call."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e):
+                    raise
+                self._on_throttled(e, attempt)
+                continue
+            self._on_success()
+            return result
+        raise RateLimitedError(f"Still rate limited after {self.max_retries} retries")
+
+    def throughput(self):
+        """Completed calls per second over the last window seconds."""
+        with self._lock:
+            cutoff = time.monotonic() - self.window
+            return sum(1 for t in self._completed if t >= cutoff) / self.window
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "throughput": self.throughput(),
+            "throttled": self.throttled
+        }
+
+
+class RateLimitedProxy:
+    """
+    Wraps an API client so every call on the given endpoints (including
+    nested ones like client.pages.create) goes through AdaptiveRateLimiter.call.
+    Other attributes are passed through untouched.
+    """
+
+    def __init__(self, target, limiter, endpoints=None):
+        self._target = target
+        self._limiter = limiter
+        self._endpoints = endpoints
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if self._endpoints is not None and name not in self._endpoints:
+            return attribute
+        if callable(attribute):
+            return self._wrap(attribute)
+        return self._child(attribute)
+
+    def _child(self, endpoint):
+        return RateLimitedProxy(endpoint, self._limiter)
+
+    def _wrap(self, method):
+        return lambda *args, **kwargs: self._limiter.call(method, *args, **kwargs)
+
+
+class AsyncRateLimitedProxy(RateLimitedProxy):
+    """
+    RateLimitedProxy for async clients (e.g. notion-client's AsyncClient):
+    wrapped calls are coroutines, and an optional asyncio.Semaphore bounds
+    how many are in flight at once.
+    """
+
+    def __init__(self, target, limiter, endpoints=None, semaphore=None):
+        super().__init__(target, limiter, endpoints)
+        self._semaphore = semaphore
+
+    def _child(self, endpoint):
+        return AsyncRateLimitedProxy(endpoint, self._limiter, semaphore=self._semaphore)
+
+    def _wrap(self, method):
+        async def call(*args, **kwargs):
+            if self._semaphore is None:
+                return await self._limiter.call_async(method, *args, **kwargs)
+            async with self._semaphore:
+                return await self._limiter.call_async(method, *args, **kwargs)
+        return call
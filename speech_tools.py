@@ -1,8 +1,23 @@
-import speech_recognition as sr
-import sounddevice as sd
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _audio_stack():
+    """
+    Import speech_recognition and sounddevice on first use. sounddevice loads
+    PortAudio, which text-only runs never need.
+    """
+    import speech_recognition
+    import sounddevice
+    return speech_recognition, sounddevice
 
 
 def listen_for_speech_push_to_talk():
+    try:
+        sr, sd = _audio_stack()
+    except (ImportError, OSError) as e:
+        print(f"❌ Speech input unavailable: {e}")
+        return None
 
     recognizer = sr.Recognizer()
     
@@ -70,6 +85,12 @@ def listen_for_speech_continuous():
     Continuous speech recognition with sounddevice
     Automatically detects speech and stops when silence is detected
     """
+    try:
+        sr, sd = _audio_stack()
+    except (ImportError, OSError) as e:
+        print(f"❌ Speech input unavailable: {e}")
+        return None
+
     recognizer = sr.Recognizer()
     
     # Configure for continuous listening
@@ -134,6 +155,8 @@ def test_microphone():
     print("🎤 Testing microphone with sounddevice...")
     
     try:
+        sd = _audio_stack()[1]
+
         # List available devices
         devices = sd.query_devices()
         print(f"📱 Found {len(devices)} audio devices:")
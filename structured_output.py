@@ -0,0 +1,127 @@
+import json
+import re
+
+from intent_schemas import validate
+from llm_client import get_llm_client, LLMError
+
+
+CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class StructuredOutputError(LLMError):
+    """Raised when the model's output still fails validation after the repair attempt."""
+
+    def __init__(self, message, content=None, errors=None):
+        super().__init__(message)
+        self.content = content
+        self.errors = errors or []
+
+
+def decode_json(content):
+    """
+    Decode a model response as JSON, tolerating a surrounding code fence.
+
+    Returns:
+        tuple: (value, None) on success, or (None, error message)
+    """
+    text = (content or "").strip()
+    if not text:
+        return None, "empty response"
+    fenced = CODE_FENCE_PATTERN.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        return json.loads(text), None
+    except json.JSONDecodeError as e:
+        return None, f"invalid JSON: {e}"
+
+
+def _check(content, schema, extra_validator):
+    value, decode_error = decode_json(content)
+    if decode_error:
+        return None, [decode_error]
+    errors = validate(value, schema)
+    if not errors and extra_validator:
+        errors = extra_validator(value)
+    return value, errors
+
+
+def _complete(client, payload, deadline):
+    """
+    Return the reply text, raising StructuredOutputError when the model sent
+    no content (e.g. it refused the request under json_schema).
+    """
+    message = client.chat_message(**_chat_args(payload), deadline=deadline)
+    content = message.get('content')
+    if not content or not content.strip():
+        refusal = message.get('refusal')
+        reason = f"Model refused: {refusal}" if refusal else "Model returned an empty response"
+        raise StructuredOutputError(reason, content, [reason])
+    return content
+
+
+def request_structured_output(payload, schema, schema_name, deadline=None, extra_validator=None):
+    """
+    Structured Output Request
+    Asks for JSON matching a JSON schema (OpenAI response_format
+    json_schema), validates the reply, and if it doesn't match sends one
+    targeted repair request listing the validation errors.
+
+    The schema is sent with strict off, so the API treats it as guidance
+    rather than a hard constraint: strict mode can't express the free-form
+    COMBINED_SCHEMA arguments, optional fields or the pattern/minLength/
+    minimum checks the schemas use. The local validation is what enforces it.
+
+    Args:
+        payload (dict): Chat completion payload (model, messages, max_tokens)
+        schema (dict): JSON schema the response must satisfy (root must be an object)
+        schema_name (str): Name reported to the API for the schema
+        deadline (float): Seconds allowed per call, retries included
+        extra_validator (callable): Optional value -> list of extra error strings
+
+    Returns:
+        The validated, decoded JSON value
+
+    Raises:
+        LLMError: If a request fails
+        StructuredOutputError: If the repaired response is still invalid, or
+            the model returned no content (the message includes any refusal)
+    """
+    client = get_llm_client()
+    payload = dict(payload)
+    payload["response_format"] = {
+        "type": "json_schema",
+        "json_schema": {"name": schema_name, "schema": schema, "strict": False}  # guidance only, see above
+    }
+
+    content = _complete(client, payload, deadline)
+    value, errors = _check(content, schema, extra_validator)
+    if not errors:
+        return value
+
+    print(f"🔧 Response failed validation ({errors[0]}), asking the model to repair it...")
+    repair_payload = dict(payload)
+    repair_payload["messages"] = payload["messages"] + [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": (
+            "Your response does not match the required JSON schema:\n"
+            + "\n".join(f"- {error}" for error in errors[:10])
+            + "\n\nRespond again with ONLY the corrected JSON."
+        )}
+    ]
+
+    content = _complete(client, repair_payload, deadline)
+    value, errors = _check(content, schema, extra_validator)
+    if errors:
+        raise StructuredOutputError(f"Model output failed validation: {errors[0]}", content, errors)
+    return value
+
+
+def _chat_args(payload):
+    args = dict(payload)
+    return {
+        "messages": args.pop("messages"),
+        "max_tokens": args.pop("max_tokens"),
+        "model": args.pop("model"),
+        **args
+    }
@@ -0,0 +1,412 @@
+"""
+Task Matcher
+Finds the task an update/delete command refers to. Tasks are kept in an
+inverted index (token -> {task id: term frequency}) for the name field and
+for name + notes, and candidates are ranked with BM25, so a lookup only
+touches the postings of the query's tokens (and the terms they are a prefix of).
+
+A candidate has to contain the identifier's words (stopwords such as "the"
+are ignored), or its name has to contain the identifier or appear in it,
+before it is ranked; when nothing qualifies there is no match.
+
+The index is updated incrementally: syncing it against a freshly fetched
+task list re-indexes only the tasks that were added or edited since. The
+same index backs SEARCH_TASKS, which adds prefix and typo-tolerant matching.
+"""
+from bisect import bisect_left
+from collections import Counter
+import heapq
+import math
+import re
+import threading
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+DEFAULT_CANDIDATES = 4
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Added to a candidate whose whole name equals the identifier, so it always ranks first
+EXACT_NAME_BONUS = 100.0
+# Share of an identifier's words a candidate must contain (exactly or as the start of a word);
+# descriptions are looser paraphrases, so half of their words are enough
+MIN_COVERAGE = {"name": 1.0, "description": 0.5}
+# Words that say nothing about which task is meant
+STOPWORDS = frozenset(
+    "a an the my our your this that these those to for of on in at by with and or as is it its "
+    "about task tasks one".split()
+)
+
+# Full-text search: weight of prefix and one-typo expansions relative to an exact token,
+# extra weight for hits in the task name, and the shortest tokens that get expanded
+DEFAULT_SEARCH_LIMIT = 20
+PREFIX_WEIGHT = 0.7
+FUZZY_WEIGHT = 0.5
+NAME_WEIGHT = 1.5
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+MAX_EXPANSIONS = 50
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class _Field:
+    """Postings and length statistics for one indexed field."""
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.lengths = {}
+        self.total_length = 0
+        self._norms = None
+
+    def add(self, task_id, tokens):
+        counts = Counter(tokens)
+        for token, frequency in counts.items():
+            self.postings.setdefault(token, {})[task_id] = frequency
+        self.lengths[task_id] = len(tokens)
+        self.total_length += len(tokens)
+        self._norms = None
+
+    def remove(self, task_id, tokens):
+        for token in set(tokens):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self.postings[token]
+        self.total_length -= self.lengths.pop(task_id, 0)
+        self._norms = None
+
+    def _length_norms(self):
+        """Per-task BM25 length normalization, recomputed only after the index changes."""
+        if self._norms is None:
+            average_length = self.total_length / len(self.lengths) or 1
+            self._norms = {
+                task_id: self.k1 * (1 - self.b + self.b * length / average_length)
+                for task_id, length in self.lengths.items()
+            }
+        return self._norms
+
+    def score(self, query_tokens):
+        """BM25 score for every task containing at least one query token."""
+        return self.score_terms({token: 1.0 for token in query_tokens})
+
+    def score_terms(self, weighted_terms):
+        """BM25 score over index terms, each contribution multiplied by the term's weight."""
+        doc_count = len(self.lengths)
+        if not doc_count:
+            return {}
+        norms = self._length_norms()
+        boost = self.k1 + 1
+        scores = {}
+        for token, weight in weighted_terms.items():
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = weight * math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for task_id, frequency in postings.items():
+                scores[task_id] = scores.get(task_id, 0.0) + idf * frequency * boost / (frequency + norms[task_id])
+        return scores
+
+
+def content_tokens(text):
+    """Tokens without stopwords; all tokens when the text is nothing but stopwords."""
+    tokens = tokenize(text)
+    return [token for token in tokens if token not in STOPWORDS] or tokens
+
+
+def _coverage(query_tokens, tokens):
+    """Share of query tokens present in tokens, exactly or as the start of a longer token."""
+    present = set(tokens)
+    covered = sum(
+        1 for query in query_tokens
+        if query in present or (len(query) >= MIN_PREFIX_LENGTH and any(token.startswith(query) for token in present))
+    )
+    return covered / len(query_tokens)
+
+
+def _starts_phrase(tokens, phrase):
+    """phrase occurs as a run of tokens, its last token possibly only as the start of a word."""
+    *head, last = phrase
+    size = len(phrase)
+    return any(
+        tokens[i:i + size - 1] == head and tokens[i + size - 1].startswith(last)
+        for i in range(len(tokens) - size + 1)
+    )
+
+
+def _contains_phrase(tokens, phrase):
+    size = len(phrase)
+    return any(tokens[i:i + size] == phrase for i in range(len(tokens) - size + 1))
+
+
+def _deletion_variants(token):
+    """The token plus every string one deletion away; tokens within one edit share a variant."""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class TaskIndex:
+    """Incremental inverted index over tasks, keyed by Notion page id."""
+
+    def __init__(self):
+        self._tasks = {}
+        self._versions = {}
+        self._tokens = {}
+        self._sorted_ids = []
+        self._name = _Field()
+        self._text = _Field()
+        self._vocabulary = None
+        self._variants = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    @staticmethod
+    def _version(task):
+        return (task.get('last_edited_time'), task.get('task_name'), task.get('notes'))
+
+    def _add(self, task):
+        task_id = task['id']
+        name_tokens = tokenize(task.get('task_name'))
+        text_tokens = name_tokens + tokenize(task.get('notes'))
+        self._tasks[task_id] = task
+        self._versions[task_id] = self._version(task)
+        self._tokens[task_id] = (name_tokens, text_tokens)
+        self._name.add(task_id, name_tokens)
+        self._text.add(task_id, text_tokens)
+
+    def _remove(self, task_id):
+        name_tokens, text_tokens = self._tokens.pop(task_id)
+        self._name.remove(task_id, name_tokens)
+        self._text.remove(task_id, text_tokens)
+        del self._tasks[task_id]
+        del self._versions[task_id]
+
+    def _index(self, task):
+        """(Re)index one task if it is new or its name/notes/edit time changed. Returns True if it was."""
+        task_id = task['id']
+        if self._versions.get(task_id) == self._version(task):
+            self._tasks[task_id] = task  # pick up property changes that don't affect matching
+            return False
+        if task_id in self._tasks:
+            self._remove(task_id)
+        self._add(task)
+        return True
+
+    def _changed(self):
+        self._sorted_ids = sorted((task_id.replace("-", "").lower(), task_id) for task_id in self._tasks)
+        self._vocabulary = None
+        self._variants = None
+
+    def sync(self, tasks):
+        """
+        Make the index hold exactly these tasks, re-indexing only the ones
+        that are new or whose name/notes/edit time changed.
+
+        Returns:
+            int: Number of tasks (re)indexed or removed
+        """
+        with self._lock:
+            incoming = {task['id']: task for task in tasks if task.get('id')}
+            changes = 0
+            for task_id in [task_id for task_id in self._tasks if task_id not in incoming]:
+                self._remove(task_id)
+                changes += 1
+            changes += sum(1 for task in incoming.values() if self._index(task))
+            if changes:
+                self._changed()
+            return changes
+
+    def upsert(self, tasks):
+        """
+        Add or refresh tasks from a partial (filtered) query without dropping
+        the others. Tasks fetched without their name or notes are skipped.
+        """
+        with self._lock:
+            changes = sum(
+                1 for task in tasks
+                if task.get('id') and 'task_name' in task and 'notes' in task and self._index(task)
+            )
+            if changes:
+                self._changed()
+            return changes
+
+    def discard(self, task_id):
+        """Drop a task that was archived."""
+        with self._lock:
+            if task_id in self._tasks:
+                self._remove(task_id)
+                self._changed()
+
+    def _match_id(self, value, limit):
+        """Prefix match on page ids, ignoring dashes (ids are often read out without them)."""
+        value = value.replace("-", "")
+        matches = []
+        position = bisect_left(self._sorted_ids, (value,))
+        while position < len(self._sorted_ids) and len(matches) < limit:
+            compact_id, task_id = self._sorted_ids[position]
+            if not compact_id.startswith(value):
+                break
+            matches.append((self._tasks[task_id], 1.0))
+            position += 1
+        return matches
+
+    def match(self, task_identifier, limit=DEFAULT_CANDIDATES):
+        """
+        Rank the tasks that could be meant by a task identifier.
+
+        A task qualifies when it contains at least MIN_COVERAGE of the
+        identifier's non-stopword tokens (a token also counts when it starts
+        a longer word), or, for names, when the name contains the identifier
+        or the identifier contains the whole name. Qualifying tasks are
+        ranked with BM25.
+
+        Args:
+            task_identifier (dict): {"type": "id"|"name"|"description", "value": "..."}
+            limit (int): Maximum number of candidates to return
+
+        Returns:
+            list: (task, score) pairs, best first; empty when nothing qualifies
+        """
+        identifier_type = task_identifier.get('type', 'name')
+        value = (task_identifier.get('value') or '').strip().lower()
+        if not value:
+            return []
+
+        with self._lock:
+            if identifier_type == 'id':
+                return self._match_id(value, limit)
+
+            query_tokens = content_tokens(value)
+            weighted_terms = {}
+            for token in query_tokens:
+                for term, weight in self._expand(token, fuzzy=False).items():
+                    weighted_terms[term] = max(weight, weighted_terms.get(term, 0.0))
+
+            if identifier_type == 'description':
+                field, position, minimum = self._text, 1, MIN_COVERAGE["description"]
+            else:
+                field, position, minimum = self._name, 0, MIN_COVERAGE["name"]
+            scores = {
+                task_id: score for task_id, score in field.score_terms(weighted_terms).items()
+                if query_tokens and _coverage(query_tokens, self._tokens[task_id][position]) >= minimum
+            }
+
+            if identifier_type != 'description':
+                for task_id in self._name_phrase_matches(tokenize(value)):
+                    scores.setdefault(task_id, 0.0)
+                    if (self._tasks[task_id].get('task_name') or '').strip().lower() == value:
+                        scores[task_id] += EXACT_NAME_BONUS
+
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._tasks[task_id], score) for task_id, score in ranked]
+
+    def _name_phrase_matches(self, value_tokens):
+        """
+        Tasks whose name starts with the identifier at a word ("work" finds
+        "Workout"), found through the prefix expansion of its first token, or
+        whose whole name appears in the identifier, found through the postings
+        of the identifier's own tokens.
+        """
+        if not value_tokens:
+            return set()
+        postings = self._name.postings
+        first_terms = self._expand(value_tokens[0], fuzzy=False) if len(value_tokens) == 1 else value_tokens[:1]
+        found = {
+            task_id
+            for term in first_terms for task_id in postings.get(term, ())
+            if _starts_phrase(self._tokens[task_id][0], value_tokens)
+        }
+        for token in set(content_tokens(" ".join(value_tokens))):
+            for task_id in postings.get(token, ()):
+                name_tokens = self._tokens[task_id][0]
+                if task_id not in found and name_tokens and _contains_phrase(value_tokens, name_tokens):
+                    found.add(task_id)
+        return found
+
+    def _expand(self, token, fuzzy=True):
+        """
+        Index terms a query token should match: itself, terms it is a prefix
+        of, and (when fuzzy) terms within one edit (typos), with their weights.
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._text.postings)
+        terms = {}
+        if fuzzy and len(token) >= MIN_FUZZY_LENGTH:
+            if self._variants is None:
+                self._variants = {}
+                for term in self._vocabulary:
+                    if len(term) >= MIN_FUZZY_LENGTH - 1:
+                        for variant in _deletion_variants(term):
+                            self._variants.setdefault(variant, set()).add(term)
+            for variant in _deletion_variants(token):
+                for term in self._variants.get(variant, ()):
+                    terms[term] = FUZZY_WEIGHT
+        if len(token) >= MIN_PREFIX_LENGTH:
+            position = bisect_left(self._vocabulary, token)
+            for term in self._vocabulary[position:position + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                terms[term] = PREFIX_WEIGHT
+        terms[token] = 1.0
+        return terms
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Full-text search over task names and notes with prefix and typo
+        tolerant matching ("proj" and "projcet" both find "project").
+
+        Returns:
+            list: (task, score) pairs, best first
+        """
+        with self._lock:
+            weighted_terms = {}
+            for token in tokenize(query):
+                for term, weight in self._expand(token).items():
+                    weighted_terms[term] = max(weight, weighted_terms.get(term, 0.0))
+
+            scores = self._text.score_terms(weighted_terms)
+            for task_id, score in self._name.score_terms(weighted_terms).items():
+                scores[task_id] = scores.get(task_id, 0.0) + NAME_WEIGHT * score
+
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._tasks[task_id], score) for task_id, score in ranked]
+
+
+_task_index = TaskIndex()
+
+
+def get_task_index():
+    """The shared index used for update/delete matching and search."""
+    return _task_index
+
+
+def match_tasks(task_identifier, available_tasks, limit=DEFAULT_CANDIDATES):
+    """
+    Rank candidate tasks for an update/delete identifier. The shared index is
+    synced against available_tasks first, which only re-indexes what changed
+    since the previous command.
+
+    Returns:
+        list: Candidate task dicts, best first
+    """
+    _task_index.sync(available_tasks)
+    return [task for task, _ in _task_index.match(task_identifier, limit=limit)]
+
+
+def search_tasks(query, available_tasks, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Full-text search over every task, after syncing the shared index with
+    available_tasks (the complete task list, so results are never capped by
+    what a remote search endpoint returns first).
+
+    Returns:
+        list: Matching task dicts, best first
+    """
+    _task_index.sync(available_tasks)
+    return [task for task, _ in _task_index.search(query, limit=limit)]
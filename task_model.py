@@ -0,0 +1,168 @@
+"""
+Task Model
+The Task record every read path returns, and the page parser that builds it.
+
+Notion column names come from a field -> property-name mapping, so databases
+with non-default column names work. Override any of them with a JSON object
+in NOTION_PROPERTY_MAP, e.g. NOTION_PROPERTY_MAP='{"task_name": "Name"}'.
+"""
+from dataclasses import dataclass, fields as dataclass_fields
+import functools
+import json
+import os
+import sys
+
+
+DEFAULT_PROPERTY_NAMES = {
+    "task_name": "Task",
+    "notes": "Notes Page",
+    "priority": "Priority",
+    "category": "Category",
+    "status": "Status",
+    "due_date": "Due Date",
+}
+
+PROPERTY_TYPES = {
+    "task_name": "title",
+    "notes": "rich_text",
+    "priority": "select",
+    "category": "select",
+    "status": "select",
+    "due_date": "date",
+}
+
+TASK_FIELDS = tuple(PROPERTY_TYPES)
+
+
+def load_property_names():
+    """Default property names with any NOTION_PROPERTY_MAP overrides applied."""
+    names = dict(DEFAULT_PROPERTY_NAMES)
+    overrides = os.getenv("NOTION_PROPERTY_MAP")
+    if overrides:
+        try:
+            mapping = json.loads(overrides)
+            unknown = set(mapping) - set(names)
+            if unknown:
+                raise ValueError(f"unknown field(s) {sorted(unknown)}")
+            names.update(mapping)
+        except ValueError as e:
+            print(f"⚠️  Warning: Ignoring invalid NOTION_PROPERTY_MAP ({e})")
+    return names
+
+
+PROPERTY_NAMES = load_property_names()
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get a regular (dict-backed) Task
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Task:
+    """
+    One task from the database. Immutable, and slotted on Python 3.10+ so
+    large task sets stay small in memory. Supports the read-only dict protocol the rest of the
+    agent uses (task.get('status'), task['id'], 'notes' in task); fields a
+    projected query did not fetch behave like missing keys.
+    """
+    id: str
+    task_name: str = ""
+    due_date: str = None
+    priority: str = ""
+    category: str = ""
+    status: str = ""
+    notes: str = ""
+    created_time: str = None
+    last_edited_time: str = None
+    loaded: frozenset = frozenset(TASK_FIELDS)
+
+    def __contains__(self, key):
+        if key in PROPERTY_TYPES:
+            return key in self.loaded
+        return key in _RECORD_FIELDS
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self else default
+
+    def keys(self):
+        return [key for key in _RECORD_FIELDS if key in self]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Task from a task dict (e.g. a replica row); absent fields count as not loaded."""
+        values = {key: data[key] for key in _RECORD_FIELDS if key in data}
+        values["loaded"] = frozenset(field for field in TASK_FIELDS if field in data)
+        return cls(**values)
+
+
+_RECORD_FIELDS = tuple(field.name for field in dataclass_fields(Task) if field.name != "loaded")
+
+
+def _text_content(prop, kind):
+    fragments = prop.get(kind) if prop else None
+    if not fragments:
+        return ""
+    return "".join(fragment.get("plain_text") or fragment["text"]["content"] for fragment in fragments)
+
+
+def _extractor(property_name, property_type):
+    """A function pulling one field's value out of a page's properties dict."""
+    if property_type in ("title", "rich_text"):
+        return lambda properties: _text_content(properties.get(property_name), property_type)
+    if property_type == "select":
+        def extract_select(properties):
+            prop = properties.get(property_name)
+            selected = prop.get("select") if prop else None
+            return selected["name"] if selected else ""
+        return extract_select
+
+    def extract_date(properties):
+        prop = properties.get(property_name)
+        value = prop.get("date") if prop else None
+        return value.get("start") if value else None
+    return extract_date
+
+
+@functools.lru_cache(maxsize=None)
+def compile_page_parser(fields=TASK_FIELDS, property_names=None):
+    """
+    Build a parser turning a Notion page object into a Task. The per-field
+    extractors are resolved once here, so parsing a page does no mapping
+    lookups. Parsers are cached per (fields, mapping).
+
+    Args:
+        fields (tuple): Task fields to extract; the rest are marked not loaded
+        property_names (tuple): (field, property name) pairs; defaults to PROPERTY_NAMES
+    """
+    names = dict(property_names) if property_names else PROPERTY_NAMES
+    extractors = tuple((field, _extractor(names[field], PROPERTY_TYPES[field])) for field in fields)
+    loaded = frozenset(fields)
+
+    def parse(page):
+        properties = page["properties"]
+        values = {field: extract(properties) for field, extract in extractors}
+        return Task(
+            id=page["id"],
+            created_time=page.get("created_time"),
+            last_edited_time=page.get("last_edited_time"),
+            loaded=loaded,
+            **values
+        )
+    return parse
+
+
+def page_parser(fields=None):
+    """The compiled parser for a projection (fields=None extracts every field)."""
+    return compile_page_parser(TASK_FIELDS if fields is None else tuple(sorted(fields)))
+
+
+def parse_task_page(page, fields=None):
+    """Parse a single Notion page object into a Task."""
+    return page_parser(fields)(page)
@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta
+import re
+
+
+RENDER_MODES = ("auto", "local", "llm")
+GROUP_BY_OPTIONS = ("day", "priority", "category")
+
+DEFAULT_DUE_SOON_HOURS = 24
+# In auto mode, lists longer than this are always rendered locally
+DEFAULT_LLM_SUMMARY_MAX_TASKS = 50
+
+# Phrases that ask for commentary rather than a plain list
+SUMMARY_REQUEST_PATTERN = re.compile(
+    r"\b(summar(y|ize|ise)|overview|recap|how am i doing|anything urgent|what should i (do|focus on)|prioriti[sz]e)\b"
+)
+
+PRIORITY_ORDER = ["High", "Medium", "Low"]
+CATEGORY_ORDER = ["General", "Personal", "Fitness", "Fun", "School"]
+
+PRIORITY_EMOJI = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
+STATUS_EMOJI = {"To-Do": "⏳", "In Progress": "🔄", "Done": "✅"}
+CATEGORY_EMOJI = {"General": "📝", "Personal": "👤", "Fitness": "💪", "Fun": "🎉", "School": "📚"}
+
+
+def choose_render_mode(user_input, task_count, mode="auto", llm_max_tasks=DEFAULT_LLM_SUMMARY_MAX_TASKS):
+    """
+    Render Policy
+    Decide whether a result list is rendered locally or summarized by the LLM.
+    "local" and "llm" force a renderer; "auto" only uses the LLM when the user
+    asked for a summary and the list is short enough to summarize quickly.
+
+    Returns:
+        str: "local" or "llm"
+    """
+    if mode in ("local", "llm"):
+        return mode
+    if task_count <= llm_max_tasks and SUMMARY_REQUEST_PATTERN.search(user_input.lower()):
+        return "llm"
+    return "local"
+
+
+def parse_due_date(value):
+    """
+    Parse a Notion due date into a local naive datetime.
+
+    Returns:
+        tuple: (datetime or None, has_time) - date-only values have has_time False
+    """
+    if not value:
+        return None, False
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None, False
+    has_time = not (isinstance(value, str) and len(value) == 10)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt, has_time
+
+
+def _due_marker(due, has_time, status, now, due_soon):
+    if due is None or status == "Done":
+        return ""
+    if has_time:
+        if due < now:
+            return " ⚠️  OVERDUE"
+        if due - now <= due_soon:
+            return " ⏰ due soon"
+    else:
+        if due.date() < now.date():
+            return " ⚠️  OVERDUE"
+        if due.date() <= (now + due_soon).date():
+            return " ⏰ due soon"
+    return ""
+
+
+def _format_when(due, has_time):
+    if due is None:
+        return "No due date"
+    return due.strftime("%a %b %d %H:%M") if has_time else due.strftime("%a %b %d")
+
+
+def _day_label(day, today):
+    if day == today:
+        return f"Today ({day.strftime('%a %b %d')})"
+    if day == today + timedelta(days=1):
+        return f"Tomorrow ({day.strftime('%a %b %d')})"
+    return day.strftime("%A, %b %d %Y")
+
+
+def _day_group_key(due, today):
+    """Overdue tasks first (as one group), then one group per day, then undated tasks."""
+    if due is None:
+        return (2, None)
+    if due.date() < today:
+        return (0, None)
+    return (1, due.date())
+
+
+def _ordered_groups(groups, preferred_order):
+    keys = [key for key in preferred_order if key in groups]
+    keys += sorted(key for key in groups if key not in preferred_order)
+    return [(key, groups[key]) for key in keys]
+
+
+def render_tasks(tasks, title="Tasks", group_by="day", now=None, due_soon_hours=DEFAULT_DUE_SOON_HOURS):
+    """
+    Local Task Renderer
+    Deterministically formats tasks grouped by day, priority or category,
+    marking overdue and due-soon tasks. No network calls.
+
+    Args:
+        tasks (list): Tasks as returned by get_tasks_from_notion
+        title (str): Heading for the listing
+        group_by (str): "day", "priority" or "category"
+        now (datetime): Reference time (defaults to the current local time)
+        due_soon_hours (int): Window for the due-soon marker
+
+    Returns:
+        str: Formatted listing
+    """
+    if not tasks:
+        return f"No tasks found for {title}"
+    if group_by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"group_by must be one of {GROUP_BY_OPTIONS}, got {group_by!r}")
+
+    now = now or datetime.now()
+    today = now.date()
+    due_soon = timedelta(hours=due_soon_hours)
+
+    entries = []
+    for task in tasks:
+        due, has_time = parse_due_date(task.get('due_date'))
+        marker = _due_marker(due, has_time, task.get('status'), now, due_soon)
+        entries.append((task, due, has_time, marker))
+
+    groups = {}
+    for entry in entries:
+        task, due = entry[0], entry[1]
+        if group_by == "day":
+            key = _day_group_key(due, today)
+        elif group_by == "priority":
+            key = task.get('priority') or "No priority"
+        else:
+            key = task.get('category') or "Uncategorized"
+        groups.setdefault(key, []).append(entry)
+
+    if group_by == "day":
+        labelled = []
+        for (kind, day), items in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or today)):
+            label = "Overdue" if kind == 0 else "No due date" if kind == 2 else _day_label(day, today)
+            labelled.append((label, items))
+    elif group_by == "priority":
+        labelled = _ordered_groups(groups, PRIORITY_ORDER)
+    else:
+        labelled = _ordered_groups(groups, CATEGORY_ORDER)
+
+    overdue_count = sum(1 for entry in entries if "OVERDUE" in entry[3])
+
+    output = f"\n📋 {title} ({len(tasks)} found"
+    if overdue_count:
+        output += f", {overdue_count} overdue"
+    output += "):\n" + "=" * 80 + "\n"
+
+    number = 1
+    for label, items in labelled:
+        output += f"\n{label}\n" + "-" * len(label) + "\n"
+        items.sort(key=lambda item: (item[1] is None, item[1] or now))
+        for task, due, has_time, marker in items:
+            priority = task.get('priority', '')
+            status = task.get('status', '')
+            category = task.get('category', '')
+
+            when = _format_when(due, has_time)
+
+            output += (
+                f"{number:2d}. {PRIORITY_EMOJI.get(priority, '⚪')} {STATUS_EMOJI.get(status, '❓')} "
+                f"{CATEGORY_EMOJI.get(category, '📋')} {task.get('task_name') or 'Untitled'}{marker}\n"
+            )
+            output += f"    📅 {when} | {priority or 'N/A'} | {category or 'N/A'} | {status or 'N/A'}"
+            if task.get('id'):
+                output += f" | 🆔 {task['id'][:8]}"
+            output += "\n"
+            if task.get('notes'):
+                output += f"    📝 {task['notes']}\n"
+            number += 1
+
+    return output
+
+
+def render_search_results(tasks, query):
+    """Format ranked search results, best match first (no regrouping, so the ranking is kept)."""
+    if not tasks:
+        return f"No tasks found matching '{query}'"
+
+    output = f"\n🔎 Results for '{query}' ({len(tasks)} found):\n" + "=" * 80 + "\n"
+    for number, task in enumerate(tasks, 1):
+        priority = task.get('priority', '')
+        status = task.get('status', '')
+        when = _format_when(*parse_due_date(task.get('due_date')))
+
+        output += (
+            f"{number:2d}. {PRIORITY_EMOJI.get(priority, '⚪')} {STATUS_EMOJI.get(status, '❓')} "
+            f"{task.get('task_name') or 'Untitled'}\n"
+        )
+        output += f"    📅 {when} | {priority or 'N/A'} | {task.get('category') or 'N/A'} | {status or 'N/A'}"
+        if task.get('id'):
+            output += f" | 🆔 {task['id'][:8]}"
+        output += "\n"
+        if task.get('notes'):
+            output += f"    📝 {task['notes']}\n"
+    return output
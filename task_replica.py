@@ -0,0 +1,263 @@
+import os
+import sqlite3
+import threading
+import time
+
+import notion_tools
+from query_planner import plan_local_query
+from task_model import Task
+
+
+DEFAULT_REPLICA_PATH = os.path.expanduser("~/.notion_agent/tasks.db")
+DEFAULT_MAX_STALENESS = 30.0        # seconds before reads trigger an incremental sync
+DEFAULT_FULL_SYNC_INTERVAL = 3600.0  # seconds between full resyncs (picks up pages archived elsewhere)
+
+TASK_COLUMNS = (
+    "id", "task_name", "due_date", "priority", "category",
+    "status", "notes", "created_time", "last_edited_time"
+)
+
+PRIORITY_RANK = {"Low": 0, "Medium": 1, "High": 2}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    task_name TEXT NOT NULL DEFAULT '',
+    due_date TEXT,
+    priority TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    created_time TEXT,
+    last_edited_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class TaskReplica:
+    """
+    Local Task Replica
+    Mirrors the Notion task database into SQLite so interactive reads are
+    served locally. Syncs are incremental: only pages edited on or after the
+    stored high-water mark (the newest last_edited_time seen) are fetched.
+
+    Notion's query endpoint never returns archived pages, so incremental syncs
+    cannot see pages archived outside the agent; a periodic full resync takes
+    care of those. Archives made through the agent are applied locally right away.
+    """
+
+    def __init__(self, path=DEFAULT_REPLICA_PATH, max_staleness=DEFAULT_MAX_STALENESS,
+                 full_sync_interval=DEFAULT_FULL_SYNC_INTERVAL):
+        self.path = path
+        self.max_staleness = max_staleness
+        self.full_sync_interval = full_sync_interval
+        self._lock = threading.RLock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._check_database()
+
+    def _check_database(self):
+        """Start over if the replica was built from a different Notion database."""
+        if self._get_state("database_id") not in (None, notion_tools.get_database_id()):
+            with self._conn:
+                self._conn.execute("DELETE FROM tasks")
+                self._conn.execute("DELETE FROM sync_state")
+        self._set_state("database_id", notion_tools.get_database_id())
+
+    def _get_state(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def _set_state(self, key, value):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                (key, None if value is None else str(value))
+            )
+
+    @property
+    def high_water_mark(self):
+        return self._get_state("high_water_mark")
+
+    @property
+    def last_synced_at(self):
+        return float(self._get_state("last_synced_at", 0) or 0)
+
+    def staleness(self):
+        """Seconds since the last successful sync."""
+        return time.time() - self.last_synced_at
+
+    def needs_full_sync(self):
+        """True when the next sync has to rebuild the replica from scratch."""
+        last_full_sync = float(self._get_state("last_full_sync_at", 0) or 0)
+        return time.time() - last_full_sync > self.full_sync_interval or not self.high_water_mark
+
+    def mark_stale(self):
+        """Force the next read to sync (call after writing to Notion)."""
+        with self._lock:
+            self._set_state("last_synced_at", 0)
+
+    def _insert_rows(self, tasks):
+        rows = [tuple(task.get(column) for column in TASK_COLUMNS) for task in tasks]
+        if rows:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in TASK_COLUMNS)})",
+                rows
+            )
+
+    def upsert_tasks(self, tasks):
+        with self._lock, self._conn:
+            self._insert_rows(tasks)
+
+    def remove_task(self, task_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def sync(self, full=False):
+        """
+        Pull changes from Notion into the replica.
+
+        Args:
+            full (bool): Rebuild from scratch instead of fetching only pages
+                edited since the high-water mark
+
+        Returns:
+            int: Number of pages fetched
+        """
+        with self._lock:
+            full = full or self.needs_full_sync()
+
+            sync_started = time.time()
+            edited_since = None if full else self.high_water_mark
+            tasks = list(notion_tools.iter_tasks(edited_since=edited_since))
+
+            with self._conn:
+                if full:
+                    self._conn.execute("DELETE FROM tasks")
+                self._insert_rows(tasks)
+
+            edited_times = [task["last_edited_time"] for task in tasks if task.get("last_edited_time")]
+            if edited_times:
+                newest = max(edited_times)
+                if not self.high_water_mark or newest > self.high_water_mark:
+                    self._set_state("high_water_mark", newest)
+
+            self._set_state("last_synced_at", sync_started)
+            if full:
+                self._set_state("last_full_sync_at", sync_started)
+
+            print(f"🔄 Replica {'full' if full else 'incremental'} sync: {len(tasks)} page(s) fetched")
+            return len(tasks)
+
+    def ensure_fresh(self):
+        """Sync if the replica is older than max_staleness."""
+        if self.staleness() > self.max_staleness:
+            self.sync()
+
+    def _build_order_clause(self, sort_by):
+        sort_by = sort_by or {}
+        if sort_by.get("property") == "priority":
+            direction = "DESC" if sort_by.get("direction", "descending") == "descending" else "ASC"
+            rank = " ".join(f"WHEN '{name}' THEN {value}" for name, value in PRIORITY_RANK.items())
+            return f"ORDER BY CASE priority {rank} ELSE -1 END {direction}, due_date IS NULL, due_date"
+
+        direction = "DESC" if sort_by.get("direction") == "descending" else "ASC"
+        return f"ORDER BY due_date IS NULL, due_date {direction}"
+
+    def query(self, filters=None, sort_by=None, limit=None):
+        """
+        Run a filtered, sorted read against the local replica only. Filters are
+        compiled to SQL by query_planner; conditions SQL can't express here
+        (comparisons against a time of day) are applied to the rows in Python.
+        """
+        plan = plan_local_query(filters)
+        where, params = ("", [])
+        if plan.compiled:
+            where, params = f"WHERE {plan.compiled[0]}", list(plan.compiled[1])
+        sql = f"SELECT * FROM tasks {where} {self._build_order_clause(sort_by)}"
+        if limit is not None and plan.residual is None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        tasks = [task for task in (Task.from_dict(dict(row)) for row in rows) if plan.matches(task)]
+        return tasks if limit is None else tasks[:limit]
+
+    def get_tasks(self, filters=None, sort_by=None, limit=50):
+        """
+        Retrieve tasks from the replica, syncing first if it is too stale.
+        Takes the same arguments and returns the same shape as
+        notion_tools.get_tasks_from_notion.
+        """
+        try:
+            self.ensure_fresh()
+        except Exception as e:
+            if not self.last_synced_at and not self.high_water_mark:
+                error_msg = f"Failed to sync task replica: {str(e)}"
+                print(f"❌ {error_msg}")
+                return {"error": error_msg}
+            print(f"⚠️  Warning: Replica sync failed, serving cached tasks: {e}")
+
+        # Read one extra row so has_more matches get_tasks_from_notion
+        try:
+            tasks = self.query(filters, sort_by, None if limit is None else limit + 1)
+        except ValueError as e:
+            error_msg = f"Invalid filter: {e}"
+            print(f"❌ {error_msg}")
+            return {"error": error_msg}
+        has_more = limit is not None and len(tasks) > limit
+        if has_more:
+            tasks = tasks[:limit]
+
+        print(f"⚡ Retrieved {len(tasks)} tasks from local replica")
+        return {
+            "tasks": tasks,
+            "total": len(tasks),
+            "has_more": has_more
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_task_replica = None
+_task_replica_lock = threading.Lock()
+
+
+def get_task_replica():
+    """
+    Return the shared replica, or None when it is disabled or Notion is not configured.
+
+    Configured through environment variables:
+        NOTION_REPLICA_ENABLED: set to "0" to always read from Notion directly
+        NOTION_REPLICA_PATH: SQLite file location (default ~/.notion_agent/tasks.db)
+        NOTION_REPLICA_MAX_STALENESS: seconds a read may lag behind Notion (default 30)
+    """
+    global _task_replica
+
+    if os.getenv("NOTION_REPLICA_ENABLED", "1") == "0" or not notion_tools.get_notion():
+        return None
+
+    with _task_replica_lock:
+        if _task_replica is None:
+            try:
+                _task_replica = TaskReplica(
+                    path=os.path.expanduser(os.getenv("NOTION_REPLICA_PATH", DEFAULT_REPLICA_PATH)),
+                    max_staleness=float(os.getenv("NOTION_REPLICA_MAX_STALENESS", DEFAULT_MAX_STALENESS))
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not open task replica, reading from Notion: {e}")
+                return None
+        return _task_replica